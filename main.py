@@ -1,37 +1,31 @@
-from src.game.get_game_board import get_game_board
+from src.game.get_game_board import get_game_board, capture_word_bites_cells, capture_game_frame, load_ocr
 from src.game.identify_game_version import identify_game_version
-from src.game.word_finder import find_words, find_anagrams, print_found_words, print_anagram_words, find_word_bites_words, print_word_bites_moves, WordBitesMove, are_words_related, optimize_word_order, calculate_score
-from src.game.word_drawer import draw_word, click_anagram_word, execute_word_bites_move
+from src.game.word_finder import find_words, find_anagrams, print_found_words, print_anagram_words, WordBitesMove, optimize_word_order, calculate_score, WordBitesSearch, solve_word_bites_words
+from src.game.word_drawer import draw_word, click_anagram_word, execute_word_bites_move, move_word_bites_block
+from src.game.word_bites_screen import WordBitesDragLog, get_occupancy_mask
+from src.game.word_bites_player import PrioritizedWordBitesMove, execute_word_bites_moves_from_heap, execute_word_bites_plan, play_word_bites_step
 from src.game.press_start_button import focus_and_click_start
 from src.utils.window import find_iphone_window
 import time
 import signal
 from concurrent.futures import ThreadPoolExecutor
 import heapq
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Tuple, List
 import os
 from threading import Lock
-from src.config.config import GAME_DURATION, WORD_SCORES
+from src.config.config import GAME_DURATION, WORD_SCORES, WORD_BITES_SEARCH_BUDGET, WORD_BITES_SEARCH_PROCESSES
 import argparse
 import random
 from collections import defaultdict
 
-# Parse command line arguments
-parser = argparse.ArgumentParser(description='Game Pigeon Word Game Solver')
-parser.add_argument('--realistic', '-r', action='store_true', 
-                    help='Enable realistic mode with human-like scores (15k-25k for Word Hunt, 20k-40k for Word Bites)')
-parser.add_argument('--target', '-t', type=int,
-                    help='Set target score for the game. If realistic mode is enabled, this overrides the default realistic ranges. If realistic mode is disabled, this limits the maximum score.')
-parser.add_argument('--debug', '-d', action='store_true',
-                    help='Save debug screenshots during gameplay')
-args = parser.parse_args()
-
 # Global variables
 WORDS_FOUND = 0
 GAME_VERSION = "unknown"
 TIME_REMAINING = 90  # Track time remaining
 START_TIME = 0  # Track start time globally
+ACTIVE_WORD_BITES_SEARCH = None  # Search processes to stop if the game ends mid-plan
+ACTIVE_WORD_BITES_PIPELINE = None  # Planning process to stop if the game ends mid-plan
 REALISTIC_MODE = False  # Default to perfect mode
 TARGET_SCORE = None  # Track target score if specified
 SAVE_DEBUG_SCREENSHOTS = False  # Track whether to save debug screenshots
@@ -54,23 +48,29 @@ class PrioritizedWord:
         self.word = word
         self.path = path
 
-@dataclass(order=True)
-class PrioritizedWordBitesMove:
-    priority: int
-    move: WordBitesMove = field(compare=False)
-    
-    def __init__(self, move: WordBitesMove):
-        # Negative score for max-heap behavior (highest score first)
-        self.priority = -move.score
-        
-        # Prioritize vertical words of the same length/score
-        # This ensures vertical words with the same score as horizontal words
-        # will be processed first, without changing their actual score
-        if move.is_vertical:
-            # Use a small priority boost that doesn't affect the actual score
-            self.priority -= 0.1  # Subtract a small value to increase precedence
-            
-        self.move = move
+def resync_board(board, drag_log) -> bool:
+    """Check the Word Bites board model against a fresh capture of the screen and correct it"""
+    occupied = capture_word_bites_cells()
+    if occupied is None:
+        return False
+    if get_occupancy_mask(occupied) != board.occupancy:
+        # A tile may still have been sliding into place; look again before trusting the difference
+        time.sleep(0.05)
+        occupied = capture_word_bites_cells()
+        if occupied is None:
+            return False
+    return drag_log.resync(board, occupied)
+
+def stop_word_bites_processes():
+    """Kill the Word Bites search and planning processes, which os._exit would leave running"""
+    if ACTIVE_WORD_BITES_SEARCH is not None:
+        ACTIVE_WORD_BITES_SEARCH.stop()
+    if ACTIVE_WORD_BITES_PIPELINE is not None:
+        ACTIVE_WORD_BITES_PIPELINE.terminate()
+
+def set_word_bites_pipeline(pipeline):
+    global ACTIVE_WORD_BITES_PIPELINE
+    ACTIVE_WORD_BITES_PIPELINE = pipeline
 
 def timeout_handler(signum, frame):
     # Calculate time elapsed
@@ -85,10 +85,12 @@ def timeout_handler(signum, frame):
     print(f"Words found: {WORDS_FOUND}")
     print(f"Time played: {time_elapsed:.1f} seconds (of {GAME_DURATION} seconds)")
     print("Program terminated.")
+    stop_word_bites_processes()
     os._exit(0)
 
 def keyboard_interrupt_handler(signum, frame):
     print("\nProgram interrupted by user. Exiting...")
+    stop_word_bites_processes()
     os._exit(0)
 
 def update_time_remaining():
@@ -495,13 +497,22 @@ def apply_realistic_mode_word_bites(all_moves):
     return optimize_word_order(selected_moves)
 
 def main():
-    global START_TIME, WORDS_FOUND, GAME_VERSION, REALISTIC_MODE, TARGET_SCORE, SAVE_DEBUG_SCREENSHOTS
+    global START_TIME, WORDS_FOUND, GAME_VERSION, REALISTIC_MODE, TARGET_SCORE, SAVE_DEBUG_SCREENSHOTS, ACTIVE_WORD_BITES_SEARCH
     
     # Set up signal handlers
     signal.signal(signal.SIGALRM, timeout_handler)
     signal.signal(signal.SIGINT, keyboard_interrupt_handler)  # Handle Ctrl+C
     
-    # Parse command line arguments
+    # Parse command line arguments here rather than at import: the search and planning
+    # processes are spawned, so they import this module again
+    parser = argparse.ArgumentParser(description='Game Pigeon Word Game Solver')
+    parser.add_argument('--realistic', '-r', action='store_true', 
+                        help='Enable realistic mode with human-like scores (15k-25k for Word Hunt, 20k-40k for Word Bites)')
+    parser.add_argument('--target', '-t', type=int,
+                        help='Set target score for the game. If realistic mode is enabled, this overrides the default realistic ranges. If realistic mode is disabled, this limits the maximum score.')
+    parser.add_argument('--debug', '-d', action='store_true',
+                        help='Save debug screenshots during gameplay')
+    args = parser.parse_args()
     REALISTIC_MODE = args.realistic
     TARGET_SCORE = args.target
     SAVE_DEBUG_SCREENSHOTS = args.debug
@@ -517,6 +528,9 @@ def main():
     else:
         print("Running in PERFECT mode - will find all possible words")
     
+    # Load the OCR models before the game starts rather than on the first board
+    load_ocr()
+    
     print("Starting game...")
     
     # Refresh window cache at start
@@ -535,20 +549,24 @@ def main():
     print("Waiting for game transition...")
     time.sleep(0.5)
     
+    # Capture the window once for both identifying the game and reading the board
+    find_iphone_window(force_refresh=True)
+    frame = capture_game_frame()
+    if frame is None:
+        print("Failed to capture the game window")
+        return
+    
     # Identify game version
     print("Identifying game version...")
-    GAME_VERSION = identify_game_version(save_debug=SAVE_DEBUG_SCREENSHOTS)
+    GAME_VERSION = identify_game_version(save_debug=SAVE_DEBUG_SCREENSHOTS, frame=frame)
     if not GAME_VERSION:
         print("Failed to identify game version")
         return
     print(f"Detected game version: {GAME_VERSION}")
     
-    # Refresh window cache before capturing game board
-    find_iphone_window(force_refresh=True)
-    
     # Get game board
-    print(f"Capturing game board for {GAME_VERSION}...")
-    board = get_game_board(GAME_VERSION, save_debug=SAVE_DEBUG_SCREENSHOTS)
+    print(f"Reading game board for {GAME_VERSION}...")
+    board = get_game_board(GAME_VERSION, save_debug=SAVE_DEBUG_SCREENSHOTS, frame=frame)
     if not board:
         print("Failed to capture game board")
         return
@@ -578,16 +596,16 @@ def main():
     
     if GAME_VERSION == "WORD_BITES":
         print(board)
-        print("Finding all Word Bites words first...")
-        all_moves = list(find_word_bites_words(board))
-        words_found = len(all_moves)
-        WORDS_FOUND = words_found
-        print(f"Found a total of {words_found} possible Word Bites words")
-        
-        print("Optimizing word order...")
-        optimized_moves = optimize_word_order(all_moves)
-        
         if REALISTIC_MODE or TARGET_SCORE is not None:
+            print(f"Finding Word Bites words (up to {WORD_BITES_SEARCH_BUDGET}s)...")
+            all_moves = solve_word_bites_words(board, WORD_BITES_SEARCH_BUDGET)
+            words_found = len(all_moves)
+            WORDS_FOUND = words_found
+            print(f"Found a total of {words_found} possible Word Bites words")
+            
+            print("Optimizing word order...")
+            optimized_moves = optimize_word_order(all_moves)
+            
             if TARGET_SCORE is not None:
                 optimized_moves = apply_realistic_mode_word_bites(optimized_moves)
             else:
@@ -640,20 +658,43 @@ def main():
             
             optimized_moves = final_moves
             print(f"Reordered moves for more human-like play pattern")
-        
-        move_queue = []
-        heap_lock = Lock()
-        
-        for move in optimized_moves:
+            
+            move_queue = []
+            heap_lock = Lock()
+            
+            for move in optimized_moves:
+                with heap_lock:
+                    heapq.heappush(move_queue, PrioritizedWordBitesMove(move))
+            
+            print("Starting to form words...")
             with heap_lock:
-                heapq.heappush(move_queue, PrioritizedWordBitesMove(move))
-        
-        print("Starting to form words...")
-        with heap_lock:
-            heapq.heappush(move_queue, PrioritizedWordBitesMove(WordBitesMove("", [], 0)))
-        
-        print("Executing all moves...")
-        execute_word_bites_moves_from_heap(move_queue, heap_lock, board)
+                heapq.heappush(move_queue, PrioritizedWordBitesMove(WordBitesMove("", [], 0)))
+            
+            if optimized_moves:
+                print("Executing all moves...")
+                execute_word_bites_moves_from_heap(
+                    move_queue, heap_lock, board,
+                    lambda move, board, upcoming: execute_word_bites_move(move, board, True, upcoming))
+        else:
+            # Perfect mode: search longest-first in another process and play the words in the
+            # order that gets the most points per drag, starting as soon as the longest arrive
+            print(f"Searching and executing moves ({WORD_BITES_SEARCH_PROCESSES} search processes)...")
+            search = WordBitesSearch(board, processes=WORD_BITES_SEARCH_PROCESSES)
+            ACTIVE_WORD_BITES_SEARCH = search
+            drag_log = WordBitesDragLog(move_word_bites_block, board)
+            try:
+                execute_word_bites_plan(
+                    board, [],
+                    lambda step, board: play_word_bites_step(step, board, drag_log),
+                    game_over=lambda: time.time() - START_TIME >= GAME_DURATION,
+                    search=search, resync=lambda board: resync_board(board, drag_log),
+                    on_pipeline=set_word_bites_pipeline)
+            finally:
+                search.stop()
+                ACTIVE_WORD_BITES_SEARCH = None
+            words_found = len(search.moves)
+            WORDS_FOUND = words_found
+            print(f"Found a total of {words_found} possible Word Bites words")
         
     elif GAME_VERSION.startswith('ANAGRAM'):
         print(' '.join(board[0]))
@@ -940,106 +981,5 @@ def draw_words_from_heap(word_heap: List[PrioritizedWord], heap_lock: Lock, boar
         draw_word(prioritized_word.path, game_version)
         words_drawn += 1
 
-def execute_word_bites_moves_from_heap(move_heap: List[PrioritizedWordBitesMove], heap_lock: Lock, board) -> None:
-    """Execute Word Bites moves as they become available in the heap, highest score first"""
-    # Keep track of the last successfully formed word and its block positions
-    last_word = None
-    last_word_blocks = {}  # Maps position -> block
-    
-    # Stats tracking
-    vertical_words_count = 0
-    horizontal_words_count = 0
-    total_score = 0
-    
-    # Process counter for progress reporting
-    processed_count = 0
-    total_moves = len(move_heap) - 1  # Subtract 1 for sentinel
-    
-    while True:
-        with heap_lock:
-            if not move_heap:
-                time.sleep(0.05)  # Reduced sleep time
-                continue
-            
-            prioritized_move = heapq.heappop(move_heap)
-        
-        # Check for sentinel value
-        if not prioritized_move.move.word:
-            # Print final stats before exiting
-            print(f"\nWord Bites stats:")
-            print(f"Vertical words: {vertical_words_count}")
-            print(f"Horizontal words: {horizontal_words_count}")
-            print(f"Total score: {total_score}")
-            break
-        
-        move = prioritized_move.move
-        processed_count += 1
-        
-        # Only log every 5th word to reduce console output overhead
-        if processed_count % 10 == 0 or processed_count == 1:
-            orientation = "VERTICAL" if move.is_vertical else "HORIZONTAL"
-            print(f"Playing word {processed_count}/{total_moves}: {move.word} ({move.score} pts) [{orientation}]")
-        
-        # Check if we can build upon the previous word
-        if last_word and are_words_related(last_word, move.word):
-            # Try to identify which blocks need to be added to form the new word
-            if move.word.startswith(last_word):
-                # The new word is an extension of the last word (e.g., "PLAY" -> "PLAYER")
-                suffix = move.word[len(last_word):]
-                
-                # Create a modified move that only includes the new blocks needed
-                modified_block_moves = []
-                for block, target_pos in move.block_moves:
-                    # Skip blocks that are already in position from the previous word
-                    if target_pos not in last_word_blocks:
-                        modified_block_moves.append((block, target_pos))
-                
-                if modified_block_moves:
-                    # Create a new move with just the blocks we need to add
-                    modified_move = WordBitesMove(move.word, modified_block_moves, move.score, move.is_vertical, move.block_moves)
-                    success = execute_word_bites_move(modified_move, board, True)
-                else:
-                    # If no new blocks needed (shouldn't happen), use the original move
-                    success = execute_word_bites_move(move, board, True)
-            
-            elif last_word.startswith(move.word):
-                # The new word is a prefix of the last word (e.g., "PLAYER" -> "PLAY")
-                # This is less common but possible
-                success = True  # No need to do anything, the word is already formed
-            
-            else:
-                # The words are related but one is not a prefix of the other
-                # (e.g., "PLAY" -> "PLAYING" where we need to remove 'Y' and add 'YING')
-                success = execute_word_bites_move(move, board, True)
-        else:
-            # No previous word or words are not related, execute normally
-            success = execute_word_bites_move(move, board, True)
-        
-        if success:
-            # Update the last word and its block positions
-            last_word = move.word
-            last_word_blocks = {}
-            for block, pos in move.block_moves:
-                # Find the actual block at this position
-                actual_block = board.get_block_at(pos[0], pos[1])
-                if actual_block:
-                    last_word_blocks[pos] = actual_block
-            
-            # Use a shorter delay between words
-            time.sleep(0.01)  # Further reduced delay between words
-            
-            # Update stats
-            if move.is_vertical:
-                vertical_words_count += 1
-            else:
-                horizontal_words_count += 1
-            total_score += move.score
-        else:
-            # If we fail to form a word, wait a bit before trying the next one
-            time.sleep(0.01)  # Further reduced delay after failure
-            # Reset last word tracking since we failed
-            last_word = None
-            last_word_blocks = {}
-
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# The search processes are spawned, so they import this script again; importing main.py here
+# makes each of them pay the same start-up cost as in a game
+import main  # noqa: F401
+from src.game.word_finder import WordBitesSearch, set_word_bites_word_cache
+from src.game.word_bites_cache import WordBitesWordCache
+from src.game.word_bites_simulator import make_random_board
+
+def time_search(board, processes):
+    """Wall-clock seconds from starting a search to its first batch of moves and to its end"""
+    start = time.perf_counter()
+    search = WordBitesSearch(board, processes=processes)
+    search.poll(wait=True)
+    first = time.perf_counter() - start
+    for _ in search:
+        pass
+    return first, time.perf_counter() - start
+
+def benchmark_word_bites_search():
+    parser = argparse.ArgumentParser(description='Time the Word Bites search with different process counts')
+    parser.add_argument('--boards', type=int, default=5, help='Number of random boards')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the random boards')
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4, 6, 8, 12],
+                        help='Process counts to try')
+    args = parser.parse_args()
+
+    # Every board searched from scratch, as for a block set the cache hasn't seen
+    set_word_bites_word_cache(WordBitesWordCache(None))
+    rng = random.Random(args.seed)
+    boards = [make_random_board(rng) for _ in range(args.boards)]
+
+    print(f"Boards: {args.boards}, cores: {os.cpu_count()}")
+    print(f"{'Processes':>9} | {'First batch':>11} | {'All moves':>9}")
+    for processes in args.processes:
+        times = [time_search(board, processes) for board in boards]
+        first = sum(t[0] for t in times) / len(times)
+        total = sum(t[1] for t in times) / len(times)
+        print(f"{processes:>9} | {first:>10.2f}s | {total:>8.2f}s")
+
+if __name__ == "__main__":
+    benchmark_word_bites_search()
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.config import GAME_DURATION
+from src.game.word_finder import load_word_lists, find_word_bites_words, optimize_word_order
+from src.game.word_bites_simulator import simulate_word_bites_game, make_random_board
+
+def simulate(boards, valid_words, **options):
+    """Replay each board's moves in a fresh simulator and return the simulators"""
+    return [simulate_word_bites_game(board, valid_words, moves, **options) for board, moves in boards]
+
+def print_averages(name, simulators):
+    """Print the per-game averages of every summary total"""
+    totals = {}
+    for simulator in simulators:
+        for key, value in simulator.summary().items():
+            totals[key] = totals.get(key, 0) + value
+    print(f"\n{name}:")
+    for key, value in totals.items():
+        print(f"  {key:>18}: {value / len(simulators):.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate Word Bites games on random boards')
+    parser.add_argument('--boards', type=int, default=20, help='Number of random boards')
+    parser.add_argument('--blocks', type=int, default=15, help='Blocks per board')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the random boards')
+    parser.add_argument('--failure-rate', type=float, default=0.02, help='Chance that a drag is lost')
+    parser.add_argument('--silent-failure-rate', type=float, default=0.02,
+                        help='Chance that the game ignores a drag the player thinks worked')
+    parser.add_argument('--time-limit', type=float, default=GAME_DURATION, help='Simulated input seconds per game')
+    args = parser.parse_args()
+
+    valid_words = load_word_lists()
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    boards = []
+    for _ in range(args.boards):
+        board = make_random_board(rng, args.blocks)
+        boards.append((board, optimize_word_order(list(find_word_bites_words(board)))))
+    print(f"Solved {args.boards} boards in {time.perf_counter() - start:.1f}s")
+
+    options = dict(drag_failure_rate=args.failure_rate, time_limit=args.time_limit, seed=args.seed)
+    current = simulate(boards, valid_words, **options)
+    restoring = simulate(boards, valid_words, restore_failed=True, **options)
+    print_averages("Current layout as baseline", current)
+    print_averages("Restore after failed words", restoring)
+
+    saved = sum(s.drags for s in restoring) - sum(s.drags for s in current)
+    print(f"\nDrags saved per game by not restoring: {saved / args.boards:.1f}")
+
+    sequenced = simulate(boards, valid_words, sequenced=True, **options)
+    print_averages("Sequenced plan", sequenced)
+    gain = sum(s.score for s in sequenced) - sum(s.score for s in current)
+    print(f"\nPoints gained per game by sequencing: {gain / args.boards:.1f}")
+
+    uncrossed = simulate(boards, valid_words, sequenced=True, crossings=False, **options)
+    print_averages("Sequenced plan without crossing words", uncrossed)
+    extra = (sum(s.points_per_second for s in sequenced) - sum(s.points_per_second for s in uncrossed)) / args.boards
+    print(f"\nPoints per second gained per game by crossing words: {extra:.1f}")
+
+    staged = simulate(boards, valid_words, sequenced=True, staging=True, **options)
+    print_averages("Sequenced plan with staging", staged)
+    net = (sum(s.points_per_second for s in staged) - sum(s.points_per_second for s in sequenced)) / args.boards
+    print(f"\nNet points per second gained per game by staging: {net:.1f}")
+
+    silent = dict(options, silent_failure_rate=args.silent_failure_rate)
+    drifting = simulate(boards, valid_words, sequenced=True, **silent)
+    print_averages("Sequenced plan with silently dropped drags", drifting)
+    resynced = simulate(boards, valid_words, sequenced=True, resync=True, **silent)
+    print_averages("Sequenced plan with silently dropped drags and resyncs", resynced)
+    kept = sum(s.score for s in resynced) - sum(s.score for s in drifting)
+    print(f"\nPoints kept per game by resyncing: {kept / args.boards:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,11 @@ import os
 GAME_DURATION = 80  # seconds
 MIN_WORD_LENGTH = 3
 CLICK_DELAY = 0.02  # seconds between clicks/drags
+WORD_BITES_SEARCH_BUDGET = 3  # seconds the Word Bites solver may take before the first move
+# Processes placing Word Bites words at once, leaving a core each for the drags and the planner.
+# Each one is a fresh interpreter that imports main.py's modules, and past four shards the
+# placement saved is less than that start-up (see scripts/benchmark_word_bites_search.py)
+WORD_BITES_SEARCH_PROCESSES = max(1, min(4, (os.cpu_count() or 1) - 2))
 
 # Window detection keywords
 IPHONE_WINDOW_KEYWORDS = ['iPhone', 'iOS', 'QuickTime Player']
@@ -45,4 +50,13 @@ WORD_SCORES = {
 # Word list path
 WORD_LIST_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'word_lists/collins-word-list-2019-filtered.txt')
 
+# Cache of the words each Word Bites block set can spell, kept between runs
+WORD_BITES_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'cache/word_bites_words.json')
+
+# Letter templates harvested from confident OCR readings, kept between runs
+GLYPH_TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'cache/glyph_templates.npz')
+
+# Letters read from each cell image, by perceptual hash, kept between runs
+CELL_OCR_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'cache/cell_ocr.json')
+
 DEBUG_DIR = 'debug' 
\ No newline at end of file
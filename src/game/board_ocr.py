@@ -0,0 +1,183 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.game.cell_ocr_cache import CellOcrCache, get_cell_hash
+from src.game.glyph_templates import GlyphTemplates, HARVEST_CONFIDENCE, get_glyph
+
+OCR_ALLOWLIST = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+# A reading above this confidence is taken without trying the other thresholds
+CONFIDENT_READING = 0.8
+
+# Cells are scaled to this square before thresholding, then padded on every side
+CELL_SIZE = 200
+CELL_PADDING = 20
+
+# Space kept around the letter in the box handed to the recogniser, as a fraction of its size
+INK_MARGIN_FRACTION = 0.15
+
+# Letter read from a cell, with the recogniser's confidence in it
+CellReading = Tuple[str, float]
+
+def prepare_cell(cell: np.ndarray) -> np.ndarray:
+    """Grayscale, enlarge and equalise a BGR cell crop, ready for thresholding."""
+    gray = cv2.cvtColor(cell, cv2.COLOR_BGR2GRAY)
+    gray = cv2.resize(gray, (CELL_SIZE, CELL_SIZE))
+    clahe = cv2.createCLAHE(clipLimit=1.5, tileGridSize=(4, 4))
+    return clahe.apply(gray)
+
+# Ways to turn a prepared cell into white ink on black, tried in order until one reads confidently
+THRESHOLD_METHODS: List[Callable[[np.ndarray], np.ndarray]] = [
+    # Standard Otsu's thresholding
+    lambda gray: cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1],
+    # Fixed threshold for consistency
+    lambda gray: cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY_INV)[1],
+    # Adaptive thresholding
+    lambda gray: cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 15, 5),
+]
+
+def binarize_cell(gray: np.ndarray, method: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """Threshold a prepared cell, clean it up and pad it to a (CELL_SIZE + 2 * CELL_PADDING) square."""
+    binary = method(gray)
+    kernel = np.ones((2, 2), np.uint8)
+    binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
+    binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+    return cv2.copyMakeBorder(binary, CELL_PADDING, CELL_PADDING, CELL_PADDING, CELL_PADDING,
+                              cv2.BORDER_CONSTANT, value=0)
+
+def get_ink_box(binary: np.ndarray) -> Tuple[int, int, int, int]:
+    """
+    Square (x_min, x_max, y_min, y_max) box around the ink of a binarized cell, with a margin.
+    This stands in for EasyOCR's text detector: the letter is the only thing in the cell, so
+    its box can be read off the pixels. It is kept square because the recogniser treats tall
+    boxes as vertical text, which would misread a narrow letter like I.
+    """
+    size = binary.shape[0]
+    points = cv2.findNonZero(binary)
+    if points is None:
+        return 0, size, 0, size
+    x, y, width, height = cv2.boundingRect(points)
+    side = int(max(width, height) * (1 + 2 * INK_MARGIN_FRACTION)) + 1
+    x_min = int(np.clip(x + width // 2 - side // 2, 0, max(size - side, 0)))
+    y_min = int(np.clip(y + height // 2 - side // 2, 0, max(size - side, 0)))
+    return x_min, min(x_min + side, size), y_min, min(y_min + side, size)
+
+def read_cells(reader, cells: Sequence[np.ndarray], positions: Optional[Sequence[Tuple[int, int]]] = None,
+               cells_folder: Optional[str] = None, templates: Optional[GlyphTemplates] = None,
+               cache: Optional[CellOcrCache] = None) -> List[CellReading]:
+    """
+    Read the letter on every cell crop of a board: from the cache or by template where
+    possible, and otherwise with a few batched recognition calls.
+
+    Every cell is first binarized with Otsu's threshold. A cell whose glyph hashes to a cached
+    reading takes it, and the rest are matched against the glyph templates, if given; a
+    confident match settles the cell with its correlation as the confidence. Rather than
+    running EasyOCR's readtext (text detection, then recognition) once per cell and
+    threshold, the remaining cells are binarized with the same threshold, the results are
+    stacked into one image, and the recogniser alone is run over the letter boxes (see
+    get_ink_box) in a single batch. Cells read with CONFIDENT_READING or better are settled;
+    the rest try the next of THRESHOLD_METHODS, so a board takes at most three recognition
+    calls. Confident readings become templates and cache entries for the next board.
+    Args:
+        reader: An easyocr.Reader
+        cells: BGR crops of the cells to read
+        positions: (row, col) of each cell, for warnings and debug file names
+        cells_folder: If given, the first binarized version of each cell is saved there
+        templates: Glyph templates to try before OCR, and to add confident readings to
+        cache: Readings of cells seen before, checked first; its hit rate for the board is printed
+    Returns:
+        (letter, confidence) per cell, in the order given. A cell nothing could be read from
+        is assumed to be an I, and an empty crop is '?', both with confidence 0.
+    """
+    if positions is None:
+        positions = [(0, i) for i in range(len(cells))]
+    readings: List[CellReading] = [('', 0.0)] * len(cells)
+    prepared = [prepare_cell(cell) if cell is not None and cell.size else None for cell in cells]
+    for index, gray in enumerate(prepared):
+        if gray is None:
+            print(f"Warning: Empty cell at {positions[index]}")
+            readings[index] = ('?', 0.0)
+
+    pending = [index for index, gray in enumerate(prepared) if gray is not None]
+    glyphs = {}  # Otsu glyph of each cell left for OCR, for harvesting templates
+    hashes = {}  # Hash of each cell the cache didn't know
+    for method_index, method in enumerate(THRESHOLD_METHODS):
+        binaries = [binarize_cell(prepared[index], method) for index in pending]
+        boxes = [get_ink_box(binary) for binary in binaries]
+        if method_index == 0:
+            if cells_folder:
+                for index, binary in zip(pending, binaries):
+                    row, col = positions[index]
+                    cv2.imwrite(f'{cells_folder}/cell_{row}_{col}_binary.png', binary)
+            if templates is not None or cache is not None:
+                glyphs = {index: get_glyph(binary, box) for index, binary, box in zip(pending, binaries, boxes)}
+            if cache is not None:
+                for index in pending:
+                    cell_hash = get_cell_hash(glyphs[index])
+                    reading = cache.get(cell_hash)
+                    if reading is None:
+                        hashes[index] = cell_hash
+                    else:
+                        readings[index] = reading
+                hits = len(pending) - len(hashes)
+                print(f"Cell cache: {hits}/{len(pending)} cells known "
+                      f"({hits / max(len(pending), 1):.0%} hit rate)")
+            if templates is not None:
+                unread = [index for index in pending if not readings[index][0]]
+                for index, match in zip(unread, templates.classify([glyphs[index] for index in unread])):
+                    if match[0]:
+                        readings[index] = match
+            keep = [i for i, index in enumerate(pending) if not readings[index][0]]
+            pending = [pending[i] for i in keep]
+            glyphs = {index: glyphs[index] for index in pending if index in glyphs}
+            binaries, boxes = [binaries[i] for i in keep], [boxes[i] for i in keep]
+        if not pending:
+            break
+
+        # One tall image with a cell per tile, and the letter box of each tile
+        tile = binaries[0].shape[0]
+        stacked_boxes = [[x_min, x_max, y_min + i * tile, y_max + i * tile]
+                         for i, (x_min, x_max, y_min, y_max) in enumerate(boxes)]
+        try:
+            results = reader.recognize(np.vstack(binaries), horizontal_list=stacked_boxes, free_list=[],
+                                       allowlist=OCR_ALLOWLIST, batch_size=len(stacked_boxes), detail=1)
+        except Exception as e:
+            print(f"Warning: OCR failed for {len(stacked_boxes)} cells: {str(e)}")
+            continue
+
+        for box, text, confidence in results:
+            # Results may come back in another order, so match them to cells by position
+            index = pending[int(box[0][1]) // tile]
+            text = text.strip().upper()
+            if not text:
+                continue
+            if len(text) > 1:
+                print(f"Warning: OCR returned multiple characters '{text}' at {positions[index]}, "
+                      f"using only first character")
+                text = text[0]
+            if float(confidence) > readings[index][1]:
+                readings[index] = (text, float(confidence))
+        pending = [index for index in pending if readings[index][1] <= CONFIDENT_READING]
+
+    try:
+        if templates is not None:
+            added = [templates.add(readings[index][0], glyph) for index, glyph in glyphs.items()
+                     if readings[index][1] >= HARVEST_CONFIDENCE and readings[index][0] in OCR_ALLOWLIST]
+            if any(added):
+                templates.save()
+        if cache is not None:
+            stored = [cache.put(cell_hash, *readings[index]) for index, cell_hash in hashes.items()
+                      if readings[index][0]]
+            if any(stored):
+                cache.save()
+    except OSError as e:
+        # A read-only checkout still works, just without keeping what was learned
+        print(f"Warning: could not save what was learned from this board: {e}")
+
+    for index, (letter, _) in enumerate(readings):
+        if not letter:
+            print(f"Warning: Failed to detect letter at {positions[index]}, assuming it's an I")
+            readings[index] = ('I', 0.0)
+    return readings
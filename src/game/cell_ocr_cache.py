@@ -0,0 +1,108 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.config.config import CELL_OCR_CACHE_PATH
+
+# How many cell images the cache remembers before the least recently used is dropped
+CACHE_SIZE = 4096
+
+# Only readings at least this confident are cached
+CACHE_CONFIDENCE = 0.9
+
+# Stored with the entries, so a change to get_cell_hash empties the cache
+HASH_NAME = "ahash64"
+
+def get_cell_hash(glyph: np.ndarray) -> str:
+    """
+    64-bit average hash of a normalised cell glyph (see glyph_templates.get_glyph), as hex.
+    Each bit says whether a pixel of the glyph shrunk to 8x8 is mostly ink, so the same tile
+    hashes the same from game to game despite small changes in scale and brightness. (A
+    difference hash did worse on binarized glyphs: equal neighbours waste its bits, and
+    different letters collided.)
+    """
+    small = cv2.resize(glyph, (8, 8), interpolation=cv2.INTER_AREA)
+    bits = (small >= 128).flatten()
+    return f"{int(''.join('1' if bit else '0' for bit in bits), 2):016x}"
+
+class CellOcrCache:
+    """
+    Persistent LRU cache of the letter read from each cell image, keyed by get_cell_hash.
+
+    The same tile images come up game after game, so a cell seen before is answered without
+    template matching or OCR. Entries are kept in a JSON file, most recently used last, and
+    `hits`/`misses` count lookups since the cache was opened.
+    """
+
+    def __init__(self, path: Optional[str] = CELL_OCR_CACHE_PATH, max_entries: int = CACHE_SIZE):
+        """
+        Args:
+            path: File the cache is kept in, or None to keep it in memory only
+            max_entries: Most cell images remembered
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """Read the cache file, ignoring it if it is missing, unreadable or from another hash."""
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("hash") != HASH_NAME:
+            return
+        for cell_hash, (letter, confidence) in data.get("entries", []):
+            self._entries[cell_hash] = (letter, confidence)
+
+    def save(self) -> None:
+        """Write the cache file (through a temporary file, so a crash can't leave half of it)."""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "hash": HASH_NAME,
+            "entries": [[cell_hash, list(reading)] for cell_hash, reading in self._entries.items()],
+        }
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+    def get(self, cell_hash: str) -> Optional[Tuple[str, float]]:
+        """Return the (letter, confidence) cached for a cell hash, or None."""
+        reading = self._entries.get(cell_hash)
+        if reading is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(cell_hash)
+        return reading
+
+    def put(self, cell_hash: str, letter: str, confidence: float) -> bool:
+        """
+        Remember a reading if it is at least CACHE_CONFIDENCE, dropping the least recently used
+        cells. Returns whether it was stored; call save() once the board is done.
+        """
+        if confidence < CACHE_CONFIDENCE:
+            return False
+        self._entries[cell_hash] = (letter, float(confidence))
+        self._entries.move_to_end(cell_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
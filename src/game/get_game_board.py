@@ -1,22 +1,44 @@
 import os
 import time
-import numpy as np
 import cv2
 import Quartz
-import easyocr
 import argparse
+from src.game.board_ocr import read_cells
+from src.game.cell_ocr_cache import CellOcrCache
+from src.game.glyph_templates import GlyphTemplates
 from src.game.word_bites_board import WordBitesBoard, Block, BlockType
-from src.utils.window import find_iphone_window
+from src.game.word_bites_screen import get_cell_boxes, get_occupied_cells
+from src.utils.window import find_iphone_window, capture_frame
 
-# Initialize EasyOCR reader globally (it's slow to initialize)
-READER = easyocr.Reader(['en'], gpu=False)
+# EasyOCR reader (slow to initialize), created by load_ocr when the first board is read
+READER = None
+
+# Letter templates matched before falling back to OCR, learned from confident readings
+TEMPLATES = None
+
+# Letters already read from identical cell images in earlier games
+CELL_CACHE = None
+
+def load_ocr():
+    """
+    Create the EasyOCR reader, glyph templates and cell cache on first use. Not at import:
+    processes spawned from main.py import this module again, and must not each load the
+    OCR models and caches they never use.
+    """
+    global READER, TEMPLATES, CELL_CACHE
+    if READER is None:
+        import easyocr
+        READER = easyocr.Reader(['en'], gpu=False)
+        TEMPLATES = GlyphTemplates()
+        CELL_CACHE = CellOcrCache()
 
 def find_game_board(image, game_version, save_debug=False):
+    """Crop the board out of a BGR capture region (see ScreenFrame.get_region), as a view where possible"""
     # Create debug directory if it doesn't exist
     if save_debug and not os.path.exists('debug'):
         os.makedirs('debug')
         
-    opencv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+    opencv_image = image
     height, width = opencv_image.shape[:2]
     
     # Define cropping dimensions based on game version
@@ -77,93 +99,6 @@ def find_game_board(image, game_version, save_debug=False):
     
     return cropped
 
-def process_cell(cell, row, col, cells_folder=None):
-    """Process a single cell to extract its letter"""
-    if cell is None or cell.size == 0:
-        print(f"Warning: Empty cell at ({row},{col})")
-        return '?'
-        
-    # Convert to grayscale
-    gray = cv2.cvtColor(cell, cv2.COLOR_BGR2GRAY)
-    
-    # Resize to a larger size for better OCR
-    gray = cv2.resize(gray, (200, 200))
-    
-    # Apply adaptive histogram equalization
-    clahe = cv2.createCLAHE(clipLimit=1.5, tileGridSize=(4,4))
-    gray = clahe.apply(gray)
-    
-    # Try multiple preprocessing approaches
-    methods = [
-        # Standard Otsu's thresholding
-        lambda: cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1],
-        
-        # Fixed threshold for consistency
-        lambda: cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY_INV)[1],
-        
-        # Adaptive thresholding
-        lambda: cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                    cv2.THRESH_BINARY_INV, 15, 5),
-    ]
-    
-    best_result = None
-    max_confidence = 0
-    
-    for idx, get_binary in enumerate(methods):
-        binary = get_binary()
-        
-        # Standard morphological operations
-        kernel = np.ones((2,2), np.uint8)
-        binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
-        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
-        
-        # Add padding
-        binary = cv2.copyMakeBorder(binary, 20, 20, 20, 20, cv2.BORDER_CONSTANT, value=0)
-        
-        # Save debug images if requested
-        if cells_folder and idx == 0:
-            cv2.imwrite(f'{cells_folder}/cell_{row}_{col}_binary.png', binary)
-        
-        try:
-            # Use EasyOCR with confidence scores
-            result = READER.readtext(binary, 
-                                   allowlist='ABCDEFGHIJKLMNOPQRSTUVWXYZ',
-                                   batch_size=1,
-                                   detail=1)
-            
-            if result and len(result) > 0:
-                text = result[0][1].upper()
-                confidence = result[0][2]
-                
-                # Ensure we only take the first character
-                if len(text) > 1:
-                    print(f"Warning: OCR returned multiple characters '{text}' at ({row},{col}), using only first character")
-                    text = text[0]
-                
-                # Keep track of the highest confidence result
-                if confidence > max_confidence:
-                    max_confidence = confidence
-                    best_result = text
-                
-                # If we get a high confidence result, return immediately
-                if confidence > 0.8:
-                    return text
-                
-        except Exception as e:
-            print(f"Warning: OCR failed for cell ({row},{col}): {str(e)}")
-            continue
-    
-    # Return the highest confidence result if we found one
-    if best_result:
-        # Ensure we only return a single character
-        if len(best_result) > 1:
-            print(f"Warning: Best OCR result has multiple characters '{best_result}' at ({row},{col}), using only first character")
-            best_result = best_result[0]
-        return best_result
-    
-    print(f"Warning: Failed to detect letter at ({row},{col}), assuming it's an I")
-    return 'I'  # Default to I instead of '?' when recognition fails
-
 def move_mouse_away(window_bounds):
     """Move mouse just above the game board"""
     # Get window position
@@ -181,97 +116,45 @@ def move_mouse_away(window_bounds):
     move = Quartz.CGEventCreateMouseEvent(None, Quartz.kCGEventMouseMoved, (target_x, target_y), 0)
     Quartz.CGEventPost(Quartz.kCGHIDEventTap, move)
 
-def is_mostly_blue(cell_image):
-    """Check if a cell is mostly blue (background)"""
-    # Convert to HSV for better color detection
-    hsv = cv2.cvtColor(cell_image, cv2.COLOR_BGR2HSV)
-    
-    # Define blue range in HSV
-    lower_blue = np.array([100, 50, 50])
-    upper_blue = np.array([130, 255, 255])
-    
-    # Create mask for blue pixels
-    blue_mask = cv2.inRange(hsv, lower_blue, upper_blue)
-    
-    # Calculate percentage of blue pixels
-    total_pixels = cell_image.shape[0] * cell_image.shape[1]
-    blue_pixels = np.count_nonzero(blue_mask)
-    blue_percentage = blue_pixels / total_pixels
-    
-    return blue_percentage > 0.5  # Return True if more than 50% is blue
-
-def get_game_board(game_version="4x4", save_debug=False):
-    """Returns the current game board as a 2D list of letters"""
+def capture_game_frame():
+    """
+    Move the mouse off the board and capture the iPhone window once, for identify_game_version
+    and get_game_board to share. Returns None if there is no window.
+    """
     window_bounds = find_iphone_window()
     if not window_bounds:
         return None
-        
-    # Move mouse away before taking screenshot
     move_mouse_away(window_bounds)
     time.sleep(0.1)  # Small delay to ensure mouse has moved
-    
-    # Set padding based on game version
-    padding = 0 if game_version.startswith("ANAGRAM") else 20
-    
-    # For anagram modes, adjust the capture region to maintain aspect ratio
-    if game_version.startswith("ANAGRAM"):
-        # Calculate aspect ratio of iPhone screen (typically 9:19.5)
-        aspect_ratio = 9/19.5
-        
-        # Get window dimensions
-        window_width = int(window_bounds['width'])
-        window_height = int(window_bounds['height'])
-        
-        # Adjust capture region to maintain aspect ratio
-        target_height = window_height
-        target_width = int(target_height * aspect_ratio)
-        
-        # Center the capture region
-        x_offset = (window_width - target_width) // 2
-        x = int(window_bounds['x']) + x_offset
-        y = int(window_bounds['y'])
-        width = target_width
-        height = target_height
-    else:
-        # Normal padding-based capture for non-anagram modes
-        x = int(window_bounds['x']) + padding
-        y = int(window_bounds['y']) + padding
-        width = int(window_bounds['width']) - (2 * padding)
-        height = int(window_bounds['height']) - (2 * padding)
-    
-    # Create CGImage
-    region = Quartz.CGRectMake(x, y, width, height)
-    image = Quartz.CGWindowListCreateImage(
-        region,
-        Quartz.kCGWindowListOptionOnScreenOnly,
-        Quartz.kCGNullWindowID,
-        Quartz.kCGWindowImageDefault
-    )
-    
-    # Convert to PIL Image
-    width = Quartz.CGImageGetWidth(image)
-    height = Quartz.CGImageGetHeight(image)
-    bytesperrow = Quartz.CGImageGetBytesPerRow(image)
-    pixeldata = Quartz.CGDataProviderCopyData(Quartz.CGImageGetDataProvider(image))
-    
-    import PIL.Image
-    screenshot = PIL.Image.frombytes('RGBA', (width, height), pixeldata, 'raw', 'BGRA')
-    
-    # If it's an anagram mode, crop out the padding after capturing
-    if game_version.startswith("ANAGRAM"):
-        # Remove padding from all sides
-        crop_box = (
-            padding,  # left
-            padding,  # top
-            width - padding,  # right
-            height - padding  # bottom
-        )
-        screenshot = screenshot.crop(crop_box)
+    return capture_frame(window_bounds)
+
+def capture_word_bites_cells(save_debug=False):
+    """
+    Recapture the Word Bites board and return which cells are covered by a tile, as a
+    (rows, cols) bool array - no OCR, so it is cheap enough to check the board model
+    against during a game. Returns None if there is no window.
+    """
+    frame = capture_frame()
+    if frame is None:
+        return None
+    return get_occupied_cells(find_game_board(frame.get_region("WORD_BITES"), "WORD_BITES", save_debug))
+
+def get_game_board(game_version="4x4", save_debug=False, frame=None):
+    """
+    Returns the current game board as a 2D list of letters (a WordBitesBoard for Word Bites).
+    Reads `frame` if given, e.g. the one identify_game_version looked at, rather than
+    capturing the window again.
+    """
+    if frame is None:
+        frame = capture_game_frame()
+    if frame is None:
+        return None
     
     # Find and crop game board
-    board_image = find_game_board(screenshot, game_version, save_debug)
+    board_image = find_game_board(frame.get_region(game_version), game_version, save_debug)
     if board_image is None:
         return None
+    load_ocr()
         
     # Create debug directory if it doesn't exist
     if save_debug and not os.path.exists('debug'):
@@ -312,43 +195,34 @@ def get_game_board(game_version="4x4", save_debug=False):
         if save_debug:
             cv2.imwrite(f'{cells_folder}/grid_lines.png', debug_image)
         
-        # Process each cell
+        # Find the tiles in one pass over the board rather than cell by cell
+        occupied = get_occupied_cells(board_image, board.ROWS, board.COLS)
+        
+        # Collect the covered cells, then read them all at once
+        cells, positions = [], []
+        y1s, y2s, x1s, x2s = get_cell_boxes(height, width, board.ROWS, board.COLS)
         for i in range(board.ROWS):  # 9 rows
             for j in range(board.COLS):  # 8 columns
-                # Calculate cell boundaries more precisely
-                x1 = int(j * (width / board.COLS))
-                y1 = int(i * (height / board.ROWS))
-                x2 = int((j + 1) * (width / board.COLS))
-                y2 = int((i + 1) * (height / board.ROWS))
-                
-                # Extract region with margins
-                # Use larger margin horizontally (for left/right) and smaller margin vertically (for top/bottom)
-                h_margin = int(width * 0.02)  # 1% of width for horizontal margins
-                v_margin = 4  # Small fixed margin for vertical
-                cell = board_image[
-                    y1 + v_margin:y2 - v_margin,
-                    x1 + h_margin:x2 - h_margin
-                ]
+                # Cell bounds with margins: larger horizontally, a few pixels vertically
+                cell = board_image[y1s[i, j]:y2s[i, j], x1s[i, j]:x2s[i, j]]
                 
                 # Save the cell only if debug is enabled
                 if save_debug:
                     cv2.imwrite(f'{cells_folder}/cell_{i}_{j}.png', cell)
                 
                 # Skip if cell is mostly blue background
-                if is_mostly_blue(cell):
-                    continue
-                
-                # Process the cell to get the letter
-                letter = process_cell(cell, i, j, cells_folder)
-                if letter:
-                    # For now, treat all blocks as single blocks
-                    # TODO: Detect vertical/horizontal stacks
-                    block = Block(
-                        type=BlockType.SINGLE,
-                        letters=[letter],
-                        position=(i, j)
-                    )
-                    board.add_block(block)
+                if occupied[i, j]:
+                    cells.append(cell)
+                    positions.append((i, j))
+        
+        # For now, treat all blocks as single blocks
+        # TODO: Detect vertical/horizontal stacks
+        readings = read_cells(READER, cells, positions, cells_folder, TEMPLATES, CELL_CACHE)
+        recognised_blocks = [Block(type=BlockType.SINGLE, letters=[letter], position=position)
+                             for (letter, _), position in zip(readings, positions)]
+        
+        # Add every block, then combine touching ones in a single pass
+        board.add_blocks(recognised_blocks)
         
         return board
     
@@ -366,8 +240,8 @@ def get_game_board(game_version="4x4", save_debug=False):
             h_padding = int(cell_width * 0.15)
             v_padding = 0
         
-        # Create a single row for anagram letters
-        row = []
+        # Collect the letter cells, then read them all at once
+        cells = []
         for j in range(num_letters):
             x = j * cell_width
             # Apply padding to each cell
@@ -381,11 +255,11 @@ def get_game_board(game_version="4x4", save_debug=False):
                     os.makedirs(cells_folder)
                 cv2.imwrite(f'{cells_folder}/cell_0_{j}_margins.png', cell)
             
-            # Process the cell
-            letter = process_cell(cell, 0, j, cells_folder if save_debug else None)
-            row.append(letter)
+            cells.append(cell)
         
-        return [row]  # Return as a single-row grid for consistency
+        readings = read_cells(READER, cells, [(0, j) for j in range(num_letters)],
+                              cells_folder if save_debug else None, TEMPLATES, CELL_CACHE)
+        return [[letter for letter, _ in readings]]  # Return as a single-row grid for consistency
     else:
         # Define empty cells for X and O versions
         empty_cells = set()
@@ -413,13 +287,12 @@ def get_game_board(game_version="4x4", save_debug=False):
         print(f"Grid size: {grid_size}x{grid_size}")
         print(f"Cell dimensions: {cell_width}x{cell_height}")
         
-        # Process each cell
-        grid = []
+        # Collect every letter cell, then read them all at once
+        grid = [[' '] * grid_size for _ in range(grid_size)]  # Empty cells stay blank
+        cells, positions = [], []
         for i in range(grid_size):
-            row = []
             for j in range(grid_size):
                 if (i,j) in empty_cells:
-                    row.append(' ')  # or whatever character you want to use for empty cells
                     continue
                     
                 x = j * cell_width
@@ -432,10 +305,12 @@ def get_game_board(game_version="4x4", save_debug=False):
                 if save_debug:
                     cv2.imwrite(f'{cells_folder}/cell_{i}_{j}_margins.png', cell)
                 
-                # Process the cell
-                letter = process_cell(cell, i, j, cells_folder)
-                row.append(letter)
-            grid.append(row)
+                cells.append(cell)
+                positions.append((i, j))
+        
+        readings = read_cells(READER, cells, positions, cells_folder, TEMPLATES, CELL_CACHE)
+        for (letter, _), (i, j) in zip(readings, positions):
+            grid[i][j] = letter
         
         return grid
 
@@ -0,0 +1,136 @@
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.config.config import GLYPH_TEMPLATES_PATH
+
+# Side of the square every glyph is scaled to before matching
+GLYPH_SIZE = 32
+
+# Samples kept per letter, so a letter drawn slightly differently (e.g. on a selected tile) still matches
+TEMPLATES_PER_LETTER = 3
+
+# A match must correlate at least this well, and beat every other letter by this much, to be trusted
+MATCH_THRESHOLD = 0.85
+MATCH_MARGIN = 0.05
+
+# Only OCR readings at least this confident become templates
+HARVEST_CONFIDENCE = 0.9
+
+def get_glyph(binary: np.ndarray, box: Tuple[int, int, int, int]) -> np.ndarray:
+    """Scale the (x_min, x_max, y_min, y_max) box of a binarized cell to a GLYPH_SIZE square."""
+    x_min, x_max, y_min, y_max = box
+    return cv2.resize(binary[y_min:y_max, x_min:x_max], (GLYPH_SIZE, GLYPH_SIZE), interpolation=cv2.INTER_AREA)
+
+def normalize_glyphs(glyphs: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Flatten glyphs into zero-mean, unit-length rows, so the dot product of two rows is their
+    normalised cross-correlation. A blank glyph becomes all zeros and matches nothing.
+    """
+    vectors = np.asarray(glyphs, np.float32).reshape(len(glyphs), -1)
+    vectors = vectors - vectors.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-6)
+
+class GlyphTemplates:
+    """
+    Persistent per-letter templates of the game's tile font, matched by normalised cross-correlation.
+
+    The tiles are always drawn in the same font, so once a letter has been read confidently
+    by OCR its glyph identifies that letter on later boards in well under a millisecond.
+    Templates are harvested from confident OCR readings (see add) and kept in a .npz file.
+    """
+
+    def __init__(self, path: Optional[str] = GLYPH_TEMPLATES_PATH, per_letter: int = TEMPLATES_PER_LETTER):
+        """
+        Args:
+            path: File the templates are kept in, or None to keep them in memory only
+            per_letter: Most templates kept for each letter
+        """
+        self.path = path
+        self.per_letter = per_letter
+        self._glyphs: Dict[str, List[np.ndarray]] = {}
+        self._letters: List[str] = []
+        self._matrix = np.zeros((0, GLYPH_SIZE * GLYPH_SIZE), np.float32)
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._letters)
+
+    @property
+    def letters(self) -> List[str]:
+        """The letters there is at least one template for, in alphabetical order."""
+        return sorted(self._glyphs)
+
+    def _load(self) -> None:
+        """Read the templates file, ignoring it if it is missing or unreadable."""
+        if not self.path:
+            return
+        try:
+            with np.load(self.path) as data:
+                letters, glyphs = list(data["letters"]), data["glyphs"]
+        except (OSError, ValueError, KeyError):
+            return
+        if glyphs.shape[1:] != (GLYPH_SIZE, GLYPH_SIZE):
+            return
+        for letter, glyph in zip(letters, glyphs):
+            self._glyphs.setdefault(str(letter), []).append(glyph)
+        self._rebuild()
+
+    def save(self) -> None:
+        """Write the templates file (through a temporary file, so a crash can't leave half of it)."""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        letters = [letter for letter in sorted(self._glyphs) for _ in self._glyphs[letter]]
+        glyphs = [glyph for letter in sorted(self._glyphs) for glyph in self._glyphs[letter]]
+        temp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(temp_path, letters=np.array(letters),
+                            glyphs=np.array(glyphs, np.uint8).reshape(-1, GLYPH_SIZE, GLYPH_SIZE))
+        os.replace(temp_path, self.path)
+
+    def _rebuild(self) -> None:
+        """Restack the normalised templates after a change."""
+        self._letters = [letter for letter, glyphs in self._glyphs.items() for _ in glyphs]
+        glyphs = [glyph for glyphs in self._glyphs.values() for glyph in glyphs]
+        self._matrix = (normalize_glyphs(glyphs) if glyphs
+                        else np.zeros((0, GLYPH_SIZE * GLYPH_SIZE), np.float32))
+
+    def add(self, letter: str, glyph: np.ndarray) -> bool:
+        """
+        Remember `glyph` (from get_glyph) as a template for `letter`, unless the letter already
+        has its fill of templates or an existing one matches it well. Returns whether it was added.
+        """
+        samples = self._glyphs.setdefault(letter, [])
+        if len(samples) >= self.per_letter:
+            return False
+        if samples and float(np.max(normalize_glyphs(samples) @ normalize_glyphs([glyph])[0])) >= MATCH_THRESHOLD:
+            return False
+        samples.append(np.asarray(glyph, np.uint8))
+        self._rebuild()
+        return True
+
+    def classify(self, glyphs: Sequence[np.ndarray]) -> List[Tuple[str, float]]:
+        """
+        Match every glyph against every template in one matrix product.
+        Returns:
+            (letter, score) per glyph: the best matching letter and its correlation, or ('', 0.0)
+            where no match clears MATCH_THRESHOLD by MATCH_MARGIN over every other letter.
+        """
+        if not len(glyphs) or not len(self._letters):
+            return [('', 0.0)] * len(glyphs)
+        scores = normalize_glyphs(glyphs) @ self._matrix.T
+        matches = []
+        for row in scores:
+            order = np.argsort(row)[::-1]
+            letter, score = self._letters[order[0]], float(row[order[0]])
+            runner_up = next((float(row[i]) for i in order[1:] if self._letters[i] != letter), -1.0)
+            if score >= MATCH_THRESHOLD and score - runner_up >= MATCH_MARGIN:
+                matches.append((letter, score))
+            else:
+                matches.append(('', 0.0))
+        return matches
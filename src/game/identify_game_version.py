@@ -1,18 +1,17 @@
-import Quartz
 import cv2
 import numpy as np
 import os
-import PIL.Image
 import traceback
-from PIL import Image
-from src.utils.window import find_iphone_window
+from src.utils.window import find_iphone_window, capture_frame
 
-def identify_game_version(save_debug=False):
+def identify_game_version(save_debug=False, frame=None):
     """
     Identify which version of the game is being played.
     
     Args:
         save_debug: If True, save debug images to the debug directory.
+        frame: ScreenFrame to look at, e.g. from capture_game_frame, so get_game_board can
+            read the same capture; the window is captured if not given.
         
     Returns:
         str: The game version ("4x4", "X", "O", "ANAGRAM6", "ANAGRAM7", or "WORD_BITES")
@@ -22,56 +21,29 @@ def identify_game_version(save_debug=False):
         if save_debug and not os.path.exists('debug'):
             os.makedirs('debug')
         
-        print("Looking for iPhone window...")
-        window_bounds = find_iphone_window()
-        if not window_bounds:
-            print("No iPhone window found")
-            return None
-        
-        print(f"iPhone window found at: x={window_bounds['x']}, y={window_bounds['y']}, width={window_bounds['width']}, height={window_bounds['height']}")
+        if frame is None:
+            print("Looking for iPhone window...")
+            window_bounds = find_iphone_window()
+            if not window_bounds:
+                print("No iPhone window found")
+                return None
             
-        # Capture screenshot using Quartz (macOS)
-        padding = 20
-        x = int(window_bounds['x']) + padding
-        y = int(window_bounds['y']) + padding
-        width = int(window_bounds['width']) - (2 * padding)
-        height = int(window_bounds['height']) - (2 * padding)
-        
-        # Get screen size
-        screen = Quartz.CGDisplayBounds(Quartz.CGMainDisplayID())
-        screen_height = int(screen.size.height)
-        
-        print(f"Capturing screenshot at: x={x}, y={y}, width={width}, height={height}")
-        
-        # Create CGImage
-        region = Quartz.CGRectMake(x, y, width, height)
-        image = Quartz.CGWindowListCreateImage(
-            region,
-            Quartz.kCGWindowListOptionOnScreenOnly,
-            Quartz.kCGNullWindowID,
-            Quartz.kCGWindowImageDefault
-        )
-        
-        if image is None:
-            print("Failed to capture screenshot")
-            return None
-        
-        # Convert to PIL Image
-        width = Quartz.CGImageGetWidth(image)
-        height = Quartz.CGImageGetHeight(image)
-        bytesperrow = Quartz.CGImageGetBytesPerRow(image)
-        pixeldata = Quartz.CGDataProviderCopyData(Quartz.CGImageGetDataProvider(image))
+            print(f"iPhone window found at: x={window_bounds['x']}, y={window_bounds['y']}, width={window_bounds['width']}, height={window_bounds['height']}")
+            frame = capture_frame(window_bounds)
+            if frame is None:
+                print("Failed to capture screenshot")
+                return None
         
-        screenshot = PIL.Image.frombytes('RGBA', (width, height), pixeldata, 'raw', 'BGRA')
+        # The window less its padding, as a view of the shared frame
+        opencv_image = frame.get_region()
+        height, width = opencv_image.shape[:2]
         
         # Save debug image only if requested
         if save_debug:
             debug_path = os.path.join('debug', 'game_screenshot.png')
-            screenshot.save(debug_path)
+            cv2.imwrite(debug_path, opencv_image)
             print(f"Saved debug screenshot to {debug_path}")
         
-        # Convert to OpenCV format and HSV
-        opencv_image = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
         hsv = cv2.cvtColor(opencv_image, cv2.COLOR_BGR2HSV)
         
         # Create masks for green, purple, and blue (Word Bites)
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List, Optional, Tuple, Set
+from dataclasses import FrozenInstanceError
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Set
 from enum import Enum
 
 class BlockType(Enum):
@@ -7,27 +7,49 @@ class BlockType(Enum):
     VERTICAL = "vertical"
     HORIZONTAL = "horizontal"
 
-@dataclass(frozen=True)
 class Block:
-    """Represents a single block in the Word Bites game"""
+    """
+    Represents a single block in the Word Bites game.
+    Immutable, like a frozen dataclass, but a plain slotted class: boards and planners make
+    a new Block for every move, and skipping the dataclass __init__ and validation for
+    blocks derived from an existing one makes that several times cheaper.
+    """
+    __slots__ = ('type', 'letters', 'position', 'id')
+
     type: BlockType
-    letters: List[str]  # Will contain 1 or 2 letters depending on type
+    letters: Tuple[str, ...]  # 1 or 2 letters depending on type
     position: Tuple[int, int]  # (row, col) coordinates of primary position
-    
-    def __post_init__(self):
-        # Convert letters list to tuple to make it immutable
-        object.__setattr__(self, 'letters', tuple(self.letters))
-        
+    # -1 until the block is added to a board, which assigns it an id that is kept by every
+    # move for the rest of the game
+    id: int
+
+    def __init__(self, type: BlockType, letters: Sequence[str], position: Tuple[int, int]):
+        letters = tuple(letters)
         # Validate block configuration
-        if self.type == BlockType.SINGLE and len(self.letters) != 1:
+        if type == BlockType.SINGLE and len(letters) != 1:
             raise ValueError("Single blocks must have exactly one letter")
-        if (self.type in [BlockType.VERTICAL, BlockType.HORIZONTAL] and 
-            len(self.letters) != 2):
+        if (type in [BlockType.VERTICAL, BlockType.HORIZONTAL] and
+            len(letters) != 2):
             raise ValueError("Vertical and horizontal blocks must have exactly two letters")
-    
+        _set_fields(self, type, letters, position, -1)
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.type, self.letters, self.position) == (other.type, other.letters, other.position)
+
     def __hash__(self):
         return hash((self.type, self.letters, self.position))
-    
+
+    def __repr__(self):
+        return f"Block(type={self.type!r}, letters={self.letters!r}, position={self.position!r})"
+
     def get_all_positions(self) -> Set[Tuple[int, int]]:
         """Get all positions this block occupies"""
         positions = {self.position}
@@ -37,48 +59,161 @@ class Block:
         elif self.type == BlockType.HORIZONTAL:
             positions.add((row, col + 1))
         return positions
-    
+
+    def with_id(self, block_id: int) -> 'Block':
+        """Create a copy of this block carrying the given id"""
+        return _make_block(self.type, self.letters, self.position, block_id)
+
     def move_to(self, new_row: int, new_col: int) -> 'Block':
-        """Create a new block at the new position (since Block is immutable)"""
-        return Block(
-            type=self.type,
-            letters=list(self.letters),  # Convert back to list for constructor
-            position=(new_row, new_col)
-        )
+        """Create a new block at the new position (since Block is immutable), keeping its id"""
+        return _make_block(self.type, self.letters, (new_row, new_col), self.id)
+
+    def __reduce__(self):
+        # Slotted and immutable, so the default pickling can't set the attributes
+        return (_make_block, (self.type, self.letters, self.position, self.id))
+
+def _set_fields(block: Block, block_type: BlockType, letters: Tuple[str, ...], position: Tuple[int, int],
+                block_id: int) -> None:
+    """Fill in a block's slots, past the __setattr__ that keeps it immutable."""
+    object.__setattr__(block, 'type', block_type)
+    object.__setattr__(block, 'letters', letters)
+    object.__setattr__(block, 'position', position)
+    object.__setattr__(block, 'id', block_id)
+
+def _make_block(block_type: BlockType, letters: Tuple[str, ...], position: Tuple[int, int], block_id: int) -> Block:
+    """Create a block from fields taken from a valid one, skipping the validation (also unpickles)."""
+    block = object.__new__(Block)
+    _set_fields(block, block_type, letters, position, block_id)
+    return block
+
+# Footprints of every on-board position, per (rows, cols, block type)
+_footprint_cache: Dict[Tuple[int, int, BlockType], List[Tuple[int, Tuple[int, int]]]] = {}
 
 class WordBitesBoard:
     ROWS = 9  # 9 rows
     COLS = 8  # 8 columns
     
     def __init__(self):
-        self.blocks: List[Block] = []
-        # We'll maintain a grid of references to blocks for easy position-based lookup
-        self.grid: List[List[Optional[Block]]] = [[None for _ in range(self.COLS)] for _ in range(self.ROWS)]
-        # Add a letter-to-blocks index for faster lookups
-        self.letter_to_blocks = {}  # Maps letter -> list of blocks containing that letter
+        # Occupancy bitboard: bit (row * COLS + col) is set when that cell is covered
+        self.occupancy = 0
+        # Flat row-major array of the id of the block covering each cell (-1 when empty)
+        self.cell_ids: List[int] = [-1] * (self.ROWS * self.COLS)
+        # Blocks keyed by their id, in the order they were added
+        self._blocks: Dict[int, Block] = {}
+        self._next_id = 0  # Next id handed to a block added without one
+        # Indexes kept up to date by every add, move and remove
+        self.letter_to_ids: Dict[str, Set[int]] = {}  # letter -> ids of blocks containing it
+        self.kind_to_ids: Dict[Tuple[Tuple[str, ...], BlockType], Set[int]] = {}  # (letters, type) -> ids
+        self.position_to_id: Dict[Tuple[int, int], int] = {}  # primary position -> id
+        self._indexes_shared = False  # True while a copy shares the letter and kind indexes
     
-    def is_valid_position(self, block: Block, row: int, col: int) -> bool:
-        """Check if a block can be placed at the given position"""
+    @property
+    def blocks(self) -> List[Block]:
+        """All blocks on the board, in the order they were added."""
+        return list(self._blocks.values())
+    
+    @property
+    def grid(self) -> List[List[Optional[Block]]]:
+        """Row-major grid of the block covering each cell (built on demand)."""
+        return [[self.get_block_at(row, col) for col in range(self.COLS)] for row in range(self.ROWS)]
+    
+    def footprint_mask(self, block_type: BlockType, row: int, col: int) -> int:
+        """
+        Return the occupancy bits a block of the given type would cover at (row, col),
+        or 0 if it would hang off the board.
+        """
         if not (0 <= row < self.ROWS and 0 <= col < self.COLS):
-            return False
-            
-        # Check all positions the block would occupy
-        if block.type == BlockType.VERTICAL:
+            return 0
+        bit = 1 << (row * self.COLS + col)
+        if block_type is BlockType.VERTICAL:
             if row + 1 >= self.ROWS:
-                return False
-            return (self.grid[row][col] is None and 
-                   self.grid[row + 1][col] is None)
-        elif block.type == BlockType.HORIZONTAL:
+                return 0
+            return bit | (bit << self.COLS)
+        if block_type is BlockType.HORIZONTAL:
             if col + 1 >= self.COLS:
-                return False
-            return (self.grid[row][col] is None and 
-                   self.grid[row][col + 1] is None)
-        else:  # SINGLE
-            return self.grid[row][col] is None
+                return 0
+            return bit | (bit << 1)
+        return bit
+    
+    def footprints(self, block_type: BlockType) -> List[Tuple[int, Tuple[int, int]]]:
+        """Every (footprint_mask, position) a block of the given type can occupy on the board."""
+        key = (self.ROWS, self.COLS, block_type)
+        if key not in _footprint_cache:
+            _footprint_cache[key] = [(self.footprint_mask(block_type, row, col), (row, col))
+                                     for row in range(self.ROWS) for col in range(self.COLS)
+                                     if self.footprint_mask(block_type, row, col)]
+        return _footprint_cache[key]
+    
+    def copy(self) -> 'WordBitesBoard':
+        """
+        Return an independent copy of the board for what-if evaluation.
+        Blocks are immutable, so only the containers need copying - no deepcopy.
+        Moves never change the letter and kind indexes, so those are shared until
+        either board adds or removes a block.
+        """
+        board = self.__class__.__new__(self.__class__)
+        board.__dict__.update(self.__dict__)
+        board.cell_ids = self.cell_ids[:]
+        board._blocks = dict(self._blocks)
+        board.position_to_id = dict(self.position_to_id)
+        self._indexes_shared = board._indexes_shared = True
+        return board
+    
+    def _own_indexes(self) -> None:
+        """Take a private copy of the letter and kind indexes before changing them."""
+        if self._indexes_shared:
+            self.letter_to_ids = {letter: set(ids) for letter, ids in self.letter_to_ids.items()}
+            self.kind_to_ids = {kind: set(ids) for kind, ids in self.kind_to_ids.items()}
+            self._indexes_shared = False
+
+    def __copy__(self) -> 'WordBitesBoard':
+        return self.copy()
+
+    def __deepcopy__(self, memo) -> 'WordBitesBoard':
+        return self.copy()
+
+    def is_valid_position(self, block: Block, row: int, col: int) -> bool:
+        """Check if a block can be placed at the given position"""
+        mask = self.footprint_mask(block.type, row, col)
+        return mask != 0 and not (self.occupancy & mask)
+    
+    def is_valid_move(self, block: Block, row: int, col: int) -> bool:
+        """Check if a block on the board can be moved to the given position (it may overlap itself)"""
+        new_mask = self.footprint_mask(block.type, row, col)
+        old_mask = self.footprint_mask(block.type, *block.position)
+        return new_mask != 0 and not (self.occupancy & ~old_mask & new_mask)
+    
+    def _place(self, block_id: int, block: Block, mask: int) -> None:
+        """Record a block as covering the cells in `mask`."""
+        self._blocks[block_id] = block
+        self.occupancy |= mask
+        self.position_to_id[block.position] = block_id
+        row, col = block.position
+        index = row * self.COLS + col
+        self.cell_ids[index] = block_id
+        if block.type is BlockType.VERTICAL:
+            self.cell_ids[index + self.COLS] = block_id
+        elif block.type is BlockType.HORIZONTAL:
+            self.cell_ids[index + 1] = block_id
+    
+    def _clear(self, block: Block) -> int:
+        """Clear the cells covered by a block and return the bits it covered."""
+        row, col = block.position
+        mask = self.footprint_mask(block.type, row, col)
+        self.occupancy &= ~mask
+        del self.position_to_id[block.position]
+        index = row * self.COLS + col
+        self.cell_ids[index] = -1
+        if block.type is BlockType.VERTICAL:
+            self.cell_ids[index + self.COLS] = -1
+        elif block.type is BlockType.HORIZONTAL:
+            self.cell_ids[index + 1] = -1
+        return mask
     
     def add_block(self, block: Block, combine: bool = True) -> bool:
         """
         Add a block to the board if the position is valid and empty.
+        A block without an id (or whose id is already taken) is given a new one.
         Args:
             block: The block to add
             combine: Whether to check for and combine touching blocks after adding
@@ -88,96 +223,90 @@ class WordBitesBoard:
         
         if not self.is_valid_position(block, row, col):
             return False
-            
-        # Add block to all its positions
-        for pos_row, pos_col in block.get_all_positions():
-            self.grid[pos_row][pos_col] = block
-            
-        self.blocks.append(block)
         
-        # Add to letter-to-blocks index
+        block_id = block.id
+        if block_id < 0 or block_id in self._blocks:
+            block_id = self._next_id
+            block = block.with_id(block_id)
+        self._next_id = max(self._next_id, block_id + 1)
+        self._place(block_id, block, self.footprint_mask(block.type, row, col))
+        
+        # Add to the letter and kind indexes
+        self._own_indexes()
         for letter in block.letters:
-            if letter not in self.letter_to_blocks:
-                self.letter_to_blocks[letter] = []
-            self.letter_to_blocks[letter].append(block)
+            self.letter_to_ids.setdefault(letter, set()).add(block_id)
+        self.kind_to_ids.setdefault((block.letters, block.type), set()).add(block_id)
         
         # After adding a block, optionally check for and combine touching blocks
         if combine:
             self.combine_touching_blocks()
         return True
     
+    def add_blocks(self, blocks: Iterable[Block], combine: bool = True) -> int:
+        """
+        Add many blocks at once, e.g. every cell recognised from a screenshot.
+        Touching single blocks are combined once at the end rather than after each block.
+        Args:
+            blocks: The blocks to add
+            combine: Whether to combine touching blocks after adding them all
+        Returns the number of blocks that were added.
+        """
+        added = 0
+        for block in blocks:
+            if self.add_block(block, combine=False):
+                added += 1
+        if combine:
+            self.combine_touching_blocks()
+        return added
+    
     def combine_touching_blocks(self) -> None:
-        """Combine single blocks that are touching into double blocks."""
-        # Keep track of blocks we've already processed
-        processed = set()
-        new_blocks = []
-        blocks_to_remove = []
-
-        for block in self.blocks:
-            if block in processed:
+        """
+        Combine single blocks that are touching into double blocks.
+        
+        Makes one row-major pass over the cells. Each single block is paired with the
+        single to its right if there is one, otherwise with the single below it. Both
+        of those neighbours come later in the pass, so a block is never considered
+        after it has already been left single.
+        """
+        for index in range(self.ROWS * self.COLS):
+            block_id = self.cell_ids[index]
+            if block_id < 0:
                 continue
-
+            block = self._blocks[block_id]
+            if block.type is not BlockType.SINGLE:
+                continue
+            
             row, col = block.position
             
-            # Only try to combine single blocks
-            if block.type != BlockType.SINGLE:
-                new_blocks.append(block)
-                processed.add(block)
-                continue
-
-            # Check right for horizontal connection
-            right_block = self.get_block_at(row, col + 1)
-            if (right_block and right_block.type == BlockType.SINGLE and 
-                right_block not in processed):
-                # Create horizontal double block
-                new_block = Block(
-                    type=BlockType.HORIZONTAL,
-                    letters=[block.letters[0], right_block.letters[0]],
-                    position=(row, col)
-                )
-                new_blocks.append(new_block)
-                processed.add(block)
-                processed.add(right_block)
-                blocks_to_remove.extend([block, right_block])
-                continue
-
-            # Check below for vertical connection
-            below_block = self.get_block_at(row + 1, col)
-            if (below_block and below_block.type == BlockType.SINGLE and 
-                below_block not in processed):
-                # Create vertical double block
-                new_block = Block(
-                    type=BlockType.VERTICAL,
-                    letters=[block.letters[0], below_block.letters[0]],
-                    position=(row, col)
-                )
-                new_blocks.append(new_block)
-                processed.add(block)
-                processed.add(below_block)
-                blocks_to_remove.extend([block, below_block])
-                continue
-
-            # If no connections found, keep as single block
-            if block not in processed:
-                new_blocks.append(block)
-                processed.add(block)
-
-        # Clear the board and add all blocks back
-        # First, clear the letter-to-blocks index
-        self.letter_to_blocks.clear()
-        
-        self.blocks.clear()
-        self.grid = [[None for _ in range(self.COLS)] for _ in range(self.ROWS)]
-        
-        # Add all the new blocks without combining (to prevent recursion)
-        for block in new_blocks:
-            if block not in blocks_to_remove:
-                self.add_block(block, combine=False)
+            # Check right for horizontal connection, then below for vertical connection
+            for block_type, neighbour in ((BlockType.HORIZONTAL, self.get_block_at(row, col + 1)),
+                                          (BlockType.VERTICAL, self.get_block_at(row + 1, col))):
+                if neighbour is not None and neighbour.type is BlockType.SINGLE:
+                    self.remove_block(row, col)
+                    self.remove_block(*neighbour.position)
+                    self.add_block(Block(
+                        type=block_type,
+                        letters=[block.letters[0], neighbour.letters[0]],
+                        position=(row, col)
+                    ), combine=False)
+                    break
 
+    def get_block(self, block_id: int) -> Optional[Block]:
+        """Get the block with the given id (wherever it is now), if it is still on the board."""
+        return self._blocks.get(block_id)
+    
+    def get_block_id_at(self, row: int, col: int) -> int:
+        """Get the id of the block covering the specified cell, or -1 if it is empty."""
+        if 0 <= row < self.ROWS and 0 <= col < self.COLS:
+            return self.cell_ids[row * self.COLS + col]
+        return -1
+    
     def get_block_at(self, row: int, col: int) -> Optional[Block]:
         """Get the block at the specified position, if any."""
         if 0 <= row < self.ROWS and 0 <= col < self.COLS:
-            return self.grid[row][col]
+            block_id = self.cell_ids[row * self.COLS + col]
+            if block_id >= 0:
+                return self._blocks[block_id]
         return None
     
     def move_block(self, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
@@ -185,83 +314,41 @@ class WordBitesBoard:
         Move a block from one position to another.
         Returns True if successful, False if move is invalid.
         """
-        block = self.get_block_at(from_row, from_col)
-        if not block:
+        if not (0 <= from_row < self.ROWS and 0 <= from_col < self.COLS):
             return False
-            
-        if block.position != (from_row, from_col):
+        block_id = self.cell_ids[from_row * self.COLS + from_col]
+        if block_id < 0:
             return False
-            
-        # Remove from old positions first
-        old_positions = block.get_all_positions()
-        for old_row, old_col in old_positions:
-            self.grid[old_row][old_col] = None
-        self.blocks.remove(block)
         
-        # Remove from letter-to-blocks index
-        for letter in block.letters:
-            if letter in self.letter_to_blocks:
-                if block in self.letter_to_blocks[letter]:
-                    self.letter_to_blocks[letter].remove(block)
-            
-        # Check if new position is valid
-        new_block = block.move_to(to_row, to_col)
-        new_positions = new_block.get_all_positions()
-        
-        # Verify all new positions are within bounds and empty
-        for new_row, new_col in new_positions:
-            if not (0 <= new_row < self.ROWS and 0 <= new_col < self.COLS):
-                # Restore block to original position
-                for pos_row, pos_col in old_positions:
-                    self.grid[pos_row][pos_col] = block
-                self.blocks.append(block)
-                # Restore in letter-to-blocks index
-                for letter in block.letters:
-                    if letter not in self.letter_to_blocks:
-                        self.letter_to_blocks[letter] = []
-                    self.letter_to_blocks[letter].append(block)
-                return False
-            if self.grid[new_row][new_col] is not None:
-                # Restore block to original position
-                for pos_row, pos_col in old_positions:
-                    self.grid[pos_row][pos_col] = block
-                self.blocks.append(block)
-                # Restore in letter-to-blocks index
-                for letter in block.letters:
-                    if letter not in self.letter_to_blocks:
-                        self.letter_to_blocks[letter] = []
-                    self.letter_to_blocks[letter].append(block)
-                return False
+        block = self._blocks[block_id]
+        if block.position != (from_row, from_col):
+            return False
         
-        # Add to new positions
-        for new_row, new_col in new_positions:
-            self.grid[new_row][new_col] = new_block
-        self.blocks.append(new_block)
+        # The new cells must be on the board and free of every other block
+        if not self.is_valid_move(block, to_row, to_col):
+            return False
         
-        # Add to letter-to-blocks index
-        for letter in new_block.letters:
-            if letter not in self.letter_to_blocks:
-                self.letter_to_blocks[letter] = []
-            self.letter_to_blocks[letter].append(new_block)
-            
+        # move_to keeps the id, so the letter and kind indexes need no update
+        self._clear(block)
+        self._place(block_id, block.move_to(to_row, to_col), self.footprint_mask(block.type, to_row, to_col))
         return True
     
     def remove_block(self, row: int, col: int) -> bool:
         """Remove a block from the specified position."""
-        block = self.get_block_at(row, col)
-        if not block:
+        if not (0 <= row < self.ROWS and 0 <= col < self.COLS):
             return False
-            
-        # Remove from all positions
-        for pos_row, pos_col in block.get_all_positions():
-            self.grid[pos_row][pos_col] = None
-            
-        self.blocks.remove(block)
+        block_id = self.cell_ids[row * self.COLS + col]
+        if block_id < 0:
+            return False
+        
+        block = self._blocks.pop(block_id)
+        self._clear(block)
         
-        # Remove from letter-to-blocks index
+        # Remove from the letter and kind indexes
+        self._own_indexes()
         for letter in block.letters:
-            if letter in self.letter_to_blocks and block in self.letter_to_blocks[letter]:
-                self.letter_to_blocks[letter].remove(block)
+            self.letter_to_ids[letter].discard(block_id)
+        self.kind_to_ids[(block.letters, block.type)].discard(block_id)
         
         return True
     
@@ -284,7 +371,7 @@ class WordBitesBoard:
         for row in range(self.ROWS):
             row_str = []
             for col in range(self.COLS):
-                block = self.grid[row][col]
+                block = self.get_block_at(row, col)
                 if block and block.position == (row, col):  # Primary position
                     # Show connection for double blocks
                     if block.type == BlockType.HORIZONTAL:
@@ -316,7 +403,7 @@ class WordBitesBoard:
         for row in range(self.ROWS):
             current_row = []
             for col in range(self.COLS):
-                block = self.grid[row][col]
+                block = self.get_block_at(row, col)
                 if block and block.position == (row, col):  # Primary position
                     current_row.append(block.letters[0])
                 elif block and (
@@ -331,7 +418,14 @@ class WordBitesBoard:
 
     def get_blocks_by_letter(self, letter: str) -> List[Block]:
         """Get all blocks containing the specified letter."""
-        return self.letter_to_blocks.get(letter, [])
+        return [self._blocks[block_id] for block_id in self.letter_to_ids.get(letter, ())]
+    
+    def get_block_ids_by_kind(self, letters: Tuple[str, ...], block_type: BlockType) -> FrozenSet[int]:
+        """
+        Get the ids of all blocks with exactly these letters and type, as a snapshot: the index
+        itself may be shared with copies of the board, so it isn't handed out.
+        """
+        return frozenset(self.kind_to_ids.get((tuple(letters), block_type), ()))
 
 # Example usage:
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from src.config.config import WORD_BITES_CACHE_PATH, WORD_LIST_PATH
+from src.game.word_bites_board import Block
+
+# How many block sets the cache remembers before the least recently used is dropped
+CACHE_SIZE = 64
+
+def get_block_set_signature(blocks: Iterable[Block], min_length: int = 3) -> str:
+    """
+    Canonical key for a block multiset, independent of where the blocks sit,
+    e.g. "horizontal:ST|single:A|single:E|vertical:RE/3".
+    """
+    kinds = sorted(f"{block.type.value}:{''.join(block.letters)}" for block in blocks)
+    return "|".join(kinds) + f"/{min_length}"
+
+def get_word_list_stamp() -> str:
+    """Size and modification time of the word list, so a new list empties the cache"""
+    try:
+        stat = os.stat(WORD_LIST_PATH)
+    except OSError:
+        return ""
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+class WordBitesWordCache:
+    """
+    Persistent LRU cache of the words a Word Bites block set can spell along each axis.
+
+    Which words can be formed only depends on the block multiset, so a board whose blocks
+    have been seen before skips the feasibility search and only the placement phase runs
+    against the live layout. Entries are kept in a JSON file, most recently used last, and
+    lookups that change that order are written out by the next flush() or put().
+    """
+
+    def __init__(self, path: Optional[str] = WORD_BITES_CACHE_PATH, max_entries: int = CACHE_SIZE):
+        """
+        Args:
+            path: File the cache is kept in, or None to keep it in memory only
+            max_entries: Most block sets remembered
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._stamp = get_word_list_stamp()
+        self._entries: "OrderedDict[str, Tuple[List[str], List[str]]]" = OrderedDict()
+        self._dirty = False  # Whether the order in memory differs from the file's
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """Read the cache file, ignoring it if it is missing, unreadable or for another word list."""
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("word_list") != self._stamp:
+            return
+        for signature, (vertical_words, horizontal_words) in data.get("entries", []):
+            self._entries[signature] = (vertical_words, horizontal_words)
+
+    def save(self) -> None:
+        """Write the cache file (through a temporary file, so a crash can't leave half of it)."""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "word_list": self._stamp,
+            "entries": [[signature, list(words)] for signature, words in self._entries.items()],
+        }
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+        self._dirty = False
+
+    def flush(self) -> None:
+        """Save the cache if lookups have changed its recency order since it was last written."""
+        if not self._dirty:
+            return
+        try:
+            self.save()
+        except OSError as e:
+            # A read-only checkout still works, just without the cache
+            print(f"Warning: could not save the Word Bites word cache: {e}")
+
+    def get(self, signature: str) -> Optional[Tuple[List[str], List[str]]]:
+        """Return the (vertical, horizontal) words for a block set signature, or None."""
+        words = self._entries.get(signature)
+        if words is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if next(reversed(self._entries)) != signature:
+            self._entries.move_to_end(signature)
+            self._dirty = True
+        return words
+
+    def put(self, signature: str, vertical_words: List[str], horizontal_words: List[str]) -> None:
+        """Remember the words for a block set, dropping the least recently used sets, and save."""
+        self._entries[signature] = (list(vertical_words), list(horizontal_words))
+        self._entries.move_to_end(signature)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+        self.flush()
@@ -0,0 +1,297 @@
+import heapq
+from itertools import count
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.game.word_bites_board import WordBitesBoard, Block, BlockType
+from src.game.word_finder import (WordBitesMove, get_word_bites_segmenter, find_best_word_bites_placement,
+                                  group_blocks_by_kind)
+
+# A single drag: (block id, target position of the block's primary cell)
+WordBitesDrag = Tuple[int, Tuple[int, int]]
+
+# How many upcoming words a parking spot should try to stay out of the way of
+LOOKAHEAD_WORDS = 3
+
+# Sides of the board blocks can be staged along, and how many of the most valuable words
+# are placed to judge whether staging pays off
+STAGING_SIDES = ("bottom", "right")
+STAGING_SAMPLE_WORDS = 40
+
+def get_footprint_mask(board: WordBitesBoard, block_moves: Iterable[Tuple[Block, Tuple[int, int]]]) -> int:
+    """Return the occupancy bits covered by every block in `block_moves` at its target."""
+    mask = 0
+    for block, (row, col) in block_moves:
+        mask |= board.footprint_mask(block.type, row, col)
+    return mask
+
+def get_reserved_mask(board: WordBitesBoard, upcoming: Iterable[WordBitesMove]) -> int:
+    """Return the cells the upcoming words are planned to use."""
+    mask = 0
+    for move in upcoming:
+        mask |= get_footprint_mask(board, move.block_moves)
+    return mask
+
+def resolve_block_moves(move: WordBitesMove, board: WordBitesBoard) -> Optional[List[Tuple[Block, Tuple[int, int]]]]:
+    """
+    Map a move onto the blocks currently on the board.
+    The word is re-placed at its planned origin against the current layout, so blocks that
+    are already in place are kept. Each planned block is then found by its id, falling back
+    to another unused block with the same letters and type.
+    Returns the (block, target_position) pairs, or None if a block can't be found.
+    """
+    block_moves = move.block_moves
+    if move.origin is not None:
+        segmenter = get_word_bites_segmenter(board.blocks)
+        placed_move = find_best_word_bites_placement(move.word, board, segmenter,
+                                                     (move.is_vertical,), move.origin)
+        if placed_move:
+            block_moves = placed_move.block_moves
+
+    resolved = []
+    used_ids = set()
+    for planned_block, target in block_moves:
+        candidate_ids = board.get_block_ids_by_kind(planned_block.letters, planned_block.type)
+        block_id = planned_block.id
+        if block_id not in candidate_ids or block_id in used_ids:
+            block_id = min((i for i in candidate_ids if i not in used_ids), default=-1)
+        if block_id < 0:
+            return None
+        used_ids.add(block_id)
+        resolved.append((board.get_block(block_id), target))
+    return resolved
+
+def find_parking_spots(board: WordBitesBoard, block: Block, avoid_mask: int, reserved_mask: int,
+                       limit: int) -> List[Tuple[int, Tuple[int, int]]]:
+    """
+    Find free positions to park a block that is in the way.
+    Args:
+        board: The current board state
+        block: The block to park
+        avoid_mask: Cells the block must not be parked on (the word being built)
+        reserved_mask: Cells upcoming words will use, avoided where possible
+        limit: Maximum number of spots to return
+    Returns:
+        Up to `limit` (reserved cells covered, position) pairs, best first. Spots covering
+        fewer reserved cells come first, then spots closer to the block.
+    """
+    row, col = block.position
+    blocked = (board.occupancy & ~board.footprint_mask(block.type, row, col)) | avoid_mask
+    spots = []
+    for mask, (spot_row, spot_col) in board.footprints(block.type):
+        if mask & blocked:
+            continue
+        penalty = bin(mask & reserved_mask).count("1")
+        distance = abs(spot_row - row) + abs(spot_col - col)
+        spots.append((penalty, distance, (spot_row, spot_col)))
+    spots.sort()
+    return [(penalty, position) for penalty, _, position in spots[:limit]]
+
+def plan_word_bites_drags(board: WordBitesBoard, block_moves: List[Tuple[Block, Tuple[int, int]]],
+                          reserved_mask: int = 0, parking_choices: int = 3,
+                          max_states: int = 5000) -> Optional[List[WordBitesDrag]]:
+    """
+    Find the fewest drags that put every block in `block_moves` at its target.
+
+    This is an A* search over board states. Each drag either moves a needed block straight
+    to its target (once the cells are free) or parks a block that covers the word somewhere
+    off it. Every needed block out of place and every other block on the word needs at least
+    one drag, which makes an admissible heuristic. Ties on drag count are broken by how many
+    cells of upcoming words the parked blocks cover.
+    Args:
+        board: The current board state (left untouched)
+        block_moves: (block, target_position) pairs, as from resolve_block_moves
+        reserved_mask: Cells upcoming words will use, from get_reserved_mask
+        parking_choices: How many parking spots to try for each block in the way
+        max_states: Give up after expanding this many board states
+    Returns:
+        The full list of drags in order, or None if no plan was found.
+    """
+    targets = {block.id: target for block, target in block_moves}
+    word_mask = get_footprint_mask(board, block_moves)
+    word_cells = [index for index in range(board.ROWS * board.COLS) if word_mask >> index & 1]
+
+    def remaining(state: WordBitesBoard) -> int:
+        misplaced = sum(1 for block_id, target in targets.items()
+                        if state.get_block(block_id).position != target)
+        in_the_way = {state.cell_ids[index] for index in word_cells} - targets.keys()
+        in_the_way.discard(-1)
+        return misplaced + len(in_the_way)
+
+    tie_breaker = count()
+    start_estimate = remaining(board)
+    # (estimated total drags, parking penalty, drags still needed, tie breaker, drags, state)
+    queue = [(start_estimate, 0, start_estimate, next(tie_breaker), [], board)]
+    seen = {tuple(board.cell_ids)}
+    expanded = 0
+
+    while queue and expanded < max_states:
+        _, penalty, estimate, _, drags, state = heapq.heappop(queue)
+        if estimate == 0:
+            return drags
+        expanded += 1
+
+        successors = []
+        # Move needed blocks straight to their targets
+        for block_id, target in targets.items():
+            block = state.get_block(block_id)
+            if block.position != target and state.is_valid_move(block, *target):
+                successors.append((block, target, 0))
+
+        # Park blocks that cover the word but aren't where the word needs them
+        in_the_way = {state.cell_ids[index] for index in word_cells}
+        in_the_way.discard(-1)
+        for block_id in sorted(in_the_way):
+            block = state.get_block(block_id)
+            if targets.get(block_id) == block.position:
+                continue
+            for spot_penalty, spot in find_parking_spots(state, block, word_mask, reserved_mask, parking_choices):
+                successors.append((block, spot, spot_penalty))
+
+        for block, position, spot_penalty in successors:
+            next_state = state.copy()
+            next_state.move_block(*block.position, *position)
+            key = tuple(next_state.cell_ids)
+            if key in seen:
+                continue
+            seen.add(key)
+            next_estimate = remaining(next_state)
+            heapq.heappush(queue, (len(drags) + 1 + next_estimate, penalty + spot_penalty, next_estimate,
+                                   next(tie_breaker), drags + [(block.id, position)], next_state))
+    return None
+
+def plan_word_bites_move(move: WordBitesMove, board: WordBitesBoard,
+                         upcoming: Iterable[WordBitesMove] = ()) -> Optional[List[WordBitesDrag]]:
+    """
+    Plan every drag needed to form `move` on the current board, before any input is sent.
+    Args:
+        move: The move to plan
+        board: The current board state (left untouched)
+        upcoming: Moves planned after this one; parked blocks avoid the cells they use
+    Returns:
+        The list of (block id, target position) drags, or None if the word can't be formed.
+    """
+    block_moves = resolve_block_moves(move, board)
+    if block_moves is None:
+        return None
+    return plan_word_bites_drags(board, block_moves, get_reserved_mask(board, upcoming))
+
+def get_staging_mask(board: WordBitesBoard, side: str, depth: int) -> int:
+    """Return the cells of the `depth` rows along the bottom, or columns along the right, of the board."""
+    mask = 0
+    for row in range(board.ROWS):
+        for col in range(board.COLS):
+            if (side == "bottom" and row >= board.ROWS - depth) or (side == "right" and col >= board.COLS - depth):
+                mask |= 1 << (row * board.COLS + col)
+    return mask
+
+def pack_word_bites_blocks(board: WordBitesBoard, area_mask: int, keep_in_place: bool = True) -> Optional[Dict[int, Tuple[int, int]]]:
+    """
+    Give every block a position inside `area_mask`, without overlaps.
+    Blocks already inside the area stay where they are (if `keep_in_place`), the rest are
+    packed in first-fit order, pairs before singles, starting from the far corner.
+    Returns block id -> target position, or None if the blocks don't fit.
+    """
+    taken = 0
+    targets: Dict[int, Tuple[int, int]] = {}
+    if keep_in_place:
+        for block in board.blocks:
+            mask = board.footprint_mask(block.type, *block.position)
+            if not mask & ~area_mask and not mask & taken:
+                targets[block.id] = block.position
+                taken |= mask
+
+    for block in sorted(board.blocks, key=lambda block: (block.type is BlockType.SINGLE, block.id)):
+        if block.id in targets:
+            continue
+        for mask, position in reversed(board.footprints(block.type)):
+            if not mask & ~area_mask and not mask & taken:
+                targets[block.id] = position
+                taken |= mask
+                break
+        else:
+            return None
+    return targets
+
+def plan_word_bites_staging(board: WordBitesBoard, side: str = "bottom") -> Optional[List[WordBitesDrag]]:
+    """
+    Plan the drags that pack every block into a staging area along one side of the board,
+    leaving the rest of the board clear for building words.
+    The staging area is the fewest rows (or columns) the blocks fit in. Blocks are dragged
+    straight to their spot once it is free; when the remaining blocks block each other, one
+    is parked in the clear area first.
+    Args:
+        board: The current board state (left untouched)
+        side: "bottom" to stage in the bottom rows, "right" for the right-hand columns
+    Returns:
+        The drags in order, or None if the blocks can't be packed.
+    """
+    depth_limit = board.ROWS if side == "bottom" else board.COLS
+    for depth in range(1, depth_limit + 1):
+        area_mask = get_staging_mask(board, side, depth)
+        targets = pack_word_bites_blocks(board, area_mask) or pack_word_bites_blocks(board, area_mask, False)
+        if targets is not None:
+            break
+    else:
+        return None
+
+    state = board.copy()
+    drags: List[WordBitesDrag] = []
+    pending = {block_id: target for block_id, target in targets.items()
+               if state.get_block(block_id).position != target}
+    while pending:
+        moved = False
+        for block_id, target in list(pending.items()):
+            block = state.get_block(block_id)
+            if state.is_valid_move(block, *target):
+                state.move_block(*block.position, *target)
+                drags.append((block_id, target))
+                del pending[block_id]
+                moved = True
+        if moved:
+            continue
+
+        # Every remaining spot is covered by another pending block: park one of those outside the area
+        pending_mask = 0
+        for block_id, target in pending.items():
+            pending_mask |= state.footprint_mask(state.get_block(block_id).type, *target)
+        block = next(state.get_block(block_id) for block_id in sorted(pending)
+                     if state.footprint_mask(state.get_block(block_id).type, *state.get_block(block_id).position) & pending_mask)
+        spots = find_parking_spots(state, block, area_mask, 0, 1)
+        if not spots or len(drags) > 3 * len(targets):
+            return None
+        _, spot = spots[0]
+        state.move_block(*block.position, *spot)
+        drags.append((block.id, spot))
+    return drags
+
+def choose_word_bites_staging(board: WordBitesBoard, moves: List[WordBitesMove],
+                              sample: int = STAGING_SAMPLE_WORDS) -> List[WordBitesDrag]:
+    """
+    Decide whether staging the blocks before the word phase pays for itself.
+    Each staging side is scored by its own drags plus the placement drags of the `sample`
+    most valuable words from the staged layout, against those words from the layout as it is.
+    Returns the drags of the cheapest option, which is empty if the board is best left alone.
+    """
+    top = sorted(moves, key=lambda move: -move.score)[:sample]
+    segmenter = get_word_bites_segmenter(board.blocks)
+
+    def placement_drags(layout: WordBitesBoard) -> int:
+        kind_to_blocks = group_blocks_by_kind(layout)
+        total = 0
+        for move in top:
+            placed = find_best_word_bites_placement(move.word, layout, segmenter, kind_to_blocks=kind_to_blocks)
+            total += placed.drags if placed is not None else len(move.word)
+        return total
+
+    best_cost, best_drags = placement_drags(board), []
+    for side in STAGING_SIDES:
+        drags = plan_word_bites_staging(board, side)
+        if not drags:
+            continue
+        staged = board.copy()
+        for block_id, target in drags:
+            staged.move_block(*staged.get_block(block_id).position, *target)
+        cost = len(drags) + placement_drags(staged)
+        if cost < best_cost:
+            best_cost, best_drags = cost, drags
+    return best_drags
@@ -0,0 +1,476 @@
+import heapq
+import multiprocessing
+import queue
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable, Iterator, List, Optional, Sequence, Set
+
+from src.game.word_bites_board import WordBitesBoard, Block
+from src.game.word_finder import (WordBitesMove, WordBitesSearch, are_words_related, load_word_lists,
+                                  is_loaded_word_list)
+from src.game.word_bites_planner import (WordBitesDrag, plan_word_bites_move, choose_word_bites_staging,
+                                         LOOKAHEAD_WORDS)
+from src.game.word_bites_sequencer import WordBitesPlanStep, plan_word_bites_sequence
+
+# Drags one block so its primary cell lands on (row, col) and updates the board; returns success.
+# word_drawer.move_word_bites_block posts the real mouse events, the simulator just moves the block.
+DragFunction = Callable[[Block, int, int, WordBitesBoard], bool]
+
+# Plays one move given the board and the next few moves; returns success
+PlayFunction = Callable[[WordBitesMove, WordBitesBoard, Sequence[WordBitesMove]], bool]
+
+# Plays one step of a sequenced plan on the board; returns success
+StepFunction = Callable[[WordBitesPlanStep, WordBitesBoard], bool]
+
+# Checks the board model against the screen and corrects it; returns whether they disagreed.
+# main.py recaptures the board with capture_word_bites_cells, the simulator reads its own board.
+ResyncFunction = Callable[[WordBitesBoard], bool]
+
+# How many steps the planning process may get ahead of the player
+PLAN_AHEAD_STEPS = 2
+
+# How many steps are played between checks of the board model against the screen
+RESYNC_STEPS = 2
+
+@dataclass(order=True)
+class PrioritizedWordBitesMove:
+    priority: int
+    move: WordBitesMove = field(compare=False)
+
+    def __init__(self, move: WordBitesMove):
+        # Negative score for max-heap behavior (highest score first)
+        self.priority = -move.score
+
+        # Prioritize vertical words of the same length/score
+        # This ensures vertical words with the same score as horizontal words
+        # will be processed first, without changing their actual score
+        if move.is_vertical:
+            # Use a small priority boost that doesn't affect the actual score
+            self.priority -= 0.1  # Subtract a small value to increase precedence
+
+        self.move = move
+
+class _Replan(Exception):
+    """Raised inside the planning process when the player asks for a new plan mid-step"""
+
+class _MoveFeed:
+    """
+    Stand-in for a WordBitesSearch inside the planning process: moves arrive as commands
+    from the player, which forwards what its own search delivers.
+    """
+
+    def __init__(self, commands):
+        self._commands = commands
+        self.moves: List[WordBitesMove] = []
+        self.done = False
+        self.pending = None  # A plan or stop command that arrived while waiting for moves
+
+    def handle(self, command) -> List[WordBitesMove]:
+        """Apply a moves command and return its moves, or stash any other command and raise _Replan."""
+        if command[0] != "moves":
+            self.pending = command
+            raise _Replan()
+        _, new_moves, done = command
+        self.moves.extend(new_moves)
+        self.done = self.done or done
+        return new_moves
+
+    def poll(self, wait: bool = False) -> List[WordBitesMove]:
+        """Return the moves forwarded since the last call, waiting for some if `wait` and the search isn't done."""
+        new_moves: List[WordBitesMove] = []
+        while True:
+            try:
+                command = self._commands.get(block=wait and not new_moves and not self.done)
+            except queue.Empty:
+                return new_moves
+            new_moves.extend(self.handle(command))
+
+def _run_word_bites_planner(commands, results, valid_words: Optional[Set[str]], crossings: bool) -> None:
+    """
+    Process target for WordBitesPlanPipeline.
+    Commands: ("moves", moves, search done), ("plan", generation, board, found, failed) and
+    ("stop",). Each planned step is put as (generation, step), then (generation, None) once
+    the plan runs out. A new plan command abandons the current plan.
+    """
+    if valid_words is None:
+        valid_words = load_word_lists()
+    feed = _MoveFeed(commands)
+    steps = None
+    generation = 0
+
+    while True:
+        try:
+            command = feed.pending
+            feed.pending = None
+            if command is None:
+                try:
+                    command = commands.get(block=steps is None)
+                except queue.Empty:
+                    command = None
+            if command is not None:
+                if command[0] == "stop":
+                    return
+                if command[0] == "plan":
+                    _, generation, board, found, failed = command
+                    moves = [move for move in feed.moves if move.word not in found and move.word not in failed]
+                    steps = plan_word_bites_sequence(board, moves, valid_words, set(found), crossings=crossings,
+                                                     search=None if feed.done else feed)
+                else:
+                    feed.handle(command)
+                continue
+            
+            step = next(steps, None)
+        except _Replan:
+            steps = None
+            continue
+        results.put((generation, step))
+        if step is None:
+            steps = None
+
+class WordBitesPlanPipeline:
+    """
+    Plans Word Bites steps in a separate process, up to `depth` steps ahead of the player.
+
+    Steps are planned against the board the plan predicts, so while one step's drags are
+    being posted the next ones are already being planned, and the player only waits on
+    planning when it catches up. A process rather than a thread: the planner is pure Python
+    and would hold the GIL, delaying each millisecond sleep between mouse events.
+    """
+
+    def __init__(self, moves: List[WordBitesMove], valid_words: Optional[Set[str]] = None, crossings: bool = True,
+                 search: Optional[WordBitesSearch] = None, depth: int = PLAN_AHEAD_STEPS):
+        """
+        Args:
+            moves: Candidate moves, e.g. from find_word_bites_words
+            valid_words: Dictionary of valid words (the game's word list by default)
+            crossings: Also plan pairs of words laid across each other
+            search: A WordBitesSearch still finding moves; they are forwarded as they arrive
+            depth: How many steps the planner may get ahead of the player
+        """
+        context = multiprocessing.get_context("spawn")
+        self._commands = context.Queue()
+        self._results = context.Queue(maxsize=depth)
+        # The planning process reads the word list itself rather than have it pickled over
+        if is_loaded_word_list(valid_words):
+            valid_words = None
+        self._process = context.Process(target=_run_word_bites_planner,
+                                        args=(self._commands, self._results, valid_words, crossings), daemon=True)
+        self._process.start()
+        self._search = search
+        self._search_done = search is None or search.done
+        self._generation = 0
+        self._commands.put(("moves", list(moves), self._search_done))
+
+    def _forward_search(self) -> None:
+        """Pass on the moves the search has found since the last call."""
+        if self._search_done:
+            return
+        new_moves = self._search.poll()
+        self._search_done = self._search.done
+        if new_moves or self._search_done:
+            self._commands.put(("moves", new_moves, self._search_done))
+
+    def plan(self, board: WordBitesBoard, found: Set[str], failed: Set[str]) -> Iterator[WordBitesPlanStep]:
+        """
+        Start a new plan from `board` (dropping any steps planned ahead for an older one) and
+        yield its steps as they arrive.
+        Args:
+            board: The current board state
+            found: Words already scored
+            failed: Words that failed to play and shouldn't be planned again
+        """
+        self._generation += 1
+        self._commands.put(("plan", self._generation, board.copy(), set(found), set(failed)))
+        while True:
+            self._forward_search()
+            try:
+                generation, step = self._results.get(timeout=0.05)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    raise RuntimeError("Word Bites planning process stopped unexpectedly")
+                continue
+            if generation != self._generation:
+                continue
+            if step is None:
+                return
+            yield step
+
+    def close(self) -> None:
+        """Stop the planning process."""
+        self._commands.put(("stop",))
+        self._process.join(timeout=1)
+        if self._process.is_alive():
+            self._process.terminate()
+
+    def terminate(self) -> None:
+        """Kill the planning process without waiting on it, e.g. from a signal handler."""
+        if self._process.is_alive():
+            self._process.terminate()
+
+def play_word_bites_move(move: WordBitesMove, board: WordBitesBoard, drag: DragFunction,
+                         upcoming: Sequence[WordBitesMove] = ()) -> bool:
+    """
+    Plan every drag for a move, then hand them to `drag` in order.
+    Args:
+        move: The move to play
+        board: The current board state
+        drag: Performs one drag, see DragFunction
+        upcoming: The next few moves; blocks in the way are parked clear of the cells they use
+    Returns:
+        True if the word was planned and every drag succeeded.
+    """
+    drags = plan_word_bites_move(move, board, upcoming)
+    if drags is None:
+        return False
+
+    for block_id, (target_row, target_col) in drags:
+        if not drag(board.get_block(block_id), target_row, target_col, board):
+            return False
+    return True
+
+def play_word_bites_drags(drags: List[WordBitesDrag], board: WordBitesBoard, drag: DragFunction) -> bool:
+    """Hand planned drags to `drag` in order; returns True if they all succeed."""
+    for block_id, (target_row, target_col) in drags:
+        block = board.get_block(block_id)
+        if block is None or not drag(block, target_row, target_col, board):
+            return False
+    return True
+
+def play_word_bites_step(step: WordBitesPlanStep, board: WordBitesBoard, drag: DragFunction) -> bool:
+    """Hand the drags of one planned step to `drag` in order; returns True if they all succeed."""
+    return play_word_bites_drags(step.drags, board, drag)
+
+def execute_word_bites_plan(board: WordBitesBoard, moves: List[WordBitesMove], play_step: StepFunction,
+                            pause: Callable[[float], None] = time.sleep,
+                            valid_words: Optional[Set[str]] = None, verbose: bool = True,
+                            game_over: Callable[[], bool] = lambda: False, crossings: bool = True,
+                            search: Optional[WordBitesSearch] = None, staging: bool = False,
+                            pipelined: bool = True, resync: Optional[ResyncFunction] = None,
+                            on_pipeline: Optional[Callable[[Optional[WordBitesPlanPipeline]], None]] = None) -> None:
+    """
+    Play the moves in the order plan_word_bites_sequence finds. The plan runs in a
+    WordBitesPlanPipeline process, so the next steps are planned against the board the plan
+    predicts while the current one is played. If a step fails part-way, the rest of the
+    game is re-planned from the layout the board is left in.
+    Args:
+        board: The current board state
+        moves: Candidate moves, e.g. from find_word_bites_words
+        play_step: Plays one planned step, see StepFunction
+        pause: Waits between words (time.sleep, or the simulator's clock)
+        valid_words: Dictionary of valid words (the game's word list by default)
+        verbose: Whether to print progress and final stats
+        game_over: Returns True once the game has ended and no more steps should be played
+        crossings: Also plan pairs of words laid across each other, see plan_word_bites_sequence
+        search: A WordBitesSearch still finding moves; they are played as they arrive
+        staging: First pack the blocks along one side if choose_word_bites_staging expects
+            it to pay for itself (played as a step with an empty word)
+        pipelined: Plan in a WordBitesPlanPipeline process; otherwise each step is planned
+            in between playing steps
+        resync: Checks the board against the screen every RESYNC_STEPS steps, after a failed
+            step and at the end, so a drag the game dropped is re-planned around instead of
+            making every later step fail
+        on_pipeline: Called with the planning pipeline once it is started, and with None once
+            it is closed, so a signal handler can stop it before exiting
+    """
+    found: Set[str] = set()  # Words scored by steps that were played
+    failed: Set[str] = set()
+    steps_played = 0
+    total_score = 0
+    drags = 0
+    resyncs = 0
+    unchecked_steps = 0  # Steps played since the board was last checked against the screen
+
+    def check_board() -> bool:
+        """Resync the board, counting the times it had drifted from the screen."""
+        nonlocal resyncs, unchecked_steps
+        unchecked_steps = 0
+        if not resync(board):
+            return False
+        resyncs += 1
+        return True
+
+    if staging:
+        if search is not None and not moves:
+            moves = search.poll(wait=True)
+        staging_drags = choose_word_bites_staging(board, moves)
+        if staging_drags:
+            if verbose:
+                print(f"Staging blocks ({len(staging_drags)} drags)")
+            play_step(WordBitesPlanStep("", staging_drags, [], 0), board)
+            drags += len(staging_drags)
+
+    pipeline = WordBitesPlanPipeline(moves, valid_words, crossings, search) if pipelined else None
+    if on_pipeline is not None and pipeline is not None:
+        on_pipeline(pipeline)
+    try:
+        while True:
+            if pipeline is not None:
+                steps = pipeline.plan(board, found, failed)
+            else:
+                # The planner marks words found as it plans ahead, so it gets its own copy
+                steps = plan_word_bites_sequence(board.copy(), moves, valid_words, set(found),
+                                                 crossings=crossings, search=search)
+            for step in steps:
+                if game_over():
+                    break
+                if not play_step(step, board):
+                    # Steps planned after this one assumed it worked; re-plan from here,
+                    # without the word that failed so a stuck drag can't loop forever
+                    failed.add(step.word)
+                    if resync is not None:
+                        check_board()
+                    break
+
+                found.update(step.words_formed)
+                steps_played += 1
+                unchecked_steps += 1
+                total_score += step.points
+                drags += len(step.drags)
+                if verbose and (steps_played % 10 == 0 or steps_played == 1):
+                    words = f"{step.word} x {step.crossing}" if step.crossing else step.word
+                    print(f"Playing word {steps_played}: {words} ({len(step.drags)} drags, +{step.points} pts)")
+                pause(0.01)  # Further reduced delay between words
+                if resync is not None and unchecked_steps >= RESYNC_STEPS and check_board():
+                    # The rest of the plan assumed the old layout; plan again from the screen's
+                    break
+            else:
+                # Out of steps; unless the last few drifted, there is nothing left to play
+                if resync is None or not unchecked_steps or not check_board():
+                    break
+            if game_over():
+                break
+            if search is not None:
+                # Moves the search has delivered so far were handed over to the last plan
+                moves = list({move.word: move for move in moves + search.moves}.values())
+            moves = [move for move in moves if move.word not in found and move.word not in failed]
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+            if on_pipeline is not None:
+                on_pipeline(None)
+
+    if verbose:
+        print(f"\nWord Bites stats:")
+        print(f"Words played: {steps_played}")
+        print(f"Words scored: {len(found)}")
+        print(f"Drags: {drags}")
+        if resync is not None:
+            print(f"Board resyncs: {resyncs}")
+        print(f"Total score: {total_score}")
+
+def execute_word_bites_moves_from_heap(move_heap: List[PrioritizedWordBitesMove], heap_lock: Lock, board: WordBitesBoard,
+                                       play_move: PlayFunction, pause: Callable[[float], None] = time.sleep,
+                                       verbose: bool = True) -> None:
+    """
+    Execute Word Bites moves as they become available in the heap, highest score first.
+    Args:
+        move_heap: Heap of moves, ended by a move with an empty word
+        heap_lock: Lock guarding the heap
+        board: The current board state
+        play_move: Plays a single move, see PlayFunction
+        pause: Waits between words (time.sleep, or the simulator's clock)
+        verbose: Whether to print progress and final stats
+    """
+    # Keep track of the last successfully formed word and its block positions
+    last_word = None
+    last_word_blocks = {}  # Maps position -> block
+
+    # Stats tracking
+    vertical_words_count = 0
+    horizontal_words_count = 0
+    total_score = 0
+
+    # Process counter for progress reporting
+    processed_count = 0
+    total_moves = len(move_heap) - 1  # Subtract 1 for sentinel
+
+    while True:
+        with heap_lock:
+            if not move_heap:
+                time.sleep(0.05)  # Reduced sleep time
+                continue
+
+            prioritized_move = heapq.heappop(move_heap)
+
+        # Check for sentinel value
+        if not prioritized_move.move.word:
+            # Print final stats before exiting
+            if verbose:
+                print(f"\nWord Bites stats:")
+                print(f"Vertical words: {vertical_words_count}")
+                print(f"Horizontal words: {horizontal_words_count}")
+                print(f"Total score: {total_score}")
+            break
+
+        move = prioritized_move.move
+        processed_count += 1
+
+        # Peek at the next few moves so blocks in the way are parked clear of them
+        with heap_lock:
+            upcoming = [queued.move for queued in heapq.nsmallest(LOOKAHEAD_WORDS, move_heap) if queued.move.word]
+
+        # Only log every 5th word to reduce console output overhead
+        if verbose and (processed_count % 10 == 0 or processed_count == 1):
+            orientation = "VERTICAL" if move.is_vertical else "HORIZONTAL"
+            print(f"Playing word {processed_count}/{total_moves}: {move.word} ({move.score} pts) [{orientation}]")
+
+        # Check if we can build upon the previous word
+        if last_word and are_words_related(last_word, move.word):
+            # Try to identify which blocks need to be added to form the new word
+            if move.word.startswith(last_word):
+                # The new word is an extension of the last word (e.g., "PLAY" -> "PLAYER")
+
+                # Create a modified move that only includes the new blocks needed
+                modified_block_moves = []
+                for block, target_pos in move.block_moves:
+                    # Skip blocks that are already in position from the previous word
+                    if target_pos not in last_word_blocks:
+                        modified_block_moves.append((block, target_pos))
+
+                if modified_block_moves:
+                    # Create a new move with just the blocks we need to add
+                    modified_move = WordBitesMove(move.word, modified_block_moves, move.score, move.is_vertical, move.origin)
+                    success = play_move(modified_move, board, upcoming)
+                else:
+                    # If no new blocks needed (shouldn't happen), use the original move
+                    success = play_move(move, board, upcoming)
+
+            elif last_word.startswith(move.word):
+                # The new word is a prefix of the last word (e.g., "PLAYER" -> "PLAY")
+                # This is less common but possible
+                success = True  # No need to do anything, the word is already formed
+
+            else:
+                # The words are related but one is not a prefix of the other
+                # (e.g., "PLAY" -> "PLAYING" where we need to remove 'Y' and add 'YING')
+                success = play_move(move, board, upcoming)
+        else:
+            # No previous word or words are not related, execute normally
+            success = play_move(move, board, upcoming)
+
+        if success:
+            # Update the last word and its block positions
+            last_word = move.word
+            last_word_blocks = {}
+            for block, pos in move.block_moves:
+                # Find the actual block at this position
+                actual_block = board.get_block_at(pos[0], pos[1])
+                if actual_block:
+                    last_word_blocks[pos] = actual_block
+
+            # Use a shorter delay between words
+            pause(0.01)  # Further reduced delay between words
+
+            # Update stats
+            if move.is_vertical:
+                vertical_words_count += 1
+            else:
+                horizontal_words_count += 1
+            total_score += move.score
+        else:
+            # If we fail to form a word, wait a bit before trying the next one
+            pause(0.01)  # Further reduced delay after failure
+            # Reset last word tracking since we failed
+            last_word = None
+            last_word_blocks = {}
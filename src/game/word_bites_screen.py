@@ -0,0 +1,186 @@
+from itertools import combinations
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.game.word_bites_board import WordBitesBoard, Block, BlockType
+from src.game.word_bites_player import DragFunction
+
+# HSV range of the blue board background behind the tiles
+BLUE_LOWER = np.array([100, 50, 50])
+BLUE_UPPER = np.array([130, 255, 255])
+
+# A cell more than this fraction blue is empty
+BLUE_FRACTION = 0.5
+
+# Margins trimmed off each cell before looking at it: a fraction of the board width
+# horizontally, a few pixels vertically
+CELL_MARGIN_FRACTION = 0.02
+CELL_MARGIN_PIXELS = 4
+
+# Most drags a resync assumes the game dropped since the last check when explaining the screen
+MAX_DROPPED_DRAGS = 2
+
+# A drag as the pointer made it: the cell it picked up and the cell it let go on
+PointerMove = Tuple[Tuple[int, int], Tuple[int, int]]
+
+def get_cell_boxes(height: int, width: int, rows: int = WordBitesBoard.ROWS,
+                   cols: int = WordBitesBoard.COLS) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return the (y1, y2, x1, x2) pixel bounds of every cell of a board image, margins
+    trimmed, each as a (rows, cols) array.
+    """
+    h_margin = int(width * CELL_MARGIN_FRACTION)
+    y1 = (np.arange(rows) * height / rows).astype(int) + CELL_MARGIN_PIXELS
+    y2 = (np.arange(1, rows + 1) * height / rows).astype(int) - CELL_MARGIN_PIXELS
+    x1 = (np.arange(cols) * width / cols).astype(int) + h_margin
+    x2 = (np.arange(1, cols + 1) * width / cols).astype(int) - h_margin
+    shape = (rows, cols)
+    return (np.broadcast_to(y1[:, None], shape), np.broadcast_to(y2[:, None], shape),
+            np.broadcast_to(x1[None, :], shape), np.broadcast_to(x2[None, :], shape))
+
+def get_blue_fractions(board_image: np.ndarray, rows: int = WordBitesBoard.ROWS,
+                       cols: int = WordBitesBoard.COLS) -> np.ndarray:
+    """
+    Fraction of blue pixels in every cell of a BGR board image, as a (rows, cols) array.
+    The blue mask is made once for the whole image and summed per cell from its integral
+    image, rather than converting and masking each cell on its own.
+    """
+    hsv = cv2.cvtColor(board_image, cv2.COLOR_BGR2HSV)
+    blue = cv2.inRange(hsv, BLUE_LOWER, BLUE_UPPER) // 255
+    sums = cv2.integral(blue)
+    height, width = board_image.shape[:2]
+    y1, y2, x1, x2 = get_cell_boxes(height, width, rows, cols)
+    counts = sums[y2, x2] - sums[y1, x2] - sums[y2, x1] + sums[y1, x1]
+    return counts / np.maximum((y2 - y1) * (x2 - x1), 1)
+
+def get_occupied_cells(board_image: np.ndarray, rows: int = WordBitesBoard.ROWS,
+                       cols: int = WordBitesBoard.COLS) -> np.ndarray:
+    """Return a (rows, cols) bool array of the cells of a board image covered by a tile."""
+    return get_blue_fractions(board_image, rows, cols) <= BLUE_FRACTION
+
+def get_occupancy_mask(occupied: np.ndarray) -> int:
+    """Turn a (rows, cols) bool array into a WordBitesBoard occupancy bitboard."""
+    mask = 0
+    for index in np.flatnonzero(occupied):
+        mask |= 1 << int(index)
+    return mask
+
+def drag_screen_tile(screen: WordBitesBoard, source: Tuple[int, int], target: Tuple[int, int]) -> Optional[Block]:
+    """
+    Drag on `screen` the way the game does: whatever tile is under the pointer at `source`
+    moves by as much as the pointer, if it fits there. Returns the tile as it was before the
+    drag, or None if nothing moved.
+    """
+    tile = screen.get_block_at(*source)
+    if tile is None:
+        return None
+    row, col = tile.position[0] + target[0] - source[0], tile.position[1] + target[1] - source[1]
+    return tile if screen.move_block(*tile.position, row, col) else None
+
+def explain_dropped_drags(synced: WordBitesBoard, pointer_moves: Sequence[PointerMove], screen: int,
+                          max_dropped: int = MAX_DROPPED_DRAGS) -> Optional[WordBitesBoard]:
+    """
+    Find the fewest drags the game could have dropped since `synced` for the board to cover
+    exactly the cells in the `screen` bitboard, replaying the rest as the game would.
+    Returns the board that explanation leaves, or None if none within `max_dropped` does.
+    """
+    for dropped_count in range(1, max_dropped + 1):
+        for dropped in combinations(range(len(pointer_moves)), dropped_count):
+            board = synced.copy()
+            for index, (source, target) in enumerate(pointer_moves):
+                if index not in dropped:
+                    drag_screen_tile(board, source, target)
+            if board.occupancy == screen:
+                return board
+    return None
+
+def place_lost_blocks(board: WordBitesBoard, screen: int) -> bool:
+    """
+    Move blocks whose cells the screen shows empty, keeping their ids, to the nearest spot of
+    their shape among the covered cells no other block explains; blocks that fit nowhere are
+    taken off the model. Returns whether any block was missing.
+    """
+    missing = board.occupancy & ~screen
+    lost = [block for block in board.blocks
+            if board.footprint_mask(block.type, *block.position) & missing]
+    for block in lost:
+        board.remove_block(*block.position)
+
+    # Two-cell blocks first, since a single can fill half of their spot
+    free = screen & ~board.occupancy
+    lost.sort(key=lambda block: block.type is BlockType.SINGLE)
+    for block in lost:
+        row, col = block.position
+        spots = [(abs(spot_row - row) + abs(spot_col - col), mask, (spot_row, spot_col))
+                 for mask, (spot_row, spot_col) in board.footprints(block.type) if mask & free == mask]
+        if not spots:
+            continue
+        _, mask, position = min(spots)
+        board.add_block(block.move_to(*position), combine=False)
+        free &= ~mask
+    return bool(lost)
+
+def resync_word_bites_board(board: WordBitesBoard, occupied: np.ndarray, synced: Optional[WordBitesBoard] = None,
+                            pointer_moves: Sequence[PointerMove] = ()) -> bool:
+    """
+    Correct the board model from the cells the screen shows covered.
+    Given the board as it was at the last check and the drags posted since, the model is
+    rebuilt from the fewest dropped drags that explain the screen (see explain_dropped_drags),
+    which also catches later drags that picked up the wrong tile. Otherwise, or if nothing
+    explains it, blocks the screen shows missing are moved to the nearest covered cells
+    (see place_lost_blocks). Occupancy can't tell tiles apart, so letters are never re-read.
+    Args:
+        board: The board model, corrected in place (block ids are kept)
+        occupied: (ROWS, COLS) bool array, e.g. from get_occupied_cells
+        synced: The board as it was when it last matched the screen
+        pointer_moves: Drags posted since then, see WordBitesDragLog
+    Returns:
+        True if the model was changed to agree with the screen.
+    """
+    screen = get_occupancy_mask(occupied)
+    if board.occupancy == screen:
+        return False
+
+    explained = explain_dropped_drags(synced, pointer_moves, screen) if synced is not None else None
+    if explained is None:
+        return place_lost_blocks(board, screen)
+
+    moved = [block for block in explained.blocks if board.get_block(block.id).position != block.position]
+    for block in moved:
+        board.remove_block(*board.get_block(block.id).position)
+    for block in moved:
+        board.add_block(block, combine=False)
+    return True
+
+class WordBitesDragLog:
+    """
+    Wraps a DragFunction, remembering the drags posted since the board was last checked
+    against the screen, so resync can work out which of them the game dropped.
+    """
+
+    def __init__(self, drag: DragFunction, board: WordBitesBoard):
+        """
+        Args:
+            drag: Posts the drags, e.g. word_drawer.move_word_bites_block
+            board: The board as it is now, taken to match the screen
+        """
+        self.drag = drag
+        self.synced = board.copy()
+        self.pointer_moves: List[PointerMove] = []
+
+    def __call__(self, block: Block, target_row: int, target_col: int, board: WordBitesBoard) -> bool:
+        current = board.get_block(block.id)
+        if current is None or not self.drag(block, target_row, target_col, board):
+            return False
+        # The drag may have nudged the target to keep a two-cell block on the board
+        self.pointer_moves.append((current.position, board.get_block(block.id).position))
+        return True
+
+    def resync(self, board: WordBitesBoard, occupied: np.ndarray) -> bool:
+        """Correct the board from the screen (see resync_word_bites_board) and start a new log."""
+        changed = resync_word_bites_board(board, occupied, self.synced, self.pointer_moves)
+        self.synced = board.copy()
+        self.pointer_moves = []
+        return changed
@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from src.game.word_bites_board import WordBitesBoard
+from src.game.word_finder import (WordBitesMove, WordBitesSearch, load_word_lists, get_word_bites_segmenter,
+                                  get_word_bites_score, find_best_word_bites_placement, find_word_bites_crossings,
+                                  group_blocks_by_kind)
+from src.game.word_bites_planner import WordBitesDrag, plan_word_bites_drags, get_reserved_mask, LOOKAHEAD_WORDS
+
+# How many of the most valuable remaining words are weighed at each step
+CANDIDATE_WORDS = 8
+
+# How many of the cheapest candidates are tried with a second word laid across them
+CROSSING_WORDS = 4
+
+# How many of the best-looking options are planned in full before one is picked
+PLANNED_OPTIONS = 3
+
+def get_word_score(word: str) -> int:
+    """Points Word Bites awards for a word, matching WordBitesMove's scoring."""
+    return get_word_bites_score(len(word))
+
+def find_formed_words(board: WordBitesBoard, valid_words: Set[str], min_length: int = 3,
+                      rows: Optional[Iterable[int]] = None, cols: Optional[Iterable[int]] = None) -> Set[str]:
+    """
+    Find every valid word currently spelled on the board.
+    A word is a maximal run of touching letters, read left to right along a row or top to
+    bottom down a column.
+    Args:
+        board: The board to read
+        valid_words: Dictionary of valid words
+        min_length: Shortest word the game accepts
+        rows, cols: Only read these rows and columns (all of them by default)
+    """
+    grid = list(board)
+    lines = [grid[row] for row in (range(board.ROWS) if rows is None else rows)]
+    lines += [[grid[row][col] for row in range(board.ROWS)] for col in (range(board.COLS) if cols is None else cols)]
+    words = set()
+    for line in lines:
+        for run in "".join(line).split():
+            if len(run) >= min_length and run in valid_words:
+                words.add(run)
+    return words
+
+def apply_drags(board: WordBitesBoard, drags: List[WordBitesDrag], valid_words: Set[str],
+                min_length: int = 3) -> Optional[Set[str]]:
+    """
+    Apply drags to the board and return every word spelled along the way.
+    Only the rows and columns each drag touches are read, like the game does.
+    Returns None (leaving the board part-way) if a drag isn't legal.
+    """
+    formed = set()
+    for block_id, (target_row, target_col) in drags:
+        block = board.get_block(block_id)
+        if block is None or not board.move_block(*block.position, target_row, target_col):
+            return None
+        cells = block.get_all_positions() | board.get_block(block_id).get_all_positions()
+        formed |= find_formed_words(board, valid_words, min_length,
+                                    {row for row, _ in cells}, {col for _, col in cells})
+    return formed
+
+@dataclass
+class WordBitesPlanStep:
+    """One word of a game plan: the drags that play it and the new words they score (no word for a staging step)"""
+    word: str
+    drags: List[WordBitesDrag]
+    words_formed: List[str]
+    points: int
+    crossing: Optional[str] = None  # Word laid across `word` by the same drags, if any
+
+def build_extension_index(words: Iterable[str], min_length: int = 3) -> Dict[str, List[str]]:
+    """Map each word to the other words that start or end with it (e.g. PLAY -> PLAYER, REPLAY)."""
+    word_set = set(words)
+    index: Dict[str, List[str]] = {}
+    for word in word_set:
+        for length in range(min_length, len(word)):
+            for part in {word[:length], word[-length:]}:
+                if part in word_set:
+                    index.setdefault(part, []).append(word)
+    return index
+
+def plan_word_bites_sequence(board: WordBitesBoard, moves: List[WordBitesMove], valid_words: Optional[Set[str]] = None,
+                             found: Optional[Set[str]] = None, candidates: int = CANDIDATE_WORDS,
+                             crossings: bool = True, search: Optional[WordBitesSearch] = None,
+                             min_length: int = 3) -> Iterator[WordBitesPlanStep]:
+    """
+    Order the whole word list to get the most points out of each drag.
+
+    A copy of the board is played forward one word at a time. At each step the most
+    valuable remaining words, plus the words that extend the last one, are placed against
+    the current layout, where blocks already sitting in a lane cost nothing to reuse. The
+    cheapest few are also tried with another candidate laid across them through a shared
+    block, which scores both words from one set of drags. The best-looking options are
+    planned with plan_word_bites_drags and checked by replaying the drags and reading the
+    board, so only steps that really form their words are kept, and the one scoring the most
+    points per planned drag is played. Words formed along the way are dropped from the list.
+    With a search still running, the moves it has found since the last step are added first.
+    Args:
+        board: The current board state (left untouched)
+        moves: Candidate moves, e.g. from find_word_bites_words
+        valid_words: Dictionary of valid words (the game's word list by default)
+        found: Words already scored; updated as steps are planned
+        candidates: How many of the most valuable remaining words to weigh at each step
+        crossings: Also weigh pairs of words laid across each other
+        search: A WordBitesSearch whose moves join the list as they arrive
+        min_length: Shortest word the game accepts
+    Yields:
+        WordBitesPlanStep objects in playing order, as they are planned
+    """
+    state = board.copy()
+    if valid_words is None:
+        valid_words = load_word_lists()
+    if found is None:
+        found = set()
+    segmenter = get_word_bites_segmenter(state.blocks)
+
+    def by_value(moves: Iterable[WordBitesMove]) -> Dict[str, WordBitesMove]:
+        # Most valuable first; dicts keep this order as words are removed
+        return {move.word: move for move in sorted(moves, key=lambda m: (-m.score, not m.is_vertical, m.word))
+                if move.word not in found}
+
+    remaining = by_value(moves)
+    extensions = build_extension_index(remaining, min_length)
+    last_word = None
+
+    while True:
+        if search is not None and not search.done:
+            # Only wait for the search once there is nothing left to play
+            new_moves = [move for move in search.poll(wait=not remaining) if move.word not in remaining]
+            if new_moves:
+                remaining = by_value(list(remaining.values()) + new_moves)
+                extensions = build_extension_index(remaining, min_length)
+        if not remaining:
+            if search is None or search.done:
+                break
+            continue
+        pool = list(islice(remaining, candidates))
+        if last_word is not None:
+            pool += [word for word in extensions.get(last_word, ()) if word in remaining and word not in pool]
+
+        # Points per drag from the current layout, best first.
+        # A placement is either a WordBitesMove or a WordBitesCrossing of two words.
+        kind_to_blocks = group_blocks_by_kind(state)
+        options = []
+        for word in pool:
+            placement = find_best_word_bites_placement(word, state, segmenter, kind_to_blocks=kind_to_blocks)
+            if placement is None:
+                del remaining[word]
+                continue
+            options.append((-placement.score / max(placement.drags, 1), -placement.score, (word,), placement))
+        if crossings:
+            singles = sorted(options, key=lambda option: option[:3])[:CROSSING_WORDS]
+            others = [word for word in pool if word in remaining]
+            for _, _, _, placement in singles:
+                for crossing in find_word_bites_crossings(placement, others, state, segmenter):
+                    options.append((-crossing.score / max(crossing.drags, 1), -crossing.score,
+                                    crossing.words, crossing))
+        options.sort(key=lambda option: option[:3])
+
+        # The estimates only rank the options; the best few are planned for real and the one
+        # whose drags actually score the most points each is played
+        best = None  # ((points per drag, points), words, drags, trial, new words)
+        planned = 0
+        for _, _, words, placement in options:
+            if planned == PLANNED_OPTIONS:
+                break
+            word = words[0]
+            upcoming = [remaining[other] for other in islice(remaining, LOOKAHEAD_WORDS + len(words))
+                        if other not in words]
+            drags = plan_word_bites_drags(state, placement.block_moves, get_reserved_mask(state, upcoming))
+            trial = state.copy()
+            formed = apply_drags(trial, drags, valid_words, min_length) if drags is not None else None
+            if formed is None or any(other not in formed for other in words):
+                if len(words) == 1:
+                    # Neighbouring letters run into it here; it's dropped rather than retried
+                    del remaining[word]
+                continue
+
+            planned += 1
+            new_words = sorted(formed - found)
+            points = sum(get_word_score(w) for w in new_words)
+            value = (points / max(len(drags), 1), points)
+            if best is None or value > best[0]:
+                best = (value, words, drags, trial, new_words)
+
+        if best is None:
+            continue
+        (_, points), words, drags, state, new_words = best
+        found.update(new_words)
+        for other in new_words + [words[0]]:
+            remaining.pop(other, None)
+        last_word = words[-1]
+        yield WordBitesPlanStep(words[0], drags, new_words, points, words[1] if len(words) > 1 else None)
+
+def plan_word_bites_game(board: WordBitesBoard, moves: List[WordBitesMove],
+                         valid_words: Optional[Set[str]] = None, **options) -> List[WordBitesPlanStep]:
+    """Plan the complete game with plan_word_bites_sequence and return every step."""
+    return list(plan_word_bites_sequence(board, moves, valid_words, **options))
@@ -0,0 +1,275 @@
+import heapq
+import random
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src.game.word_bites_board import WordBitesBoard, Block, BlockType
+from src.game.word_finder import WordBitesMove, load_word_lists, find_word_bites_words, optimize_word_order
+from src.game.word_bites_sequencer import WordBitesPlanStep, find_formed_words, get_word_score
+from src.game.word_bites_screen import WordBitesDragLog, resync_word_bites_board, drag_screen_tile
+from src.game.word_bites_player import (PrioritizedWordBitesMove, play_word_bites_move, play_word_bites_step,
+                                        execute_word_bites_moves_from_heap, execute_word_bites_plan)
+
+# Simulated input time per drag: the two 1 ms holds move_word_bites_block makes around the drag
+DRAG_SECONDS = 0.002
+
+# Simulated time to recapture the board region and find the covered cells
+CAPTURE_SECONDS = 0.03
+
+# Rough English letter frequencies for random boards (vowels and common consonants repeated)
+RANDOM_LETTERS = "EEEEEEAAAAIIIIOOOUUSSSTTTRRRNNNLLLDDCCMMPPBGHKWYFV"
+
+def make_random_board(rng: random.Random, num_blocks: int = 15, pair_fraction: float = 0.5) -> WordBitesBoard:
+    """
+    Build a random Word Bites board for offline benchmarking.
+    Args:
+        rng: Random number generator, so boards can be reproduced from a seed
+        num_blocks: Number of blocks to place
+        pair_fraction: Fraction of blocks that are two-letter (split evenly between orientations)
+    """
+    board = WordBitesBoard()
+    while len(board.blocks) < num_blocks:
+        row, col = rng.randrange(board.ROWS), rng.randrange(board.COLS)
+        if rng.random() < pair_fraction:
+            block_type = rng.choice([BlockType.HORIZONTAL, BlockType.VERTICAL])
+            letters = [rng.choice(RANDOM_LETTERS), rng.choice(RANDOM_LETTERS)]
+        else:
+            block_type = BlockType.SINGLE
+            letters = [rng.choice(RANDOM_LETTERS)]
+        board.add_block(Block(block_type, letters, (row, col)), combine=False)
+    return board
+
+@dataclass
+class WordRecord:
+    """What one attempt to play a move cost and earned"""
+    word: str
+    drags: int = 0
+    seconds: float = 0.0  # Simulated input time
+    points: int = 0
+    words_formed: List[str] = field(default_factory=list)  # New words scored by this attempt's drags
+    success: bool = False  # What the executor was told
+
+    @property
+    def wasted_drags(self) -> int:
+        """Drags that earned no points"""
+        return self.drags if not self.points else 0
+
+class WordBitesSimulator:
+    """
+    Headless Word Bites game.
+    Drags are applied to the game's own board, `screen`, and every new word they form, across
+    or down, is scored once, the way the game does. The executors play on `board`, their model
+    of the screen, which only drifts from it when a drag is silently dropped. The simulator
+    stands in for the mouse, the screen and the clock, so the executors and planner run
+    unchanged and without Quartz.
+    """
+
+    def __init__(self, board: WordBitesBoard, valid_words: Optional[Set[str]] = None, min_length: int = 3,
+                 drag_seconds: float = DRAG_SECONDS, time_limit: Optional[float] = None,
+                 restore_failed: bool = False, drag_failure_rate: float = 0.0, seed: int = 0,
+                 silent_failure_rate: float = 0.0, capture_seconds: float = CAPTURE_SECONDS):
+        """
+        Args:
+            board: Starting layout; the executors play on this board
+            valid_words: Dictionary of valid words (the game's word list by default)
+            min_length: Shortest word the game accepts
+            drag_seconds: Simulated input time per drag
+            time_limit: Stop playing moves once this much input time has been used
+            restore_failed: Drag blocks back after a failed move, as the executor used to
+            drag_failure_rate: Chance that a drag is lost, like a missed mouse event
+            seed: Seed for the lost drags, so runs can be repeated
+            silent_failure_rate: Chance that the game ignores a drag the executor thinks worked
+            capture_seconds: Simulated time each resync_board takes
+        """
+        self.board = board
+        self.screen = board.copy()
+        self.valid_words = valid_words if valid_words is not None else load_word_lists()
+        self.min_length = min_length
+        self.drag_seconds = drag_seconds
+        self.time_limit = time_limit
+        self.restore_failed = restore_failed
+        self.drag_failure_rate = drag_failure_rate
+        self.silent_failure_rate = silent_failure_rate
+        self.capture_seconds = capture_seconds
+        self.rng = random.Random(seed)
+
+        self.found: Set[str] = set()
+        self.score = 0
+        self.drags = 0
+        self.restore_drags = 0
+        self.resyncs = 0
+        self.seconds = 0.0
+        self._drag_log: Optional[WordBitesDragLog] = None  # Set while a plan is replayed with resyncs
+        self.records: List[WordRecord] = []
+        self._current: Optional[WordRecord] = None
+
+    def drag(self, block: Block, target_row: int, target_col: int, board: WordBitesBoard) -> bool:
+        """
+        Stand-in for move_word_bites_block: move the block the model has at the pointer and
+        score any new words. Like the mouse, the drag picks up whatever tile the screen has
+        under the pointer, so once the model has drifted it can move the wrong tile or none.
+        """
+        block = board.get_block(block.id)
+        if block is None:
+            return False
+        if not board.is_valid_move(block, target_row, target_col):
+            return False
+
+        # A lost drag still takes input time
+        self.drags += 1
+        self.seconds += self.drag_seconds
+        if self._current is not None:
+            self._current.drags += 1
+            self._current.seconds += self.drag_seconds
+        if self.drag_failure_rate and self.rng.random() < self.drag_failure_rate:
+            return False
+        from_row, from_col = block.position
+        board.move_block(from_row, from_col, target_row, target_col)
+        if self.silent_failure_rate and self.rng.random() < self.silent_failure_rate:
+            return True
+
+        tile = drag_screen_tile(self.screen, (from_row, from_col), (target_row, target_col))
+        if tile is None:
+            return True
+
+        # Only the rows and columns the tile left or landed in can have changed
+        cells = tile.get_all_positions() | self.screen.get_block(tile.id).get_all_positions()
+        formed = find_formed_words(self.screen, self.valid_words, self.min_length,
+                                   {row for row, _ in cells}, {col for _, col in cells})
+        for word in sorted(formed - self.found):
+            self.found.add(word)
+            points = get_word_score(word)
+            self.score += points
+            if self._current is not None:
+                self._current.points += points
+                self._current.words_formed.append(word)
+        return True
+
+    def pause(self, seconds: float) -> None:
+        """Stand-in for time.sleep: advance the simulated clock."""
+        self.seconds += seconds
+
+    def resync_board(self, board: WordBitesBoard) -> bool:
+        """Stand-in for capture_word_bites_cells and a resync: correct the model from the screen."""
+        self.seconds += self.capture_seconds
+        occupied = np.array(self.screen.cell_ids).reshape(self.screen.ROWS, self.screen.COLS) >= 0
+        if self._drag_log is not None:
+            changed = self._drag_log.resync(board, occupied)
+        else:
+            changed = resync_word_bites_board(board, occupied)
+        if not changed:
+            return False
+        self.resyncs += 1
+        return True
+
+    def play_move(self, move: WordBitesMove, board: WordBitesBoard,
+                  upcoming: Sequence[WordBitesMove] = ()) -> bool:
+        """Play one move through the planner, recording what it cost and earned."""
+        return self._record(move.word, board, lambda: play_word_bites_move(move, board, self.drag, upcoming))
+
+    def play_step(self, step: WordBitesPlanStep, board: WordBitesBoard) -> bool:
+        """Play one step of a sequenced plan, recording what it cost and earned."""
+        drag = self._drag_log or self.drag
+        return self._record(step.word, board, lambda: play_word_bites_step(step, board, drag))
+
+    def time_is_up(self) -> bool:
+        """Whether the simulated input time has reached the time limit"""
+        return self.time_limit is not None and self.seconds >= self.time_limit
+
+    def _record(self, word: str, board: WordBitesBoard, play) -> bool:
+        """Run `play` as one attempt at `word` and record its drags, time and points."""
+        if self.time_is_up():
+            return False
+
+        original_positions = {block.id: block.position for block in board.blocks}
+        self._current = WordRecord(word)
+        success = False
+        try:
+            success = play()
+            if not success and self.restore_failed:
+                self._restore(original_positions, board)
+        finally:
+            self._current.success = success
+            self.records.append(self._current)
+            self._current = None
+        return success
+
+    def _restore(self, original_positions: Dict[int, Tuple[int, int]], board: WordBitesBoard) -> None:
+        """Drag every displaced block back, bottom-to-top, like the old restore_blocks."""
+        drags_before = self.drags
+        for block_id, position in sorted(original_positions.items(), key=lambda item: (-item[1][0], -item[1][1])):
+            block = board.get_block(block_id)
+            if block is not None and block.position != position:
+                self.drag(block, *position, board)
+        self.restore_drags += self.drags - drags_before
+
+    def replay_moves(self, moves: List[WordBitesMove]) -> None:
+        """Replay moves through execute_word_bites_moves_from_heap, as main.py does."""
+        move_heap = [PrioritizedWordBitesMove(move) for move in moves]
+        move_heap.append(PrioritizedWordBitesMove(WordBitesMove("", [], 0)))
+        heapq.heapify(move_heap)
+        execute_word_bites_moves_from_heap(move_heap, Lock(), self.board, self.play_move, self.pause, verbose=False)
+
+    def replay_plan(self, moves: List[WordBitesMove], crossings: bool = True, staging: bool = False,
+                    resync: bool = False) -> None:
+        """Sequence the moves with plan_word_bites_sequence and play them through execute_word_bites_plan."""
+        self._drag_log = WordBitesDragLog(self.drag, self.board) if resync else None
+        # Planning ahead only saves wall-clock time, which the simulated clock doesn't count
+        execute_word_bites_plan(self.board, moves, self.play_step, self.pause, self.valid_words, verbose=False,
+                                game_over=self.time_is_up, crossings=crossings, staging=staging, pipelined=False,
+                                resync=self.resync_board if resync else None)
+        self._drag_log = None
+
+    @property
+    def wasted_drags(self) -> int:
+        """Drags spent on attempts that earned no points"""
+        return sum(record.wasted_drags for record in self.records)
+
+    @property
+    def points_per_second(self) -> float:
+        """Score per second of simulated input time"""
+        return self.score / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Totals for the game so far"""
+        return {
+            "score": self.score,
+            "words": len(self.found),
+            "attempts": len(self.records),
+            "drags": self.drags,
+            "restore_drags": self.restore_drags,
+            "resyncs": self.resyncs,
+            "wasted_drags": self.wasted_drags,
+            "seconds": self.seconds,
+            "points_per_second": self.points_per_second,
+        }
+
+def simulate_word_bites_game(board: WordBitesBoard, valid_words: Optional[Set[str]] = None,
+                             moves: Optional[List[WordBitesMove]] = None, sequenced: bool = False,
+                             crossings: bool = True, staging: bool = False, resync: bool = False,
+                             **options) -> WordBitesSimulator:
+    """
+    Find the moves for a board and replay them the way main.py plays a game.
+    Args:
+        board: Starting layout (left untouched)
+        valid_words: Dictionary of valid words (the game's word list by default)
+        moves: Moves to replay; find_word_bites_words ordered by optimize_word_order by default
+        sequenced: Play a plan_word_bites_sequence plan instead of going through the heap
+        crossings: Let the sequenced plan lay words across each other
+        staging: Let the sequenced plan start by staging the blocks, see choose_word_bites_staging
+        resync: Let the sequenced plan check its board against the screen, see resync_board
+        options: Passed on to WordBitesSimulator
+    Returns:
+        The simulator, holding the per-word records and totals.
+    """
+    if moves is None:
+        moves = optimize_word_order(list(find_word_bites_words(board)))
+    simulator = WordBitesSimulator(board.copy(), valid_words, **options)
+    if sequenced:
+        simulator.replay_plan(moves, crossings, staging, resync)
+    else:
+        simulator.replay_moves(moves)
+    return simulator
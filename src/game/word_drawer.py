@@ -1,11 +1,13 @@
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
 import Quartz
 from src.game.word_bites_board import WordBitesBoard, Block, BlockType
 from src.game.word_finder import WordBitesMove
 from src.utils.window import find_iphone_window
 from threading import Lock
 import time
-from src.game.word_finder import are_words_related, WordBitesMove
+from src.game.word_finder import are_words_related, WordBitesMove, get_word_bites_segmenter, find_best_word_bites_placement
+from src.game.word_bites_planner import LOOKAHEAD_WORDS
+from src.game.word_bites_player import play_word_bites_move
 
 def get_letter_position(x: int, y: int, game_version: str = "4x4") -> Tuple[int, int]:
     """
@@ -136,28 +138,12 @@ def move_word_bites_block(block: Block, target_row: int, target_col: int, board:
     Move a Word Bites block from its current position to a target position.
     Returns True if successful, False otherwise.
     """
-    from_row, from_col = block.position
-    
     try:
-        # Verify the block is actually at its expected position
-        actual_block = board.get_block_at(from_row, from_col)
-        if actual_block != block:
-            # Try to find the block's actual position on the board
-            found = False
-            for r in range(board.ROWS):
-                for c in range(board.COLS):
-                    check_block = board.get_block_at(r, c)
-                    if check_block and check_block.letters == block.letters and check_block.type == block.type:
-                        # Since Block is immutable, we need to use the actual block from the board
-                        block = check_block
-                        from_row, from_col = r, c
-                        found = True
-                        break
-                if found:
-                    break
-            
-            if not found:
-                return False
+        # Look the block up by its id, since it may have moved since `block` was taken
+        block = board.get_block(block.id)
+        if block is None:
+            return False
+        from_row, from_col = block.position
         
         # For vertical blocks, ensure we're using the top position for both source and target
         if block.type == BlockType.VERTICAL:
@@ -166,8 +152,7 @@ def move_word_bites_block(block: Block, target_row: int, target_col: int, board:
             if not (0 <= target_row + 1 < board.ROWS):
                 return False
             for r in [target_row, target_row + 1]:
-                existing = board.get_block_at(r, target_col)
-                if existing and existing != block:
+                if board.get_block_id_at(r, target_col) not in (-1, block.id):
                     return False
         elif block.type == BlockType.HORIZONTAL:
             if target_col + 1 >= board.COLS:
@@ -175,8 +160,7 @@ def move_word_bites_block(block: Block, target_row: int, target_col: int, board:
             if not (0 <= target_col + 1 < board.COLS):
                 return False
             for c in [target_col, target_col + 1]:
-                existing = board.get_block_at(target_row, c)
-                if existing and existing != block:
+                if board.get_block_id_at(target_row, c) not in (-1, block.id):
                     return False
         
         # Get screen coordinates
@@ -214,227 +198,30 @@ def move_word_bites_block(block: Block, target_row: int, target_col: int, board:
         print(f"Error in move_word_bites_block: {str(e)}")
         return False
 
-def execute_word_bites_move(move: WordBitesMove, board: WordBitesBoard, preserve_word: bool = False) -> bool:
+def execute_word_bites_move(move: WordBitesMove, board: WordBitesBoard, preserve_word: bool = False,
+                            upcoming: Sequence[WordBitesMove] = ()) -> bool:
     """
     Execute a Word Bites move by moving all required blocks into position.
+    The full list of drags is planned by play_word_bites_move before any mouse events are posted.
+    Blocks are never dragged back afterwards: whatever layout results, even after a failed drag,
+    is the baseline the next word is planned from.
     Args:
         move: The move to execute
         board: The current board state
         preserve_word: If True, try to keep the word formed on the board for subsequent related words
+        upcoming: The next few moves; blocks in the way are parked clear of the cells they use
     Returns:
         True if all blocks were moved successfully.
     """
-    # Track all blocks and their positions for restoration
-    original_positions = {}
-    for block in board.blocks:
-        original_positions[block] = block.position
-    
-    # First, identify all positions we need for the word
-    word_positions = set()
-    blocks_needed = {}  # Map target position -> block needed there
-    
-    # Track blocks that are already used in the current word formation
-    used_blocks = set()
-    
-    # Find the current blocks that match the ones in the move
-    updated_block_moves = []
-    for original_block, target_pos in move.block_moves:
-        # Get the letters of the original block
-        letters = original_block.letters
-        
-        # Find a matching block on the current board that hasn't been used yet
-        # Use the new letter-to-blocks index for faster lookup
-        matching_blocks = []
-        for letter in letters:
-            letter_blocks = board.get_blocks_by_letter(letter)
-            for block in letter_blocks:
-                if block not in used_blocks and block.type == original_block.type:
-                    # Check if all letters match
-                    if all(l in block.letters for l in letters):
-                        matching_blocks.append(block)
-                        break
-        
-        # If no matching blocks found, try to find any block with the same letters
-        if not matching_blocks:
-            for block in board.blocks:
-                if block not in used_blocks and block.type == original_block.type:
-                    if all(l in block.letters for l in letters):
-                        matching_blocks.append(block)
-                        break
-        
-        if not matching_blocks:
-            return False
-        
-        # Use the first matching block
-        current_block = matching_blocks[0]
-        
-        # Mark this block as used
-        used_blocks.add(current_block)
-        
-        # Add to updated moves
-        updated_block_moves.append((current_block, target_pos))
-        
-        # Add to word positions and blocks needed
-        row, col = target_pos
-        word_positions.add((row, col))
-        blocks_needed[target_pos] = current_block
-        
-        # Add second position for double blocks
-        if current_block.type == BlockType.HORIZONTAL:
-            word_positions.add((row, col + 1))
-        elif current_block.type == BlockType.VERTICAL:
-            word_positions.add((row + 1, col))
-    
-    # Find blocks that are in the way
-    blocks_to_clear = set()
-    for pos in word_positions:
-        row, col = pos
-        block = board.get_block_at(row, col)
-        if block:
-            # If this block is needed but not in the right position, clear it
-            is_needed = False
-            correct_position = False
-            for needed_pos, needed_block in blocks_needed.items():
-                if block == needed_block:
-                    is_needed = True
-                    if block.position == needed_pos:
-                        correct_position = True
-                    break
-            
-            if not is_needed or (is_needed and not correct_position):
-                blocks_to_clear.add(block)  # Using set to avoid duplicates
-    
-    # Sort blocks to clear by position (bottom-to-top, right-to-left)
-    blocks_to_clear = sorted(blocks_to_clear, key=lambda b: (-b.position[0], -b.position[1]))
-    
-    # Track temporary positions of cleared blocks
-    temp_positions = {}
+    # Plan the drags, then post them in order
+    success = play_word_bites_move(move, board, move_word_bites_block, upcoming)
     
-    # Move blocking blocks to temporary positions
-    for block in blocks_to_clear:
-        orig_pos = block.position
-        
-        # Find a free position that won't interfere with word formation
-        temp_pos = None
-        # Start from the bottom of the board
-        for r in range(board.ROWS - 1, -1, -1):
-            for c in range(board.COLS - 1, -1, -1):
-                # Skip positions needed for the word
-                if (r, c) in word_positions:
-                    continue
-                    
-                # Check space requirements for the block
-                positions_needed = {(r, c)}
-                if block.type == BlockType.HORIZONTAL:
-                    if c + 1 >= board.COLS:
-                        continue
-                    if (r, c + 1) in word_positions:
-                        continue
-                    positions_needed.add((r, c + 1))
-                elif block.type == BlockType.VERTICAL:
-                    if r + 1 >= board.ROWS:
-                        continue
-                    if (r + 1, c) in word_positions:
-                        continue
-                    positions_needed.add((r + 1, c))
-                
-                # Check if all needed positions are free
-                can_place = True
-                for pos_r, pos_c in positions_needed:
-                    if not (0 <= pos_r < board.ROWS and 0 <= pos_c < board.COLS):
-                        can_place = False
-                        break
-                    existing_block = board.get_block_at(pos_r, pos_c)
-                    if existing_block and existing_block != block:
-                        can_place = False
-                        break
-                
-                if can_place:
-                    temp_pos = (r, c)
-                    break
-            if temp_pos:
-                break
-        
-        if temp_pos:
-            # Try to move the block to a temporary position
-            if move_word_bites_block(block, temp_pos[0], temp_pos[1], board):
-                temp_positions[block] = orig_pos
-            else:
-                restore_blocks(original_positions, board)
-                return False
-        else:
-            restore_blocks(original_positions, board)
-            return False
-    
-    # Sort moves by position (top-to-bottom, left-to-right)
-    sorted_moves = sorted(updated_block_moves, key=lambda x: (x[1][0], x[1][1]))
-    
-    # Move each block to its target position
-    success = True
-    for i, (block, target_pos) in enumerate(sorted_moves):
-        # Skip if block is already in correct position
-        if block.position == target_pos:
-            continue
-        
-        # Try to move the block
-        if not move_word_bites_block(block, target_pos[0], target_pos[1], board):
-            success = False
-            break
-    
-    # If we failed, restore all blocks to their original positions
-    if not success:
-        restore_blocks(original_positions, board)
-    elif not preserve_word:
+    if success and not preserve_word:
         # Wait a bit to let the game register the word
         time.sleep(0.02)  # Reduced delay
     
     return success
 
-def restore_blocks(original_positions: dict, board: WordBitesBoard) -> None:
-    """Helper function to restore blocks to their original positions"""
-    # Sort blocks by position (bottom-to-top, right-to-left)
-    blocks_to_restore = sorted(original_positions.items(), 
-                             key=lambda x: (-x[1][0], -x[1][1]))
-    
-    # Create a map of block letters to current blocks on the board for faster lookup
-    letter_to_blocks = {}
-    for r in range(board.ROWS):
-        for c in range(board.COLS):
-            check_block = board.get_block_at(r, c)
-            if check_block:
-                letters_key = "".join(check_block.letters) + str(check_block.type)
-                if letters_key not in letter_to_blocks:
-                    letter_to_blocks[letters_key] = []
-                letter_to_blocks[letters_key].append((check_block, (r, c)))
-    
-    # Track blocks that have already been moved to avoid redundant moves
-    moved_blocks = set()
-    
-    for original_block, orig_pos in blocks_to_restore:
-        # Skip if already in correct position
-        letters_key = "".join(original_block.letters) + str(original_block.type)
-        matching_blocks = letter_to_blocks.get(letters_key, [])
-        
-        # Find a block that's not already in the correct position and hasn't been moved yet
-        current_block = None
-        current_pos = None
-        
-        for block, pos in matching_blocks:
-            if pos != orig_pos and block not in moved_blocks:  # Only consider blocks not already in position and not moved
-                current_block = block
-                current_pos = pos
-                break
-        
-        if not current_block or current_pos == orig_pos:
-            continue
-            
-        # Mark this block as moved
-        moved_blocks.add(current_block)
-            
-        # Try to restore the block
-        move_word_bites_block(current_block, orig_pos[0], orig_pos[1], board)
-        time.sleep(0.005)  # Further reduced delay between moves
-
 def execute_word_bites_moves(moves: List[WordBitesMove], board: WordBitesBoard) -> None:
     """
     Execute a list of Word Bites moves in order, prioritizing high-scoring words first.
@@ -481,6 +268,7 @@ def execute_word_bites_moves(moves: List[WordBitesMove], board: WordBitesBoard)
         for idx, move in enumerate(related_words):
             # For related words, try to preserve the word formation for the next word
             preserve_word = (idx < len(related_words) - 1)
+            upcoming = moves[i + idx + 1:i + idx + 1 + LOOKAHEAD_WORDS]
             
             # Check if we can build upon the previous word
             if last_word and are_words_related(last_word, move.word):
@@ -498,11 +286,11 @@ def execute_word_bites_moves(moves: List[WordBitesMove], board: WordBitesBoard)
                     
                     if modified_block_moves:
                         # Create a new move with just the blocks we need to add
-                        modified_move = WordBitesMove(move.word, modified_block_moves, move.score)
-                        success = execute_word_bites_move(modified_move, board, preserve_word)
+                        modified_move = WordBitesMove(move.word, modified_block_moves, move.score, move.is_vertical, move.origin)
+                        success = execute_word_bites_move(modified_move, board, preserve_word, upcoming)
                     else:
                         # If no new blocks needed (shouldn't happen), use the original move
-                        success = execute_word_bites_move(move, board, preserve_word)
+                        success = execute_word_bites_move(move, board, preserve_word, upcoming)
                 
                 elif last_word.startswith(move.word):
                     # The new word is a prefix of the last word (e.g., "PLAYER" -> "PLAY")
@@ -512,10 +300,10 @@ def execute_word_bites_moves(moves: List[WordBitesMove], board: WordBitesBoard)
                 else:
                     # The words are related but one is not a prefix of the other
                     # (e.g., "PLAY" -> "PLAYING" where we need to remove 'Y' and add 'YING')
-                    success = execute_word_bites_move(move, board, preserve_word)
+                    success = execute_word_bites_move(move, board, preserve_word, upcoming)
             else:
                 # No previous word or words are not related, execute normally
-                success = execute_word_bites_move(move, board, preserve_word)
+                success = execute_word_bites_move(move, board, preserve_word, upcoming)
             
             if success:
                 total_score += move.score
@@ -549,24 +337,15 @@ def execute_word_bites_moves(moves: List[WordBitesMove], board: WordBitesBoard)
         last_word = None
         last_word_blocks = {}
     
-    # Try the failed words one more time with a different approach
+    # Try the failed words one more time, re-placing each one anywhere on the board as it now stands
     if failed_words:
         for move in failed_words:
-            # Try with a different approach - sort blocks differently
-            # This time sort by distance from current position to target
-            block_moves = []
-            for block, target_pos in move.block_moves:
-                current_pos = block.position
-                distance = abs(current_pos[0] - target_pos[0]) + abs(current_pos[1] - target_pos[1])
-                block_moves.append((block, target_pos, distance))
-            
-            # Sort by distance (closest first)
-            block_moves.sort(key=lambda x: x[2])
-            
-            # Create a new move with reordered blocks
-            reordered_move = WordBitesMove(move.word, [(b, p) for b, p, _ in block_moves], move.score)
+            segmenter = get_word_bites_segmenter(board.blocks)
+            replanned_move = find_best_word_bites_placement(move.word, board, segmenter)
+            if replanned_move is None:
+                continue
             
-            if execute_word_bites_move(reordered_move, board, False):
+            if execute_word_bites_move(replanned_move, board, False):
                 total_score += move.score
                 words_formed += 1
             
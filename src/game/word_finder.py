@@ -1,8 +1,11 @@
-from typing import List, Set, Tuple, Dict, Optional
-from src.config.config import WORD_SCORES, WORD_LIST_PATH
+import multiprocessing
+import queue
+import time
+from typing import FrozenSet, Iterable, Iterator, List, Set, Tuple, Dict, Optional
+from src.config.config import WORD_SCORES, WORD_LIST_PATH, WORD_BITES_CACHE_PATH
 from src.game.word_bites_board import WordBitesBoard, Block, BlockType
+from src.game.word_bites_cache import WordBitesWordCache, get_block_set_signature
 from dataclasses import dataclass
-from copy import deepcopy
 
 # Cache for prefix sets
 _prefix_cache = {}
@@ -18,8 +21,14 @@ def get_prefix_set(valid_words):
         _prefix_cache[cache_key] = prefixes
     return _prefix_cache[cache_key]
 
+# The word list is read once per process; a frozenset so get_prefix_set can key on it for free
+_word_list_cache: Optional[FrozenSet[str]] = None
+
 def load_word_lists() -> Set[str]:
     """Load the filtered Collins word list into a set of valid words."""
+    global _word_list_cache
+    if _word_list_cache is not None:
+        return _word_list_cache
     all_words = set()
     
     try:
@@ -29,7 +38,12 @@ def load_word_lists() -> Set[str]:
     except FileNotFoundError:
         raise FileNotFoundError(f"Could not find word list file. Please ensure '{WORD_LIST_PATH}' exists.")
     
-    return all_words
+    _word_list_cache = frozenset(all_words)
+    return _word_list_cache
+
+def is_loaded_word_list(words: Optional[Set[str]]) -> bool:
+    """Whether `words` is the set load_word_lists returned, without loading the list to find out."""
+    return words is not None and words is _word_list_cache
 
 def get_empty_cells(game_version: str) -> Set[Tuple[int, int]]:
     """Return set of coordinates for empty cells based on game version."""
@@ -187,28 +201,80 @@ def print_anagram_words(words: dict[str, str]):
     print(f"\nTotal words found: {len(words)}")
     print(f"Total score: {calculate_score(words)}")
 
-@dataclass
+def _get_word_bites_score(length: int) -> int:
+    """Points for a Word Bites word of the given length"""
+    if length in WORD_SCORES:
+        return WORD_SCORES[length]
+    # Past the table, +400 points per letter from the 9-letter score. This also makes the
+    # empty word that ends a move heap negative, so it sorts after every real move.
+    return 2600 + 400 * (length - 9)
+
+# Word Bites points by word length, for every length the 9x8 board can hold
+WORD_BITES_SCORES: Tuple[int, ...] = tuple(_get_word_bites_score(length) for length in range(WordBitesBoard.ROWS + 1))
+
+def get_word_bites_score(length: int) -> int:
+    """Points for a Word Bites word of the given length, from WORD_BITES_SCORES"""
+    if length < len(WORD_BITES_SCORES):
+        return WORD_BITES_SCORES[length]
+    return _get_word_bites_score(length)
+
 class WordBitesMove:
-    """Represents a move in Word Bites - which blocks to move where to form a word"""
-    word: str
-    block_moves: List[Tuple[Block, Tuple[int, int]]]  # List of (block, target_position) pairs
-    score: int = 0
-    is_vertical: bool = False
-
-    def __post_init__(self):
-        # Calculate score based on word length
-        length = len(self.word)
-        if length in WORD_SCORES:
-            self.score = WORD_SCORES[length]
-        else:
-            # For words longer than 9 letters (if any), use the pattern of +400 points per letter
-            # The pattern from the provided scores is:
-            # 7->8: +400 points
-            # 8->9: +400 points
-            self.score = 2600 + 400 * (length - 9)  # Base on 9-letter score
-        
-        # Note: We keep the is_vertical flag for prioritization in the search order
-        # but no longer add bonus points for vertical words
+    """
+    Represents a move in Word Bites - which blocks to move where to form a word.
+    A plain slotted class rather than a dataclass, since the planners create them by the
+    thousand per board; encode() gives a compact form for sending moves between processes.
+    """
+    __slots__ = ('word', 'block_moves', 'score', 'is_vertical', 'origin', 'drags')
+
+    def __init__(self, word: str, block_moves: List[Tuple[Block, Tuple[int, int]]], score: int = 0,
+                 is_vertical: bool = False, origin: Optional[Tuple[int, int]] = None,
+                 drags: Optional[int] = None):
+        """
+        Args:
+            word: The word the move spells
+            block_moves: List of (block, target_position) pairs
+            score: Ignored - the score always follows from the word's length
+            is_vertical: Whether the word reads down; kept for prioritization in the search
+                order, vertical words earn no bonus
+            origin: (row, col) of the word's first letter
+            drags: Estimated drags from the layout the word was placed against
+        """
+        self.word = word
+        self.block_moves = block_moves
+        self.score = get_word_bites_score(len(word))
+        self.is_vertical = is_vertical
+        self.origin = origin
+        self.drags = drags
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.word, self.block_moves, self.score, self.is_vertical, self.origin, self.drags) ==
+                (other.word, other.block_moves, other.score, other.is_vertical, other.origin, other.drags))
+
+    __hash__ = None  # Mutable, like the dataclass it replaced
+
+    def __repr__(self):
+        return (f"WordBitesMove(word={self.word!r}, block_moves={self.block_moves!r}, score={self.score!r}, "
+                f"is_vertical={self.is_vertical!r}, origin={self.origin!r}, drags={self.drags!r})")
+
+    def encode(self) -> Tuple:
+        """
+        Compact, picklable form of the move: (word, is_vertical, origin, drags, moves), where
+        moves is a flat tuple of (block id, target cell index) pairs, the cell index being
+        row * COLS + col. decode() rebuilds the move from the board it was placed against.
+        """
+        cols = WordBitesBoard.COLS
+        moves = tuple(value for block, (row, col) in self.block_moves for value in (block.id, row * cols + col))
+        return (self.word, self.is_vertical, self.origin, self.drags, moves)
+
+    @classmethod
+    def decode(cls, data: Tuple, board: WordBitesBoard) -> 'WordBitesMove':
+        """Rebuild a move from encode(), taking its blocks from `board`."""
+        word, is_vertical, origin, drags, moves = data
+        block_moves = [(board.get_block(moves[index]), divmod(moves[index + 1], board.COLS))
+                       for index in range(0, len(moves), 2)]
+        return cls(word, block_moves, is_vertical=is_vertical, origin=origin, drags=drags)
 
 def are_words_related(word1: str, word2: str) -> bool:
     """
@@ -369,273 +435,560 @@ def optimize_word_order(moves_list: List[WordBitesMove]) -> List[WordBitesMove]:
     
     return result
 
-def find_word_bites_words(board: WordBitesBoard, min_length: int = 3):
-    """
-    Find all possible words that can be made in Word Bites by moving blocks around.
-    Only keeps one combination per word (first one found) since points can only be earned once.
-    Args:
-        board: The Word Bites board
-        min_length: Minimum word length to consider
-    Yields:
-        WordBitesMove objects describing how to form each word, as they are found
+# A token is one block's contribution to a word: (block kind, letter index).
+# Letter index None means a pair block lying along the word (both letters),
+# 0/1 means a single block or a pair block lying across the word (one letter).
+# Kinds use the BlockType value rather than the enum, since enum hashing is slow.
+BlockKind = Tuple[str, Tuple[str, ...]]
+WordBitesToken = Tuple[BlockKind, Optional[int]]
+
+SINGLE_KIND = BlockType.SINGLE.value
+
+def get_block_kind(block: Block) -> BlockKind:
+    """Return the position-independent identity of a block: its type value and letters."""
+    return (block.type.value, tuple(block.letters))
+
+class WordBitesSegmenter:
     """
-    valid_words = load_word_lists()
-    found_words = set()  # Use set to track unique words
+    Memoized word-to-block segmentation for one Word Bites block inventory.
     
-    # Get all blocks and their letters
-    blocks = board.blocks
+    Blocks only move during a game, never change, so every way to split a word into
+    block tokens can be computed once per board and shared between the solver and
+    the executor. Unlike greedy matching this finds every split, e.g. both "ST|EP"
+    and "S|TE|P" when a board has both an ST and a TE pair.
+    """
     
-    # Create a map of letters to blocks that contain them
-    letter_to_blocks: Dict[str, List[Block]] = {}
-    for block in blocks:
-        for letter in block.letters:
-            if letter not in letter_to_blocks:
-                letter_to_blocks[letter] = []
-            letter_to_blocks[letter].append(block)
-    
-    def can_place_blocks_horizontally(blocks_to_place: List[Block], row: int, start_col: int, board_copy: WordBitesBoard) -> bool:
-        """Check if we can place the given blocks horizontally starting at the given position"""
-        col = start_col
-        for block in blocks_to_place:
-            # Check if we can move the block to this position
-            if not board_copy.is_valid_position(block, row, col):
-                return False
-            col += 1
-        return True
+    def __init__(self, blocks: List[Block]):
+        # Count how many blocks of each kind are available
+        self.block_counts: Dict[BlockKind, int] = {}
+        for block in blocks:
+            kind = get_block_kind(block)
+            self.block_counts[kind] = self.block_counts.get(kind, 0) + 1
+        
+        # Letter -> tokens giving that letter, and letter pair -> along-axis pair kind
+        self._letter_tokens: Dict[bool, Dict[str, List[WordBitesToken]]] = {True: {}, False: {}}
+        self._pair_kinds: Dict[bool, Dict[str, BlockKind]] = {True: {}, False: {}}
+        for vertical in (True, False):
+            along_type = (BlockType.VERTICAL if vertical else BlockType.HORIZONTAL).value
+            letter_tokens = self._letter_tokens[vertical]
+            for kind in self.block_counts:
+                block_type, letters = kind
+                if block_type == SINGLE_KIND:
+                    letter_tokens.setdefault(letters[0], []).append((kind, 0))
+                elif block_type == along_type:
+                    self._pair_kinds[vertical][letters[0] + letters[1]] = kind
+                else:
+                    letter_tokens.setdefault(letters[0], []).append((kind, 0))
+                    letter_tokens.setdefault(letters[1], []).append((kind, 1))
+        
+        self._cache: Dict[Tuple[str, bool], List[Tuple[WordBitesToken, ...]]] = {}
     
-    def try_form_word(word: str, row: int, start_col: int, board_copy: WordBitesBoard) -> Optional[List[Tuple[Block, Tuple[int, int]]]]:
-        """Try to form a word horizontally at the given position by moving blocks"""
-        moves = []
-        col = start_col
+    def segmentations(self, word: str, vertical: bool) -> List[Tuple[WordBitesToken, ...]]:
+        """Return every token sequence spelling `word` on the given axis with the available blocks."""
+        key = (word, vertical)
+        if key in self._cache:
+            return self._cache[key]
         
-        # First check if we have enough space for the word
-        if start_col + len(word) > board_copy.COLS:
-            return None
+        letter_tokens = self._letter_tokens[vertical]
+        pair_kinds = self._pair_kinds[vertical]
+        n = len(word)
         
-        # For each letter in the word
-        i = 0
-        while i < len(word):
-            letter = word[i]
-            # Find a block containing this letter that we haven't used yet
-            available_blocks = [b for b in letter_to_blocks.get(letter, []) 
-                              if not any(b == m[0] for m in moves)]
-            
-            if not available_blocks:
-                return None  # Can't form word - missing required letter
-                
-            # Try each available block
-            placed = False
-            for block in available_blocks:
-                target_pos = None
-                
-                # If it's a horizontal block
-                if block.type == BlockType.HORIZONTAL:
-                    # If this is the first letter of the block
-                    if block.letters[0] == letter:
-                        # Check if we have room for the second letter and it matches
-                        if i + 1 < len(word) and block.letters[1] == word[i + 1]:
-                            target_pos = (row, col)
-                            # Check if both positions are valid
-                            if (col + 1 < board_copy.COLS and 
-                                board_copy.is_valid_position(block, row, col)):
-                                moves.append((block, target_pos))
-                                placed = True
-                                i += 2  # Skip next letter since we used both letters
-                                col += 2  # Skip next position
-                                break
-                    # If this is the second letter of the block
-                    elif block.letters[1] == letter and i > 0 and block.letters[0] == word[i - 1]:
-                        # We can only use this if the previous letter matches and wasn't placed yet
-                        if not moves or moves[-1][0] != block:
-                            target_pos = (row, col - 1)  # Position block one space left
-                            if (col > 0 and 
-                                board_copy.is_valid_position(block, row, col - 1)):
-                                moves.append((block, target_pos))
-                                placed = True
-                                col += 1
-                                break
-                
-                # If it's a vertical block
-                elif block.type == BlockType.VERTICAL:
-                    if block.letters[0] == letter:
-                        target_pos = (row, col)
-                        # Check if we have room below
-                        if (row + 1 < board_copy.ROWS and 
-                            board_copy.is_valid_position(block, row, col)):
-                            moves.append((block, target_pos))
-                            placed = True
-                            col += 1
-                            i += 1
-                            break
-                    elif block.letters[1] == letter:
-                        target_pos = (row - 1, col)  # Place it one row up
-                        # Check if we have room above
-                        if (row > 0 and 
-                            board_copy.is_valid_position(block, row - 1, col)):
-                            moves.append((block, target_pos))
-                            placed = True
-                            col += 1
-                            i += 1
-                            break
-                
-                # Single block
-                else:
-                    target_pos = (row, col)
-                    if board_copy.is_valid_position(block, row, col):
-                        moves.append((block, target_pos))
-                        placed = True
-                        col += 1
-                        i += 1
-                        break
+        # DP over suffixes, ignoring block counts: can word[i:] be covered at all?
+        coverable = [False] * (n + 1)
+        coverable[n] = True
+        for i in range(n - 1, -1, -1):
+            coverable[i] = (
+                (word[i] in letter_tokens and coverable[i + 1]) or
+                (i + 1 < n and word[i:i + 2] in pair_kinds and coverable[i + 2])
+            )
+        
+        results: List[Tuple[WordBitesToken, ...]] = []
+        if coverable[0]:
+            counts = dict(self.block_counts)
+            tokens: List[WordBitesToken] = []
             
-            if not placed:
-                return None  # Couldn't place a block for this letter
+            def split(i: int):
+                if i == n:
+                    results.append(tuple(tokens))
+                    return
+                for token in letter_tokens.get(word[i], []):
+                    kind = token[0]
+                    if counts[kind] and coverable[i + 1]:
+                        counts[kind] -= 1
+                        tokens.append(token)
+                        split(i + 1)
+                        tokens.pop()
+                        counts[kind] += 1
+                if i + 1 < n:
+                    kind = pair_kinds.get(word[i:i + 2])
+                    if kind is not None and counts[kind] and coverable[i + 2]:
+                        counts[kind] -= 1
+                        tokens.append((kind, None))
+                        split(i + 2)
+                        tokens.pop()
+                        counts[kind] += 1
             
-            if i >= len(word):
-                break
+            split(0)
         
-        return moves if len(moves) > 0 else None
+        self._cache[key] = results
+        return results
+
+# Cache of segmenters keyed by block inventory, so each board builds one
+_segmenter_cache: Dict[Tuple, WordBitesSegmenter] = {}
+
+def get_word_bites_segmenter(blocks: List[Block]) -> WordBitesSegmenter:
+    """Get or create the segmenter for the given block inventory."""
+    cache_key = tuple(sorted(get_block_kind(block) for block in blocks))
+    if cache_key not in _segmenter_cache:
+        _segmenter_cache[cache_key] = WordBitesSegmenter(blocks)
+    return _segmenter_cache[cache_key]
+
+def find_feasible_word_bites_words(blocks: List[Block], valid_words: Set[str], vertical: bool,
+                                   min_length: int = 3, prefixes: Optional[Set[str]] = None,
+                                   deadline: Optional[float] = None) -> Dict[str, List[WordBitesToken]]:
+    """
+    Phase one of the Word Bites search: decide which words can be spelled along one axis.
+    
+    Whether a word can be formed only depends on the multiset of blocks and the axis, never
+    on where the blocks currently sit, so this walks the lexicon prefixes once per axis.
+    Each word is mapped to the first token sequence found that spells it. If a deadline
+    (time.perf_counter() value) is given, the walk stops there with the words found so far.
+    """
+    max_length = WordBitesBoard.ROWS if vertical else WordBitesBoard.COLS
+    along_type = (BlockType.VERTICAL if vertical else BlockType.HORIZONTAL).value
+    if prefixes is None:
+        prefixes = get_prefix_set(valid_words)
+    
+    # Count how many blocks of each kind are available
+    block_counts: Dict[BlockKind, int] = {}
+    for block in blocks:
+        kind = get_block_kind(block)
+        block_counts[kind] = block_counts.get(kind, 0) + 1
+    
+    # Every way a block kind can contribute letters to a word on this axis
+    options = []
+    for kind in block_counts:
+        block_type, letters = kind
+        if block_type == SINGLE_KIND:
+            options.append((kind, 0, letters[0]))
+        elif block_type == along_type:
+            options.append((kind, None, letters[0] + letters[1]))
+        else:
+            options.append((kind, 0, letters[0]))
+            if letters[1] != letters[0]:
+                options.append((kind, 1, letters[1]))
+    
+    found: Dict[str, List[WordBitesToken]] = {}
+    tokens: List[WordBitesToken] = []
+    visited = 0
+    out_of_time = False
+    
+    def dfs(prefix: str):
+        nonlocal visited, out_of_time
+        if deadline is not None:
+            # Checking the clock is slow next to a node visit, so only do it now and then
+            visited += 1
+            if visited % 256 == 0 and time.perf_counter() > deadline:
+                out_of_time = True
+        for kind, letter_index, text in options:
+            if out_of_time:
+                return
+            if block_counts[kind] == 0:
+                continue
+            word = prefix + text
+            if len(word) > max_length:
+                continue
+            is_word = word in valid_words
+            if not is_word and word not in prefixes:
+                continue
+            
+            block_counts[kind] -= 1
+            tokens.append((kind, letter_index))
+            if is_word and len(word) >= min_length and word not in found:
+                found[word] = list(tokens)
+            dfs(word)
+            tokens.pop()
+            block_counts[kind] += 1
     
-    def try_form_vertical_word(word: str, start_row: int, col: int, board_copy: WordBitesBoard) -> Optional[List[Tuple[Block, Tuple[int, int]]]]:
-        """Try to form a word vertically at the given position by moving blocks"""
-        moves = []
-        row = start_row
+    dfs("")
+    return found
+
+def group_blocks_by_kind(board: WordBitesBoard) -> Dict[BlockKind, List[Block]]:
+    """Group the blocks on the board by get_block_kind."""
+    kind_to_blocks: Dict[BlockKind, List[Block]] = {}
+    for block in board.blocks:
+        kind_to_blocks.setdefault(get_block_kind(block), []).append(block)
+    return kind_to_blocks
+
+def place_word_bites_tokens(tokens: Tuple[WordBitesToken, ...], board: WordBitesBoard, vertical: bool,
+                            lane: int, start: int,
+                            kind_to_blocks: Dict[BlockKind, List[Block]]) -> Optional[Tuple[List[Tuple[Block, Tuple[int, int]]], int]]:
+    """
+    Lay a token sequence out in one lane and count the drags needed to get it there.
+    Args:
+        tokens: Token sequence from WordBitesSegmenter.segmentations
+        board: The current board state
+        vertical: True to lay the word down column `lane`, False to lay it across row `lane`
+        start: Row (vertical) or column (horizontal) of the first letter
+        kind_to_blocks: Blocks on the board grouped by get_block_kind
+    Returns:
+        (block_moves, drags) or None if the tokens don't fit in this lane. `drags` counts
+        the blocks that have to be moved into place plus the other blocks in the way.
+    """
+    targets = []  # (kind, target_position, cells covered)
+    offset = start
+    for kind, letter_index in tokens:
+        if vertical:
+            row, col = offset, lane
+        else:
+            row, col = lane, offset
+        
+        if letter_index is None:
+            # Pair block lying along the word covers two letters
+            cells = [(row, col), (row + 1, col)] if vertical else [(row, col), (row, col + 1)]
+            target = (row, col)
+            offset += 2
+        elif kind[0] == SINGLE_KIND:
+            cells = [(row, col)]
+            target = (row, col)
+            offset += 1
+        else:
+            # Pair block lying across the word sticks out to one side
+            if vertical:
+                target = (row, col - letter_index)
+                cells = [target, (target[0], target[1] + 1)]
+            else:
+                target = (row - letter_index, col)
+                cells = [target, (target[0] + 1, target[1])]
+            offset += 1
         
-        # First check if we have enough space for the word
-        if start_row + len(word) > board_copy.ROWS:
+        for cell_row, cell_col in cells:
+            if not (0 <= cell_row < board.ROWS and 0 <= cell_col < board.COLS):
+                return None
+        targets.append((kind, target, cells))
+    
+    # Prefer blocks that already sit exactly where they are needed
+    # (blocks are tracked by their board id since hashing them is comparatively slow)
+    assigned: List[Optional[Block]] = [None] * len(targets)
+    used = set()
+    for i, (kind, target, _) in enumerate(targets):
+        for block in kind_to_blocks.get(kind, []):
+            if block.position == target and block.id not in used:
+                assigned[i] = block
+                used.add(block.id)
+                break
+    
+    drags = 0
+    for i, (kind, target, _) in enumerate(targets):
+        if assigned[i] is not None:
+            continue
+        for block in kind_to_blocks.get(kind, []):
+            if block.id not in used:
+                assigned[i] = block
+                used.add(block.id)
+                break
+        if assigned[i] is None:
             return None
+        drags += 1
+    
+    # Every other block covering a target cell has to be dragged out of the way
+    obstacles = set()
+    for _, _, cells in targets:
+        for cell_row, cell_col in cells:
+            block_id = board.get_block_id_at(cell_row, cell_col)
+            if block_id >= 0 and block_id not in used:
+                obstacles.add(block_id)
+    drags += len(obstacles)
+    
+    block_moves = [(block, target) for block, (_, target, _) in zip(assigned, targets)]
+    return block_moves, drags
+
+def find_best_word_bites_placement(word: str, board: WordBitesBoard, segmenter: WordBitesSegmenter,
+                                   axes: Tuple[bool, ...] = (True, False),
+                                   origin: Optional[Tuple[int, int]] = None,
+                                   kind_to_blocks: Optional[Dict[BlockKind, List[Block]]] = None,
+                                   first_fit: bool = False) -> Optional[WordBitesMove]:
+    """
+    Find the placement of `word` that needs the fewest drags from the current layout.
+    Args:
+        word: The word to place
+        board: The current board state
+        segmenter: Segmenter for the board's block inventory
+        axes: Axes to try, True for vertical; earlier axes win ties
+        origin: If given, only consider placements whose first letter is at this cell
+        kind_to_blocks: Precomputed group_blocks_by_kind(board), if the caller has one
+        first_fit: Settle for the first placement found (lanes reusing blocks are tried
+            first), which is much quicker but may cost extra drags
+    Returns:
+        The cheapest WordBitesMove, or None if the word can't be placed.
+    """
+    if kind_to_blocks is None:
+        kind_to_blocks = group_blocks_by_kind(board)
+    
+    best = None  # (drags, block_moves, is_vertical, origin)
+    for vertical in axes:
+        splits = segmenter.segmentations(word, vertical)
+        if not splits:
+            continue
         
-        # For each letter in the word
-        i = 0
-        while i < len(word):
-            letter = word[i]
-            # Find a block containing this letter that we haven't used yet
-            available_blocks = [b for b in letter_to_blocks.get(letter, []) 
-                              if not any(b == m[0] for m in moves)]
-            
-            if not available_blocks:
-                return None  # Can't form word - missing required letter
-                
-            # Try each available block
-            placed = False
-            for block in available_blocks:
-                target_pos = None
-                
-                # If it's a vertical block
-                if block.type == BlockType.VERTICAL:
-                    # If this is the first letter of the block
-                    if block.letters[0] == letter:
-                        # Check if we have room for the second letter and it matches
-                        if i + 1 < len(word) and block.letters[1] == word[i + 1]:
-                            target_pos = (row, col)
-                            # Check if both positions are valid
-                            if (row + 1 < board_copy.ROWS and 
-                                board_copy.is_valid_position(block, row, col)):
-                                moves.append((block, target_pos))
-                                placed = True
-                                i += 2  # Skip next letter since we used both letters
-                                row += 2  # Skip next position
-                                break
-                    # If this is the second letter of the block
-                    elif block.letters[1] == letter and i > 0 and block.letters[0] == word[i - 1]:
-                        # We can only use this if the previous letter matches and wasn't placed yet
-                        if not moves or moves[-1][0] != block:
-                            target_pos = (row - 1, col)  # Position block one space up
-                            if (row > 0 and 
-                                board_copy.is_valid_position(block, row - 1, col)):
-                                moves.append((block, target_pos))
-                                placed = True
+        lanes = board.COLS if vertical else board.ROWS
+        lane_length = board.ROWS if vertical else board.COLS
+        if origin is not None:
+            lane = origin[1] if vertical else origin[0]
+            start = origin[0] if vertical else origin[1]
+            anchored = [(lane, start)] if start + len(word) <= lane_length else []
+        else:
+            # Only lanes where some token's block already sits at its target can
+            # cost less than one drag per token, so score those first
+            anchored = []
+            for tokens in splits:
+                offset = 0
+                for kind, letter_index in tokens:
+                    for block in kind_to_blocks.get(kind, []):
+                        row, col = block.position
+                        # Shift back from the block position to the cell holding the letter
+                        if letter_index == 1 and kind[0] != SINGLE_KIND:
+                            if vertical:
+                                col += 1
+                            else:
                                 row += 1
-                                break
-                
-                # If it's a horizontal block
-                elif block.type == BlockType.HORIZONTAL:
-                    if block.letters[0] == letter:
-                        target_pos = (row, col)
-                        # Check if we have room to the right
-                        if (col + 1 < board_copy.COLS and 
-                            board_copy.is_valid_position(block, row, col)):
-                            moves.append((block, target_pos))
-                            placed = True
-                            row += 1
-                            i += 1
-                            break
-                    elif block.letters[1] == letter:
-                        target_pos = (row, col - 1)  # Place it one column left
-                        # Check if we have room to the left
-                        if (col > 0 and 
-                            board_copy.is_valid_position(block, row, col - 1)):
-                            moves.append((block, target_pos))
-                            placed = True
-                            row += 1
-                            i += 1
-                            break
-                
-                # Single block
-                else:
-                    target_pos = (row, col)
-                    if board_copy.is_valid_position(block, row, col):
-                        moves.append((block, target_pos))
-                        placed = True
-                        row += 1
-                        i += 1
-                        break
-            
-            if not placed:
-                return None  # Couldn't place a block for this letter
-            
-            if i >= len(word):
-                break
+                        lane, start = (col, row - offset) if vertical else (row, col - offset)
+                        if (0 <= lane < lanes and 0 <= start <= lane_length - len(word) and
+                                (lane, start) not in anchored):
+                            anchored.append((lane, start))
+                    offset += 2 if letter_index is None else 1
         
-        return moves if len(moves) > 0 else None
-    
-    # First, try to find words VERTICALLY (prioritized since the grid is 9 rows tall)
-    # Try forming words vertically in each column
-    for col in range(board.COLS):
-        # Try each starting position in the column
-        for start_row in range(board.ROWS):
-            # Create a copy of the board for testing moves
-            board_copy = deepcopy(board)
-            
-            # Try each valid word
-            for word in valid_words:
-                # Skip words that are too short, too long to fit, or already found
-                if (len(word) < min_length or 
-                    start_row + len(word) > board.ROWS or
-                    word in found_words):  # Skip if we already found this word
+        def try_lanes(candidates, lower_bound):
+            nonlocal best
+            for lane, start in candidates:
+                for tokens in splits:
+                    placement = place_word_bites_tokens(tokens, board, vertical, lane, start, kind_to_blocks)
+                    if placement is None:
+                        continue
+                    block_moves, drags = placement
+                    if best is None or drags < best[0]:
+                        first_cell = (start, lane) if vertical else (lane, start)
+                        best = (drags, block_moves, vertical, first_cell)
+                        if drags <= lower_bound or first_fit:
+                            return
+        
+        try_lanes(anchored, 0)
+        if best is not None and (best[0] == 0 or first_fit):
+            break
+        
+        # Any other lane costs at least one drag per token
+        if origin is None:
+            min_tokens = min(len(tokens) for tokens in splits)
+            if best is None or best[0] > min_tokens:
+                # Try the emptiest lanes first so the scan can stop early
+                others = []
+                for lane in range(lanes):
+                    cells = [board.occupancy >> (i * board.COLS + lane if vertical else lane * board.COLS + i) & 1
+                             for i in range(lane_length)]
+                    for start in range(lane_length - len(word) + 1):
+                        if (lane, start) not in anchored:
+                            others.append((sum(cells[start:start + len(word)]), lane, start))
+                others.sort()
+                try_lanes([(lane, start) for _, lane, start in others], min_tokens)
+    
+    if best is None:
+        return None
+    return WordBitesMove(word, best[1], is_vertical=best[2], origin=best[3], drags=best[0])
+
+@dataclass
+class WordBitesCrossing:
+    """Two perpendicular words laid out together, sharing the block at `cell`, so one set of drags scores both"""
+    first: WordBitesMove
+    second: WordBitesMove
+    cell: Tuple[int, int]  # (row, col) of the shared letter
+
+    @property
+    def words(self) -> Tuple[str, str]:
+        return self.first.word, self.second.word
+
+    @property
+    def score(self) -> int:
+        return self.first.score + self.second.score
+
+    @property
+    def drags(self) -> int:
+        """Estimated drags for both words from the layout `first` was placed against"""
+        return (self.first.drags or 0) + (self.second.drags or 0)
+
+    @property
+    def block_moves(self) -> List[Tuple[Block, Tuple[int, int]]]:
+        """Every block of both words at its target, the shared block once"""
+        first_ids = {block.id for block, _ in self.first.block_moves}
+        return self.first.block_moves + [(block, target) for block, target in self.second.block_moves
+                                         if block.id not in first_ids]
+
+def find_word_bites_crossings(first: WordBitesMove, words: Iterable[str], board: WordBitesBoard,
+                              segmenter: WordBitesSegmenter) -> List[WordBitesCrossing]:
+    """
+    Find words that can be laid across `first` through one of its blocks.
+    The board is laid out as if `first` had been played (blocks in the way are left out, since
+    they get parked somewhere), then each word is placed on the other axis through every
+    matching letter of `first`, without borrowing any of its other blocks.
+    Args:
+        first: A placed move (origin set), e.g. from find_best_word_bites_placement
+        words: Words to try across it
+        board: The layout `first` was placed against
+        segmenter: Segmenter for the board's block inventory
+    Returns:
+        The cheapest crossing for each word that has one.
+    """
+    if first.origin is None:
+        return []
+
+    layout = board.copy()
+    first_ids = {block.id for block, _ in first.block_moves}
+    for block, _ in first.block_moves:
+        layout.remove_block(*layout.get_block(block.id).position)
+    for block, target in first.block_moves:
+        for row, col in block.move_to(*target).get_all_positions():
+            layout.remove_block(row, col)
+    for block, target in first.block_moves:
+        layout.add_block(block.move_to(*target), combine=False)
+
+    free_blocks: Dict[BlockKind, List[Block]] = {}
+    for block in layout.blocks:
+        if block.id not in first_ids:
+            free_blocks.setdefault(get_block_kind(block), []).append(block)
+
+    vertical = not first.is_vertical
+    first_row, first_col = first.origin
+    best: Dict[str, WordBitesCrossing] = {}
+    for i, letter in enumerate(first.word):
+        cell = (first_row + i, first_col) if first.is_vertical else (first_row, first_col + i)
+        shared = layout.get_block_at(*cell)
+        kind = get_block_kind(shared)
+        kind_to_blocks = dict(free_blocks)
+        kind_to_blocks[kind] = [shared] + free_blocks.get(kind, [])
+
+        for word in words:
+            if word == first.word:
+                continue
+            for j, other_letter in enumerate(word):
+                if other_letter != letter:
                     continue
-                
-                # Try to form this word vertically
-                moves = try_form_vertical_word(word, start_row, col, board_copy)
-                if moves:
-                    # Create a WordBitesMove object
-                    move = WordBitesMove(word, moves, is_vertical=True)  # Mark as vertical
-                    found_words.add(word)
-                    yield move
-    
-    # Then, try to find words horizontally
-    # Try forming words horizontally in each row
-    for row in range(board.ROWS):
-        # Try each starting position in the row
-        for start_col in range(board.COLS):
-            # Create a copy of the board for testing moves
-            board_copy = deepcopy(board)
-            
-            # Try each valid word
-            for word in valid_words:
-                # Skip words that are too short, too long to fit, or already found
-                if (len(word) < min_length or 
-                    start_col + len(word) > board.COLS or
-                    word in found_words):  # Skip if we already found this word
+                origin = (cell[0] - j, cell[1]) if vertical else (cell[0], cell[1] - j)
+                if origin[0] < 0 or origin[1] < 0:
                     continue
-                
-                # Try to form this word horizontally
-                moves = try_form_word(word, row, start_col, board_copy)
-                if moves:
-                    # Create a WordBitesMove object
-                    move = WordBitesMove(word, moves, is_vertical=False)  # Mark as horizontal
-                    found_words.add(word)
-                    yield move
+                second = find_best_word_bites_placement(word, layout, segmenter, (vertical,), origin, kind_to_blocks)
+                if second is None or all(block.id != shared.id for block, _ in second.block_moves):
+                    continue
+                crossing = WordBitesCrossing(first, second, cell)
+                if word not in best or crossing.drags < best[word].drags:
+                    best[word] = crossing
+    return list(best.values())
+
+# Feasible-word cache shared by every search in this process, opened on first use
+_word_cache: Optional[WordBitesWordCache] = None
+
+def get_word_bites_word_cache() -> WordBitesWordCache:
+    """Get the process-wide persistent cache of feasible Word Bites words."""
+    global _word_cache
+    if _word_cache is None:
+        _word_cache = WordBitesWordCache()
+    return _word_cache
+
+def set_word_bites_word_cache(cache: Optional[WordBitesWordCache]) -> None:
+    """
+    Use `cache` for the feasible Word Bites words from now on, e.g. WordBitesWordCache(None)
+    to keep tests away from the cache file. WordBitesSearch processes open a cache at the
+    same path. None goes back to the default cache, opened on next use.
+    """
+    global _word_cache
+    _word_cache = cache
+
+def get_feasible_word_bites_words(blocks: List[Block], min_length: int = 3,
+                                  deadline: Optional[float] = None) -> Tuple[List[str], List[str]]:
+    """
+    Phase one for both axes: the words the blocks can spell vertically and horizontally.
+    Block sets seen before are answered from get_word_bites_word_cache() without searching;
+    otherwise find_feasible_word_bites_words runs on the game's word list and complete
+    results are cached. Callers flush the cache once their search is done, so the order
+    hits leave it in is saved without delaying the first moves.
+    Args:
+        blocks: The blocks on the board
+        min_length: Minimum word length to consider
+        deadline: time.perf_counter() value to stop searching at, split between the axes
+    Returns:
+        (vertical words, horizontal words), each in the order the search found them.
+    """
+    cache = get_word_bites_word_cache()
+    signature = get_block_set_signature(blocks, min_length)
+    cached = cache.get(signature)
+    if cached is not None:
+        # The hit's new place in the recency order is saved once the search is done
+        return cached
+    
+    valid_words = load_word_lists()
+    prefixes = get_prefix_set(valid_words)
+    axis_deadline = None if deadline is None else (time.perf_counter() + deadline) / 2
+    vertical_words = list(find_feasible_word_bites_words(blocks, valid_words, True, min_length, prefixes, axis_deadline))
+    # A search that ran past its deadline may have been cut short, so it isn't cached
+    complete = axis_deadline is None or time.perf_counter() < axis_deadline
+    horizontal_words = list(find_feasible_word_bites_words(blocks, valid_words, False, min_length, prefixes, deadline))
+    if complete and (deadline is None or time.perf_counter() < deadline):
+        cache.put(signature, vertical_words, horizontal_words)
+    return vertical_words, horizontal_words
+
+def find_word_bites_words(board: WordBitesBoard, min_length: int = 3, longest_first: bool = False):
+    """
+    Find all possible words that can be made in Word Bites by moving blocks around.
+    
+    The search runs in two phases:
+    1. Feasibility: find_feasible_word_bites_words decides once per word and axis whether
+       the block multiset can spell it, independent of where the blocks sit. A block set
+       seen before is answered from the persistent word cache instead.
+    2. Placement: every segmentation of the word in every lane it fits in is scored by the
+       number of drags needed from the current layout, and the cheapest is kept
+       (vertical wins ties). See place_word_bites_words.
+    Args:
+        board: The Word Bites board
+        min_length: Minimum word length to consider
+        longest_first: Place the words in descending score order, so the most valuable
+            moves are yielded before the short words have been placed
+    Yields:
+        WordBitesMove objects describing how to form each word, as they are found
+    """
+    # Phase one: position-independent feasibility, once per axis (or once per block set)
+    feasible = get_feasible_word_bites_words(board.blocks, min_length)
+    # Phase two: pick the placement that needs the fewest drags
+    yield from place_word_bites_words(board, feasible, longest_first)
+    get_word_bites_word_cache().flush()
+
+def place_word_bites_words(board: WordBitesBoard, feasible: Tuple[List[str], List[str]], longest_first: bool = False,
+                           shard: int = 0, shards: int = 1) -> Iterator[WordBitesMove]:
+    """
+    Phase two of find_word_bites_words: place each feasible word with the fewest drags.
+    Args:
+        board: The Word Bites board
+        feasible: (vertical words, horizontal words), e.g. from get_feasible_word_bites_words
+        longest_first: Place the words in descending score order
+        shard: Only place every `shards`-th word starting from this one, so several
+            processes can split the words between them with no overlap
+        shards: Number of shards the words are split into
+    Yields:
+        WordBitesMove objects for the words that could be placed
+    """
+    segmenter = get_word_bites_segmenter(board.blocks)
+    kind_to_blocks = group_blocks_by_kind(board)
+    vertical_list, horizontal_list = feasible
+    vertical_words, horizontal_words = set(vertical_list), set(horizontal_list)
+    
+    words = vertical_list + [w for w in horizontal_list if w not in vertical_words]
+    if longest_first:
+        # Stable, so vertical words still come first within a length
+        words.sort(key=len, reverse=True)
+    # Interleaved rather than contiguous, so every shard gets its share of the long words
+    for word in words[shard::shards]:
+        axes = tuple(vertical for vertical, axis_words in ((True, vertical_words), (False, horizontal_words))
+                     if word in axis_words)
+        move = find_best_word_bites_placement(word, board, segmenter, axes, kind_to_blocks=kind_to_blocks)
+        if move is not None:
+            yield move
 
 def print_word_bites_moves(moves: List[WordBitesMove]):
     """Print found Word Bites words sorted by length and alphabetically."""
@@ -659,46 +1012,168 @@ def print_word_bites_moves(moves: List[WordBitesMove]):
     print(f"\nTotal words found: {len(moves)}")
     print(f"Total possible score: {total_score}")
 
-def move_block(self, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
+# Share of solve_word_bites_words' time budget the feasibility phase may use
+FEASIBILITY_SHARE = 0.5
+
+def solve_word_bites_words(board: WordBitesBoard, time_budget: float, min_length: int = 3) -> List[WordBitesMove]:
     """
-    Move a block from one position to another.
-    Returns True if successful, False if move is invalid.
+    Anytime version of find_word_bites_words that returns within about `time_budget` seconds.
+    
+    The two phases run against a deadline, most valuable words first:
+    1. Feasibility, as in find_word_bites_words, keeping the words found if its share of
+       the budget runs out.
+    2. A rough placement of every word with first_fit, longest words first.
+    3. While time remains, each word is re-placed with the full drag minimisation, again
+       longest first, and keeps whichever placement needs fewer drags.
+    Args:
+        board: The Word Bites board
+        time_budget: Seconds the search may take
+        min_length: Minimum word length to consider
+    Returns:
+        The moves found in time, most valuable first.
     """
-    block = self.get_block_at(from_row, from_col)
-    if not block:
-        return False
-        
-    if block.position != (from_row, from_col):
-        return False
-        
-    # Remove from old positions first
-    old_positions = block.get_all_positions()
-    for old_row, old_col in old_positions:
-        self.grid[old_row][old_col] = None
-    self.blocks.remove(block)
-        
-    # Check if new position is valid
-    new_block = block.move_to(to_row, to_col)
-    new_positions = new_block.get_all_positions()
-    
-    # Verify all new positions are within bounds and empty
-    for new_row, new_col in new_positions:
-        if not (0 <= new_row < self.ROWS and 0 <= new_col < self.COLS):
-            # Restore block to original position
-            for pos_row, pos_col in old_positions:
-                self.grid[pos_row][pos_col] = block
-            self.blocks.append(block)
-            return False
-        if self.grid[new_row][new_col] is not None:
-            # Restore block to original position
-            for pos_row, pos_col in old_positions:
-                self.grid[pos_row][pos_col] = block
-            self.blocks.append(block)
-            return False
-    
-    # Add to new positions
-    for new_row, new_col in new_positions:
-        self.grid[new_row][new_col] = new_block
-    self.blocks.append(new_block)
-        
-    return True 
\ No newline at end of file
+    start = time.perf_counter()
+    deadline = start + time_budget
+    segmenter = get_word_bites_segmenter(board.blocks)
+    kind_to_blocks = group_blocks_by_kind(board)
+    
+    # Feasibility may use up to half the budget, so there is always time left to place
+    # the words it found
+    vertical_list, horizontal_list = get_feasible_word_bites_words(board.blocks, min_length,
+                                                                   start + time_budget * FEASIBILITY_SHARE)
+    vertical_words, horizontal_words = set(vertical_list), set(horizontal_list)
+    words = vertical_list + [w for w in horizontal_list if w not in vertical_words]
+    words.sort(key=len, reverse=True)
+    
+    def axes(word: str) -> Tuple[bool, ...]:
+        return tuple(vertical for vertical, feasible in ((True, vertical_words), (False, horizontal_words))
+                     if word in feasible)
+    
+    moves: List[WordBitesMove] = []
+    for word in words:
+        if time.perf_counter() > deadline:
+            break
+        move = find_best_word_bites_placement(word, board, segmenter, axes(word),
+                                              kind_to_blocks=kind_to_blocks, first_fit=True)
+        if move is not None:
+            moves.append(move)
+    
+    for i, move in enumerate(moves):
+        if time.perf_counter() > deadline:
+            break
+        if move.drags:
+            refined = find_best_word_bites_placement(move.word, board, segmenter, axes(move.word),
+                                                     kind_to_blocks=kind_to_blocks)
+            if refined is not None and refined.drags < move.drags:
+                moves[i] = refined
+    get_word_bites_word_cache().flush()
+    return moves
+
+def _run_word_bites_search(board: WordBitesBoard, min_length: int, results, shard: int = 0, shards: int = 1,
+                           feasible_words=None, cache_path: Optional[str] = WORD_BITES_CACHE_PATH) -> None:
+    """
+    Process target for WordBitesSearch: put one list of encoded moves per word length, then None.
+    Shard 0 finds the feasible words, using the word cache at `cache_path` (in memory if None),
+    and hands them to the other shards through `feasible_words`, so the word list is only
+    loaded and searched once.
+    """
+    if shard == 0:
+        set_word_bites_word_cache(WordBitesWordCache(cache_path))
+        feasible = get_feasible_word_bites_words(board.blocks, min_length)
+        for _ in range(shards - 1):
+            feasible_words.put(feasible)
+    else:
+        feasible = feasible_words.get()
+    
+    batch: List[Tuple] = []
+    for move in place_word_bites_words(board, feasible, True, shard, shards):
+        if batch and len(move.word) != len(batch[0][0]):
+            results.put(batch)
+            batch = []
+        batch.append(move.encode())
+    if batch:
+        results.put(batch)
+    results.put(None)
+    if shard == 0:
+        get_word_bites_word_cache().flush()
+
+class WordBitesSearch:
+    """
+    find_word_bites_words running longest-first in separate processes.
+    
+    Moves arrive one word length at a time, most valuable first, so the executor can start
+    on the long words while the short ones are still being placed. The search processes
+    load their own word list and never touch the screen or the mouse.
+    
+    With several processes, the feasible words are split into interleaved shards, one per
+    process, which place their words at the same time. Every word belongs to exactly one
+    shard, so merging is a matter of collecting the batches as they arrive.
+    """
+    
+    def __init__(self, board: WordBitesBoard, min_length: int = 3, processes: int = 1):
+        # Spawn rather than fork: forking a process that has used Quartz isn't safe on macOS
+        context = multiprocessing.get_context("spawn")
+        self._results = context.Queue()
+        # Kept for the life of the search: the children can't unpickle a queue the parent has dropped
+        self._feasible_words = context.Queue() if processes > 1 else None
+        # The processes open the same word cache as this one, see set_word_bites_word_cache
+        cache_path = WORD_BITES_CACHE_PATH if _word_cache is None else _word_cache.path
+        self._processes = [context.Process(target=_run_word_bites_search,
+                                           args=(board, min_length, self._results, shard, processes,
+                                                 self._feasible_words, cache_path),
+                                           daemon=True)
+                           for shard in range(processes)]
+        for process in self._processes:
+            process.start()
+        self._running = processes  # Shards that haven't sent their end marker yet
+        # Moves arrive encoded and are rebuilt against the board as it was searched
+        self._board = board.copy()
+        self.moves: List[WordBitesMove] = []  # Every move received so far, in arrival order
+        self.done = False
+    
+    def _has_failed(self) -> bool:
+        """Whether the search can't finish: every process has exited, or one has crashed."""
+        return all(process.exitcode is not None for process in self._processes) or any(
+            process.exitcode not in (None, 0) for process in self._processes)
+    
+    def poll(self, wait: bool = False) -> List[WordBitesMove]:
+        """
+        Return the moves that arrived since the last call.
+        Args:
+            wait: If nothing has arrived yet, block until the next word length is placed
+                or the search ends
+        """
+        new_moves: List[WordBitesMove] = []
+        while not self.done:
+            try:
+                batch = self._results.get(timeout=0.05) if wait and not new_moves else self._results.get_nowait()
+            except queue.Empty:
+                if self._has_failed() and self._results.empty():
+                    # The search died without finishing; play what was found
+                    self.stop()
+                if wait and not new_moves and not self.done:
+                    continue
+                break
+            if batch is None:
+                self._running -= 1
+                if not self._running:
+                    self.done = True
+                    for process in self._processes:
+                        process.join()
+            else:
+                new_moves.extend(WordBitesMove.decode(data, self._board) for data in batch)
+        self.moves.extend(new_moves)
+        return new_moves
+    
+    def __iter__(self) -> Iterator[WordBitesMove]:
+        """Yield every move, waiting for the search as needed."""
+        yield from self.moves
+        while not self.done:
+            yield from self.poll(wait=True)
+    
+    def stop(self) -> None:
+        """End the search early, e.g. when the game is over."""
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        self.done = True
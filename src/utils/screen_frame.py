@@ -0,0 +1,81 @@
+from typing import Dict
+
+import cv2
+import numpy as np
+
+# Points trimmed off every side of the window before looking at the game, except for anagrams
+WINDOW_PADDING = 20
+
+# Width over height of the iPhone screen, used to centre the anagram capture
+IPHONE_ASPECT_RATIO = 9 / 19.5
+
+def get_bgra_view(data, width: int, height: int, bytes_per_row: int) -> np.ndarray:
+    """
+    (height, width, 4) view of BGRA capture bytes, without copying them.
+    Rows are `bytes_per_row` apart, which can be more than width * 4 (CoreGraphics pads rows
+    for alignment), so the padding is stepped over rather than read as pixels.
+    Args:
+        data: Anything with the buffer interface: the CFData from CGDataProviderCopyData,
+            bytes, or a memory-mapped file
+        width, height: Size of the capture in pixels
+        bytes_per_row: Stride between rows, e.g. CGImageGetBytesPerRow
+    """
+    if bytes_per_row < width * 4:
+        raise ValueError(f"{bytes_per_row} bytes per row can't hold {width} BGRA pixels")
+    return np.ndarray((height, width, 4), np.uint8, buffer=data, strides=(bytes_per_row, 4, 1))
+
+class ScreenFrame:
+    """
+    One capture of the whole iPhone window, shared by game identification and board extraction.
+
+    The pixels are kept as a BGR array; get_region hands out views of the part each game
+    version looks at, so the window is captured and converted once per game instead of once
+    per step.
+    """
+
+    def __init__(self, image: np.ndarray, window_bounds: Dict[str, float]):
+        """
+        Args:
+            image: BGR pixels of the window, (height, width, 3)
+            window_bounds: The window's x, y, width and height in screen points, as from
+                find_iphone_window; the image may have more pixels per point (Retina)
+        """
+        self.image = image
+        self.window_bounds = window_bounds
+
+    @classmethod
+    def from_buffer(cls, data, width: int, height: int, bytes_per_row: int,
+                    window_bounds: Dict[str, float]) -> 'ScreenFrame':
+        """
+        Frame from BGRA capture bytes (see get_bgra_view). Dropping the alpha channel is the
+        one copy made, and leaves a contiguous BGR image that OpenCV reads, or converts to HSV,
+        as it is.
+        """
+        image = cv2.cvtColor(get_bgra_view(data, width, height, bytes_per_row), cv2.COLOR_BGRA2BGR)
+        return cls(image, window_bounds)
+
+    @classmethod
+    def from_raw_file(cls, path: str, width: int, height: int, bytes_per_row: int,
+                      window_bounds: Dict[str, float]) -> 'ScreenFrame':
+        """Frame from a file holding the raw BGRA bytes of a capture, memory-mapped rather than read."""
+        return cls.from_buffer(np.memmap(path, np.uint8, mode='r'), width, height, bytes_per_row, window_bounds)
+
+    def crop(self, x: float, y: float, width: float, height: float) -> np.ndarray:
+        """View of the window region at (x, y) of the given size, all in points from the window's corner."""
+        scale_x = self.image.shape[1] / self.window_bounds['width']
+        scale_y = self.image.shape[0] / self.window_bounds['height']
+        left, top = int(round(x * scale_x)), int(round(y * scale_y))
+        right, bottom = int(round((x + width) * scale_x)), int(round((y + height) * scale_y))
+        return self.image[max(top, 0):bottom, max(left, 0):right]
+
+    def get_region(self, game_version: str = "4x4") -> np.ndarray:
+        """
+        View of the part of the window a game version is read from: the window less
+        WINDOW_PADDING on every side, or for anagrams a full-height strip in the middle with
+        the iPhone's aspect ratio.
+        """
+        width, height = int(self.window_bounds['width']), int(self.window_bounds['height'])
+        if game_version.startswith("ANAGRAM"):
+            target_width = int(height * IPHONE_ASPECT_RATIO)
+            return self.crop((width - target_width) // 2, 0, target_width, height)
+        return self.crop(WINDOW_PADDING, WINDOW_PADDING, width - 2 * WINDOW_PADDING, height - 2 * WINDOW_PADDING)
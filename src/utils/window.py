@@ -1,5 +1,6 @@
 import Quartz
 from src.config.config import IPHONE_WINDOW_KEYWORDS
+from src.utils.screen_frame import ScreenFrame
 
 # Cache for window bounds
 _window_cache = None
@@ -51,4 +52,33 @@ def find_iphone_window(force_refresh=False):
     if force_refresh:
         print("No iPhone window found")
     _window_cache = None
-    return None 
\ No newline at end of file
+    return None 
+
+
+def capture_frame(window_bounds=None):
+    """
+    Capture the whole iPhone window once, as a ScreenFrame that identification and board
+    extraction can both read from. Returns None if there is no window or the capture fails.
+    """
+    if window_bounds is None:
+        window_bounds = find_iphone_window()
+    if not window_bounds:
+        return None
+    
+    region = Quartz.CGRectMake(int(window_bounds['x']), int(window_bounds['y']),
+                               int(window_bounds['width']), int(window_bounds['height']))
+    image = Quartz.CGWindowListCreateImage(
+        region,
+        Quartz.kCGWindowListOptionOnScreenOnly,
+        Quartz.kCGNullWindowID,
+        Quartz.kCGWindowImageDefault
+    )
+    if image is None:
+        return None
+    
+    # The capture is BGRA with padded rows; read it in place and convert to BGR once
+    width = Quartz.CGImageGetWidth(image)
+    height = Quartz.CGImageGetHeight(image)
+    bytesperrow = Quartz.CGImageGetBytesPerRow(image)
+    pixeldata = Quartz.CGDataProviderCopyData(Quartz.CGImageGetDataProvider(image))
+    return ScreenFrame.from_buffer(pixeldata, width, height, bytesperrow, window_bounds)
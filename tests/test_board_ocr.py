@@ -0,0 +1,138 @@
+import sys
+import os
+import string
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game.board_ocr import read_cells, get_ink_box
+from src.game.glyph_templates import GlyphTemplates
+from src.game.cell_ocr_cache import CellOcrCache
+
+class ScriptedReader:
+    """Stands in for easyocr.Reader: each recognize call answers the next round of the script, in reverse order"""
+
+    def __init__(self, rounds):
+        self.rounds = rounds
+        self.calls = []
+
+    def recognize(self, image, horizontal_list, free_list, allowlist, batch_size, detail):
+        self.calls.append((image.shape, list(horizontal_list), batch_size))
+        answers = self.rounds[len(self.calls) - 1]
+        results = [([[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]], text, confidence)
+                   for (x_min, x_max, y_min, y_max), (text, confidence) in zip(horizontal_list, answers)]
+        return results[::-1]
+
+def make_cell(width=70, height=60):
+    """Cream tile with a dark bar for a letter"""
+    cell = np.full((height, width, 3), (200, 235, 245), np.uint8)
+    cell[15:45, 30:40] = (40, 40, 40)
+    return cell
+
+def make_letter_cell(letter, shift=0, width=70, height=60):
+    """Cream tile with a dark letter, optionally nudged sideways"""
+    cell = np.full((height, width, 3), (200, 235, 245), np.uint8)
+    cv2.putText(cell, letter, (20 + shift, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.3, (40, 40, 40), 3)
+    return cell
+
+class FailingReader:
+    """Stands in for easyocr.Reader where every cell should be read by template"""
+
+    def recognize(self, *args, **kwargs):
+        raise AssertionError("OCR was called for a cell the templates should have read")
+
+def test_cells_are_read_in_batches():
+    """One recognition call per threshold, over only the cells not yet read confidently"""
+    reader = ScriptedReader([
+        [("A", 0.95), ("b", 0.5), ("", 0.0)],
+        [("B", 0.9), ("", 0.0)],
+        [("", 0.0)],
+    ])
+    readings = read_cells(reader, [make_cell(), make_cell(), make_cell()], [(0, 0), (0, 1), (2, 3)])
+    assert readings == [("A", 0.95), ("B", 0.9), ("I", 0.0)]
+    assert [len(boxes) for _, boxes, _ in reader.calls] == [3, 2, 1]
+    for shape, boxes, batch_size in reader.calls:
+        assert batch_size == len(boxes)
+        assert shape[0] == len(boxes) * shape[1]  # Cells stacked as square tiles
+        for i, (x_min, x_max, y_min, y_max) in enumerate(boxes):
+            assert x_max - x_min == y_max - y_min
+            assert i * shape[1] <= y_min < y_max <= (i + 1) * shape[1]
+
+def test_ink_box_is_square_around_the_letter():
+    """A narrow letter gets a square box around it, so it isn't read as vertical text"""
+    binary = np.zeros((240, 240), np.uint8)
+    binary[60:180, 110:130] = 255
+    x_min, x_max, y_min, y_max = get_ink_box(binary)
+    assert x_max - x_min == y_max - y_min
+    assert x_min <= 110 and x_max >= 130 and y_min <= 60 and y_max >= 180
+    assert get_ink_box(np.zeros((240, 240), np.uint8)) == (0, 240, 0, 240)
+
+def test_templates_learned_from_ocr_read_later_boards():
+    """Confident OCR readings become templates that read the same font without OCR, and are kept on disk"""
+    letters = string.ascii_uppercase
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "glyphs.npz")
+        templates = GlyphTemplates(path)
+        reader = ScriptedReader([[(letter, 0.95) for letter in letters]])
+        readings = read_cells(reader, [make_letter_cell(letter) for letter in letters], templates=templates)
+        assert [letter for letter, _ in readings] == list(letters)
+        assert templates.letters == list(letters)
+
+        # Same font, slightly moved: every cell is matched without calling OCR
+        reloaded = GlyphTemplates(path)
+        assert len(reloaded) == len(templates)
+        cells = [make_letter_cell(letter, shift=3) for letter in letters]
+        start = time.perf_counter()
+        readings = read_cells(FailingReader(), cells, templates=reloaded)
+        print(f"Read {len(cells)} cells by template in {(time.perf_counter() - start) * 1000:.1f}ms")
+        assert [letter for letter, _ in readings] == list(letters)
+        assert all(confidence >= 0.85 for _, confidence in readings)
+
+def test_unmatched_cells_fall_back_to_ocr():
+    """A letter without a template goes to OCR, and only that one"""
+    templates = GlyphTemplates(None)
+    read_cells(ScriptedReader([[("A", 0.95)]]), [make_letter_cell("A")], templates=templates)
+    reader = ScriptedReader([[("Q", 0.9)]])
+    readings = read_cells(reader, [make_letter_cell("A"), make_letter_cell("Q")], templates=templates)
+    assert readings[0][0] == "A" and readings[1] == ("Q", 0.9)
+    assert [len(boxes) for _, boxes, _ in reader.calls] == [1]
+    assert templates.letters == ["A", "Q"]
+
+def test_cache_answers_cells_seen_before():
+    """Confident readings are cached by cell image and kept on disk; unsure ones are read again next time"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cells.json")
+        cache = CellOcrCache(path)
+        reader = ScriptedReader([[("C", 0.95), ("D", 0.5)], [("D", 0.6)], [("D", 0.7)]])
+        read_cells(reader, [make_letter_cell("C"), make_letter_cell("D")], cache=cache)
+        assert len(cache) == 1 and (cache.hits, cache.misses) == (0, 2)
+
+        reloaded = CellOcrCache(path)
+        reader = ScriptedReader([[("D", 0.95)]])
+        readings = read_cells(reader, [make_letter_cell("C"), make_letter_cell("D")], cache=reloaded)
+        assert readings == [("C", 0.95), ("D", 0.95)]
+        assert [len(boxes) for _, boxes, _ in reader.calls] == [1]
+        assert (reloaded.hits, reloaded.misses) == (1, 1) and len(reloaded) == 2
+
+def test_cache_evicts_least_recently_used():
+    """A full cache drops the cell looked up longest ago"""
+    cache = CellOcrCache(None, max_entries=2)
+    assert cache.put("a", "A", 0.95) and cache.put("b", "B", 0.95)
+    assert not cache.put("c", "C", 0.5)
+    assert cache.get("a") == ("A", 0.95)
+    cache.put("c", "C", 0.99)
+    assert cache.get("b") is None and cache.get("a") and cache.get("c")
+
+if __name__ == "__main__":
+    test_cells_are_read_in_batches()
+    test_ink_box_is_square_around_the_letter()
+    test_templates_learned_from_ocr_read_later_boards()
+    test_unmatched_cells_fall_back_to_ocr()
+    test_cache_answers_cells_seen_before()
+    test_cache_evicts_least_recently_used()
+    print("All OCR tests passed")
@@ -0,0 +1,88 @@
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.screen_frame import ScreenFrame, WINDOW_PADDING, get_bgra_view
+
+def make_capture_bytes(width, height, bytes_per_row):
+    """BGRA bytes with padded rows, as CoreGraphics hands them over: pixel (y, x) is (x, y, 7, 255), padding 99"""
+    rows = np.full((height, bytes_per_row), 99, np.uint8)
+    pixels = rows[:, :width * 4].reshape(height, width, 4)
+    pixels[:, :, 0] = np.arange(width)[None, :]
+    pixels[:, :, 1] = np.arange(height)[:, None]
+    pixels[:, :, 2] = 7
+    pixels[:, :, 3] = 255
+    return rows.tobytes()
+
+def make_frame(scale=1):
+    """A 390x844 point window, `scale` pixels per point, each pixel holding its own coordinates"""
+    height, width = 844 * scale, 390 * scale
+    image = np.zeros((height, width, 3), np.uint16)
+    image[:, :, 0] = np.arange(height)[:, None]
+    image[:, :, 1] = np.arange(width)[None, :]
+    return ScreenFrame(image, {'x': 100, 'y': 50, 'width': 390, 'height': 844})
+
+def test_regions_are_views_of_one_capture():
+    """Identification and every game version read views of the same pixels, without copying"""
+    frame = make_frame()
+    padded = frame.get_region()
+    assert padded.shape[:2] == (844 - 2 * WINDOW_PADDING, 390 - 2 * WINDOW_PADDING)
+    assert tuple(padded[0, 0, :2]) == (WINDOW_PADDING, WINDOW_PADDING)
+    assert np.shares_memory(padded, frame.image)
+    assert np.shares_memory(frame.get_region("WORD_BITES"), frame.image)
+
+    anagram = frame.get_region("ANAGRAM7")
+    assert anagram.shape[0] == 844 and anagram.shape[1] == int(844 * 9 / 19.5)
+    assert tuple(anagram[0, 0, :2]) == (0, (390 - int(844 * 9 / 19.5)) // 2)
+
+def test_regions_scale_with_retina_captures():
+    """A capture with two pixels per point is cropped to the same part of the window"""
+    region = make_frame(scale=2).get_region()
+    assert region.shape[:2] == (2 * (844 - 2 * WINDOW_PADDING), 2 * (390 - 2 * WINDOW_PADDING))
+    assert tuple(region[0, 0, :2]) == (2 * WINDOW_PADDING, 2 * WINDOW_PADDING)
+
+def test_capture_bytes_are_read_in_place_with_their_stride():
+    """Row padding is stepped over, the view shares the capture's memory, and BGR drops only the alpha"""
+    width, height, bytes_per_row = 30, 20, 30 * 4 + 24
+    data = make_capture_bytes(width, height, bytes_per_row)
+    view = get_bgra_view(data, width, height, bytes_per_row)
+    assert view.shape == (height, width, 4) and not view.flags.writeable
+    assert np.shares_memory(view, np.frombuffer(data, np.uint8))
+    assert tuple(view[5, 29]) == (29, 5, 7, 255)
+
+    frame = ScreenFrame.from_buffer(data, width, height, bytes_per_row, {'x': 0, 'y': 0, 'width': 15, 'height': 10})
+    assert frame.image.shape == (height, width, 3) and frame.image.flags.c_contiguous
+    assert tuple(frame.image[19, 29]) == (29, 19, 7)
+    assert not (frame.image == 99).all(axis=2).any()
+
+    try:
+        get_bgra_view(data, width, height, width * 4 - 4)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("A stride shorter than a row was accepted")
+
+def test_frames_load_from_raw_files():
+    """A capture saved as raw bytes is memory-mapped and read the same as a live one"""
+    width, height, bytes_per_row = 40, 25, 40 * 4 + 64
+    data = make_capture_bytes(width, height, bytes_per_row)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "capture.bgra")
+        with open(path, 'wb') as f:
+            f.write(data)
+        bounds = {'x': 0, 'y': 0, 'width': width, 'height': height}
+        frame = ScreenFrame.from_raw_file(path, width, height, bytes_per_row, bounds)
+        live = ScreenFrame.from_buffer(data, width, height, bytes_per_row, bounds)
+        assert np.array_equal(frame.image, live.image)
+
+if __name__ == "__main__":
+    test_regions_are_views_of_one_capture()
+    test_regions_scale_with_retina_captures()
+    test_capture_bytes_are_read_in_place_with_their_stride()
+    test_frames_load_from_raw_files()
+    print("All screen frame tests passed")
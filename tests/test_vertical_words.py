@@ -6,6 +6,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.game.word_finder import WordBitesMove, find_word_bites_words
 from src.game.word_bites_board import WordBitesBoard, Block, BlockType
+from tests.word_bites_fixtures import use_memory_word_cache
+
+use_memory_word_cache()
 
 def test_vertical_word_finding():
     """Test that the bot can find vertical words (top to bottom)"""
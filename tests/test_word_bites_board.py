@@ -0,0 +1,160 @@
+import sys
+import os
+import pickle
+from copy import deepcopy
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game.word_bites_board import WordBitesBoard, Block, BlockType
+
+def make_board():
+    """Create a small board with one block of each type"""
+    board = WordBitesBoard()
+    board.add_block(Block(BlockType.SINGLE, ["A"], (0, 0)), combine=False)
+    board.add_block(Block(BlockType.HORIZONTAL, ["B", "C"], (2, 2)), combine=False)
+    board.add_block(Block(BlockType.VERTICAL, ["D", "E"], (4, 5)), combine=False)
+    return board
+
+def test_copy_is_independent():
+    """Moving a block on a copy leaves the original untouched"""
+    board = make_board()
+    branch = board.copy()
+
+    assert branch.move_block(2, 2, 7, 0)
+    assert board.get_block_at(2, 2).letters == ("B", "C")
+    assert board.get_block_at(7, 0) is None
+    assert branch.get_block_at(7, 1).letters == ("B", "C")
+    assert str(board) != str(branch)
+
+def test_deepcopy_uses_cheap_copy():
+    """deepcopy goes through copy(), which shares the letter and kind indexes until a board adds or removes a block"""
+    board = make_board()
+    branch = deepcopy(board)
+    assert str(branch) == str(board)
+    assert branch.kind_to_ids is board.kind_to_ids and branch.letter_to_ids is board.letter_to_ids
+
+    assert branch.move_block(2, 2, 7, 0)
+    assert branch.kind_to_ids is board.kind_to_ids  # Moves leave the indexes alone
+
+    assert branch.remove_block(7, 0)
+    assert branch.kind_to_ids is not board.kind_to_ids
+    assert branch.get_block_ids_by_kind(("B", "C"), BlockType.HORIZONTAL) == set()
+    assert len(board.get_block_ids_by_kind(("B", "C"), BlockType.HORIZONTAL)) == 1
+    assert [block.letters for block in board.get_blocks_by_letter("B")] == [("B", "C")]
+
+def test_occupancy_bitboard():
+    """The occupancy bits track every cell covered by a block"""
+    board = make_board()
+    covered = {(0, 0), (2, 2), (2, 3), (4, 5), (5, 5)}
+    for row in range(board.ROWS):
+        for col in range(board.COLS):
+            bit = board.occupancy >> (row * board.COLS + col) & 1
+            assert bit == ((row, col) in covered)
+
+    # A vertical block can't hang off the bottom or overlap another block
+    vertical = Block(BlockType.VERTICAL, ["X", "Y"], (0, 0))
+    assert not board.is_valid_position(vertical, 8, 0)
+    assert not board.is_valid_position(vertical, 1, 2)
+    assert board.is_valid_position(vertical, 1, 1)
+
+def test_move_block_respects_occupancy():
+    """A block may move onto its own cells but not onto another block"""
+    board = make_board()
+    assert not board.move_block(2, 2, 4, 4)  # would cover the vertical block
+    assert board.move_block(2, 2, 2, 3)      # overlaps only itself
+    assert board.get_block_at(2, 2) is None
+    assert board.get_block_at(2, 4).letters == ("B", "C")
+    assert len(board.blocks) == 3
+
+def test_add_blocks_combines_once():
+    """Bulk construction combines neighbours the same way as adding one at a time"""
+    cells = [((0, 0), "S"), ((0, 1), "T"), ((2, 0), "A"), ((3, 0), "B"),
+             ((2, 2), "C"), ((2, 3), "D"), ((4, 4), "E")]
+    blocks = [Block(BlockType.SINGLE, [letter], pos) for pos, letter in cells]
+
+    one_by_one = WordBitesBoard()
+    for block in blocks:
+        one_by_one.add_block(block)
+    bulk = WordBitesBoard()
+    assert bulk.add_blocks(blocks) == len(blocks)
+
+    print(bulk)
+    assert str(bulk) == str(one_by_one)
+    assert {(b.type, b.letters) for b in bulk.blocks} == {
+        (BlockType.HORIZONTAL, ("S", "T")),
+        (BlockType.VERTICAL, ("A", "B")),
+        (BlockType.HORIZONTAL, ("C", "D")),
+        (BlockType.SINGLE, ("E",)),
+    }
+
+def test_indexes_follow_moves():
+    """Letter, kind and position indexes are updated in place by moves and removals"""
+    board = make_board()
+    block_id = board.position_to_id[(2, 2)]
+    assert board.get_block_ids_by_kind(("B", "C"), BlockType.HORIZONTAL) == {block_id}
+    assert board.get_block_ids_by_kind(("C", "B"), BlockType.HORIZONTAL) == set()
+    assert isinstance(board.get_block_ids_by_kind(("B", "C"), BlockType.HORIZONTAL), frozenset)  # Not the index itself
+
+    assert board.move_block(2, 2, 6, 0)
+    assert (2, 2) not in board.position_to_id
+    assert board.position_to_id[(6, 0)] == block_id
+    assert board.get_block_id_at(6, 1) == block_id
+    assert [block.position for block in board.get_blocks_by_letter("C")] == [(6, 0)]
+
+    assert board.remove_block(6, 1)
+    assert board.get_blocks_by_letter("B") == []
+    assert board.get_block_ids_by_kind(("B", "C"), BlockType.HORIZONTAL) == set()
+    assert board.get_block(block_id) is None
+
+def test_block_ids_are_stable():
+    """A block keeps its id through moves, copies and pickling"""
+    board = make_board()
+    assert [block.id for block in board.blocks] == [0, 1, 2]
+
+    block = board.get_block_at(2, 2)
+    assert board.move_block(2, 2, 6, 0)
+    assert board.move_block(6, 0, 7, 3)
+    moved = board.get_block(block.id)
+    assert moved.position == (7, 3) and moved.id == block.id
+    assert board.copy().get_block(block.id) == moved
+    assert pickle.loads(pickle.dumps(moved)).id == block.id
+
+    # A new block gets a fresh id, even if it claims one that is already taken
+    assert board.add_block(Block(BlockType.SINGLE, ["Z"], (8, 7)).with_id(block.id), combine=False)
+    assert board.get_block_at(8, 7).id == 3
+
+def test_blocks_are_immutable_values():
+    """Blocks compare by value, can't be changed, and moving one keeps its letters and id"""
+    block = Block(BlockType.HORIZONTAL, ["S", "T"], (3, 3)).with_id(5)
+    moved = block.move_to(4, 0)
+    assert moved.letters == ("S", "T") and moved.position == (4, 0) and moved.id == 5
+    assert block.position == (3, 3)
+    assert moved == Block(BlockType.HORIZONTAL, ("S", "T"), (4, 0))
+    assert hash(moved) == hash(Block(BlockType.HORIZONTAL, ("S", "T"), (4, 0)))
+    assert repr(moved) == "Block(type=<BlockType.HORIZONTAL: 'horizontal'>, letters=('S', 'T'), position=(4, 0))"
+
+    for name in ("position", "id"):
+        try:
+            setattr(block, name, None)
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError(f"Block.{name} could be assigned")
+    try:
+        Block(BlockType.VERTICAL, ["S"], (0, 0))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("A one-letter vertical block was accepted")
+
+if __name__ == "__main__":
+    test_copy_is_independent()
+    test_deepcopy_uses_cheap_copy()
+    test_occupancy_bitboard()
+    test_move_block_respects_occupancy()
+    test_add_blocks_combines_once()
+    test_indexes_follow_moves()
+    test_block_ids_are_stable()
+    test_blocks_are_immutable_values()
+    print("All board tests passed")
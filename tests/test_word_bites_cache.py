@@ -0,0 +1,73 @@
+import sys
+import os
+import tempfile
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game.word_bites_board import Block, BlockType
+from src.game.word_bites_cache import WordBitesWordCache, get_block_set_signature
+
+def test_signature_ignores_positions_and_order():
+    """The signature only depends on the block multiset"""
+    blocks = [Block(BlockType.SINGLE, ["A"], (0, 0)), Block(BlockType.HORIZONTAL, ["S", "T"], (3, 3))]
+    moved = [Block(BlockType.HORIZONTAL, ["S", "T"], (8, 0)), Block(BlockType.SINGLE, ["A"], (5, 7))]
+    assert get_block_set_signature(blocks) == get_block_set_signature(moved)
+
+    # Orientation and multiplicity matter
+    vertical = [Block(BlockType.SINGLE, ["A"], (0, 0)), Block(BlockType.VERTICAL, ["S", "T"], (3, 3))]
+    assert get_block_set_signature(blocks) != get_block_set_signature(vertical)
+    assert get_block_set_signature(blocks) != get_block_set_signature(blocks + blocks[:1])
+
+def test_cache_persists_and_evicts_least_recently_used():
+    """Entries survive a reload, and the least recently used set is dropped first"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "words.json")
+        cache = WordBitesWordCache(path, max_entries=2)
+        cache.put("a", ["CAT"], ["ACT"])
+        cache.put("b", ["DOG"], [])
+        assert cache.get("a") == (["CAT"], ["ACT"])  # "b" is now the least recently used
+        cache.put("c", [], ["EMU"])
+
+        reloaded = WordBitesWordCache(path, max_entries=2)
+        print(f"Hits: {cache.hits}, misses: {cache.misses}, entries: {len(reloaded)}")
+        assert reloaded.get("b") is None
+        assert reloaded.get("a") == (["CAT"], ["ACT"])
+        assert reloaded.get("c") == ([], ["EMU"])
+
+        # A damaged file just starts an empty cache
+        with open(path, "w") as f:
+            f.write("{not json")
+        assert len(WordBitesWordCache(path)) == 0
+
+def test_lookups_keep_their_order_across_reloads():
+    """A run that only hits the cache still saves the recency order, so eviction stays LRU after a restart"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "words.json")
+        cache = WordBitesWordCache(path, max_entries=2)
+        cache.put("a", ["CAT"], [])
+        cache.put("b", ["DOG"], [])
+
+        hit_only = WordBitesWordCache(path, max_entries=2)
+        with open(path) as f:
+            saved = f.read()
+        assert hit_only.get("a") == (["CAT"], [])
+        with open(path) as f:
+            assert f.read() == saved  # Lookups alone don't write the file...
+        hit_only.flush()  # ...until the search is done
+
+        reloaded = WordBitesWordCache(path, max_entries=2)
+        reloaded.put("c", [], ["EMU"])
+        assert reloaded.get("b") is None and reloaded.get("a") == (["CAT"], [])
+
+    # Without a path nothing is written anywhere
+    in_memory = WordBitesWordCache(None)
+    in_memory.put("a", ["CAT"], [])
+    in_memory.flush()
+    assert in_memory.get("a") == (["CAT"], [])
+
+if __name__ == "__main__":
+    test_signature_ignores_positions_and_order()
+    test_cache_persists_and_evicts_least_recently_used()
+    test_lookups_keep_their_order_across_reloads()
+    print("All cache tests passed")
@@ -0,0 +1,128 @@
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game.word_finder import (find_word_bites_words, find_feasible_word_bites_words, WordBitesSearch,
+                                  solve_word_bites_words, WordBitesMove, get_word_bites_score)
+from src.game.word_bites_board import WordBitesBoard, Block, BlockType
+from tests.word_bites_fixtures import use_memory_word_cache, make_search_board
+
+use_memory_word_cache()
+
+def count_drags(move):
+    """Count the blocks in a move that aren't already at their target position"""
+    return sum(1 for block, target in move.block_moves if block.position != target)
+
+def test_word_in_place_needs_no_drags():
+    """A word already spelled on the board should be placed where it is"""
+    board = WordBitesBoard()
+    board.add_block(Block(BlockType.VERTICAL, ["T", "E"], (4, 5)), combine=False)
+    board.add_block(Block(BlockType.VERTICAL, ["S", "T"], (6, 5)), combine=False)
+    board.add_block(Block(BlockType.SINGLE, ["A"], (0, 0)), combine=False)
+
+    moves = {move.word: move for move in find_word_bites_words(board)}
+    print(f"Found words: {sorted(moves)}")
+
+    assert "TEST" in moves
+    assert moves["TEST"].is_vertical
+    assert count_drags(moves["TEST"]) == 0
+
+def test_crossing_pair_block_is_feasible():
+    """A horizontal pair can give a single letter to a vertical word"""
+    blocks = [
+        Block(BlockType.SINGLE, ["C"], (0, 0)),
+        Block(BlockType.HORIZONTAL, ["A", "B"], (8, 0)),
+        Block(BlockType.SINGLE, ["T"], (5, 5)),
+    ]
+    feasible = find_feasible_word_bites_words(blocks, {"CAT", "CABT"}, vertical=True)
+    print(f"Feasible vertical words: {feasible}")
+
+    assert "CAT" in feasible
+    assert "CABT" not in feasible
+
+def test_placement_minimises_drags():
+    """The cheapest lane reuses blocks that are already lined up"""
+    board = WordBitesBoard()
+    board.add_block(Block(BlockType.SINGLE, ["C"], (2, 1)), combine=False)
+    board.add_block(Block(BlockType.SINGLE, ["A"], (2, 3)), combine=False)
+    board.add_block(Block(BlockType.SINGLE, ["T"], (7, 6)), combine=False)
+
+    moves = {move.word: move for move in find_word_bites_words(board)}
+
+    # C at (2,1) is already in place for "CAT" across row 2 starting at column 1,
+    # but A needs to shift left, and T has to come over: 2 drags
+    assert count_drags(moves["CAT"]) == 2
+
+def test_search_streams_longest_first():
+    """The search process delivers the same moves as the in-process search, longest words first"""
+    board = make_search_board()
+
+    search = WordBitesSearch(board)
+    first_batch = search.poll(wait=True)
+    streamed = list(search)
+    print(f"First batch: {[move.word for move in first_batch]}")
+
+    lengths = [len(move.word) for move in streamed]
+    assert lengths == sorted(lengths, reverse=True)
+    assert first_batch == streamed[:len(first_batch)]
+    assert len(first_batch[0].word) == lengths[0]
+    assert sorted(move.word for move in streamed) == sorted(move.word for move in find_word_bites_words(board))
+    assert search.done
+
+def test_sharded_search_matches_single_search():
+    """Several search processes split the words between them and together find the same moves as one"""
+    board = make_search_board()
+
+    search = WordBitesSearch(board, processes=3)
+    streamed = list(search)
+    expected = list(find_word_bites_words(board))
+    assert search.done and len(streamed) == len(expected)
+    assert sorted(streamed, key=lambda move: move.word) == sorted(expected, key=lambda move: move.word)
+
+def test_solver_respects_time_budget():
+    """With time to spare the anytime solver matches the full search; out of time it stops, longest words first"""
+    board = make_search_board()
+
+    full = {move.word: move.drags for move in find_word_bites_words(board)}
+    solved = solve_word_bites_words(board, time_budget=60)
+    assert {move.word: move.drags for move in solved} == full
+    lengths = [len(move.word) for move in solved]
+    assert lengths == sorted(lengths, reverse=True)
+
+    # A cold cache, so the rushed feasibility search is cut short too
+    use_memory_word_cache()
+    rushed = solve_word_bites_words(board, time_budget=0)
+    assert len(rushed) < len(full)
+    assert all(move.word in full for move in rushed)
+    lengths = [len(move.word) for move in rushed]
+    assert lengths == sorted(lengths, reverse=True)
+
+def test_moves_encode_compactly():
+    """A move survives encoding to block ids and target cells, and scores from the length table"""
+    board = WordBitesBoard()
+    board.add_block(Block(BlockType.VERTICAL, ["T", "E"], (4, 5)), combine=False)
+    board.add_block(Block(BlockType.SINGLE, ["S"], (0, 0)), combine=False)
+    board.add_block(Block(BlockType.SINGLE, ["T"], (8, 7)), combine=False)
+
+    moves = list(find_word_bites_words(board))
+    assert moves
+    for move in moves:
+        data = move.encode()
+        assert all(isinstance(value, int) for value in data[4])
+        assert WordBitesMove.decode(data, board) == move
+        assert move.score == get_word_bites_score(len(move.word))
+
+    assert get_word_bites_score(3) == 100 and get_word_bites_score(9) == 2600
+    assert WordBitesMove("", [], 0).score < 0  # The heap's end marker sorts after every real move
+
+if __name__ == "__main__":
+    test_word_in_place_needs_no_drags()
+    test_crossing_pair_block_is_feasible()
+    test_placement_minimises_drags()
+    test_search_streams_longest_first()
+    test_sharded_search_matches_single_search()
+    test_solver_respects_time_budget()
+    test_moves_encode_compactly()
+    print("All placement tests passed")
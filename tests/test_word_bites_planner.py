@@ -0,0 +1,73 @@
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game.word_bites_board import WordBitesBoard, Block, BlockType
+from src.game.word_bites_planner import plan_word_bites_drags, plan_word_bites_staging
+
+def apply_drags(board, drags):
+    """Apply planned drags to a copy of the board"""
+    result = board.copy()
+    for block_id, target in drags:
+        assert result.move_block(*result.get_block(block_id).position, *target)
+    return result
+
+def test_swapped_blocks_need_one_parking_drag():
+    """Two blocks sitting on each other's targets take three drags, planned up front"""
+    board = WordBitesBoard()
+    board.add_block(Block(BlockType.SINGLE, ["B"], (0, 0)), combine=False)
+    board.add_block(Block(BlockType.SINGLE, ["A"], (0, 1)), combine=False)
+    block_b, block_a = board.blocks
+    layout = str(board)
+
+    drags = plan_word_bites_drags(board, [(block_a, (0, 0)), (block_b, (0, 1))])
+    print(drags)
+    assert len(drags) == 3
+    assert str(board) == layout  # planning doesn't touch the board
+
+    result = apply_drags(board, drags)
+    assert result.get_block_at(0, 0).letters == ("A",)
+    assert result.get_block_at(0, 1).letters == ("B",)
+
+def test_parking_avoids_upcoming_words():
+    """A block in the way is parked off the cells reserved for upcoming words"""
+    board = WordBitesBoard()
+    board.add_block(Block(BlockType.SINGLE, ["X"], (0, 0)), combine=False)
+    board.add_block(Block(BlockType.SINGLE, ["A"], (5, 5)), combine=False)
+    block_x, block_a = board.blocks
+
+    # Reserve the cells next to (0, 0) that would otherwise be the closest parking spots
+    reserved = 0
+    for row, col in [(0, 1), (1, 0), (1, 1), (0, 2), (2, 0)]:
+        reserved |= board.footprint_mask(BlockType.SINGLE, row, col)
+
+    drags = plan_word_bites_drags(board, [(block_a, (0, 0))], reserved)
+    print(drags)
+    assert len(drags) == 2
+    parked = dict(drags)[block_x.id]
+    assert not board.footprint_mask(BlockType.SINGLE, *parked) & reserved
+    assert apply_drags(board, drags).get_block_at(0, 0).id == block_a.id
+
+def test_staging_packs_blocks_along_one_side():
+    """Staging clears the top of the board, leaving blocks already in the staging rows alone"""
+    board = WordBitesBoard()
+    board.add_block(Block(BlockType.VERTICAL, ["R", "E"], (0, 3)), combine=False)
+    board.add_block(Block(BlockType.HORIZONTAL, ["S", "T"], (4, 2)), combine=False)
+    board.add_block(Block(BlockType.SINGLE, ["A"], (2, 6)), combine=False)
+    board.add_block(Block(BlockType.SINGLE, ["D"], (8, 0)), combine=False)
+
+    drags = plan_word_bites_staging(board, "bottom")
+    result = apply_drags(board, drags)
+    print(result)
+    assert len(drags) == 3  # D is already in the bottom row
+    assert result.get_block_at(8, 0).letters == ("D",)
+    assert all(block.position[0] >= board.ROWS - 2 for block in result.blocks)
+    assert len(result.blocks) == len(board.blocks)
+
+if __name__ == "__main__":
+    test_swapped_blocks_need_one_parking_drag()
+    test_parking_avoids_upcoming_words()
+    test_staging_packs_blocks_along_one_side()
+    print("All planner tests passed")
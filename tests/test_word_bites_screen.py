@@ -0,0 +1,72 @@
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game.word_bites_board import WordBitesBoard, Block, BlockType
+from src.game.word_bites_screen import get_occupied_cells, resync_word_bites_board, WordBitesDragLog, drag_screen_tile
+
+def make_board_image(cells, cell_size=60):
+    """Blue board image with a cream tile drawn on each of the given cells"""
+    image = np.zeros((WordBitesBoard.ROWS * cell_size, WordBitesBoard.COLS * cell_size, 3), np.uint8)
+    image[:] = (200, 120, 40)  # BGR blue
+    for row, col in cells:
+        image[row * cell_size + 2:(row + 1) * cell_size - 2, col * cell_size + 2:(col + 1) * cell_size - 2] = (200, 235, 245)
+    return image
+
+def make_board():
+    board = WordBitesBoard()
+    board.add_blocks([Block(BlockType.SINGLE, ["A"], (0, 0)), Block(BlockType.VERTICAL, ["S", "T"], (3, 3)),
+                      Block(BlockType.HORIZONTAL, ["E", "R"], (8, 5))], combine=False)
+    return board
+
+def test_occupied_cells_match_tiles():
+    """Every tile is found in one pass and nothing else is"""
+    board = make_board()
+    cells = {cell for block in board.blocks for cell in block.get_all_positions()}
+    occupied = get_occupied_cells(make_board_image(cells))
+    assert occupied.shape == (WordBitesBoard.ROWS, WordBitesBoard.COLS)
+    assert {tuple(cell) for cell in np.argwhere(occupied)} == cells
+
+def test_resync_undoes_a_dropped_drag():
+    """A drag the game ignored is put back where the screen shows the block, keeping its id"""
+    board = make_board()
+    cells = {cell for block in board.blocks for cell in block.get_all_positions()}
+    occupied = get_occupied_cells(make_board_image(cells))
+    assert not resync_word_bites_board(board, occupied)
+
+    # The model thinks the S/T block moved, but the screen still has it in place
+    block_id = board.get_block_id_at(3, 3)
+    board.move_block(3, 3, 5, 6)
+    assert resync_word_bites_board(board, occupied)
+    assert board.get_block(block_id).position == (3, 3)
+    assert board.get_block_id_at(4, 3) == block_id and board.get_block_at(5, 6) is None
+    assert len(board.blocks) == 3
+
+def test_resync_finds_the_dropped_drag_in_the_log():
+    """A dropped drag, and the later drag it made fail, are both undone from the drag log"""
+    board = make_board()
+    screen = board.copy()
+
+    def drag(block, target_row, target_col, board):
+        return board.move_block(*block.position, target_row, target_col)
+
+    log = WordBitesDragLog(drag, board)
+    a_id, st_id = board.get_block_id_at(0, 0), board.get_block_id_at(3, 3)
+    # The game drops the S/T drag, so the A can't land where the S/T still is
+    assert log(board.get_block(st_id), 6, 0, board) and log(board.get_block(a_id), 3, 3, board)
+    assert drag_screen_tile(screen, (0, 0), (3, 3)) is None
+
+    occupied = np.array(screen.cell_ids).reshape(screen.ROWS, screen.COLS) >= 0
+    assert log.resync(board, occupied)
+    assert board.get_block(st_id).position == (3, 3) and board.get_block(a_id).position == (0, 0)
+    assert not log.pointer_moves and not log.resync(board, occupied)
+
+if __name__ == "__main__":
+    test_occupied_cells_match_tiles()
+    test_resync_undoes_a_dropped_drag()
+    test_resync_finds_the_dropped_drag_in_the_log()
+    print("All screen tests passed")
@@ -0,0 +1,96 @@
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game.word_bites_board import Block, BlockType
+from src.game.word_finder import (WordBitesMove, get_word_bites_segmenter, find_best_word_bites_placement,
+                                  find_word_bites_crossings)
+from src.game.word_bites_sequencer import plan_word_bites_game, build_extension_index, apply_drags
+from src.game.word_bites_player import execute_word_bites_plan
+from tests.word_bites_fixtures import use_memory_word_cache, make_cats_board
+
+use_memory_word_cache()
+
+VALID_WORDS = {"CAT", "CATS", "SCAT", "ACT", "ACTS", "TAC"}
+
+def make_moves(board, words):
+    """Place each word against the starting layout, like find_word_bites_words"""
+    segmenter = get_word_bites_segmenter(board.blocks)
+    return [find_best_word_bites_placement(word, board, segmenter) for word in words]
+
+def test_extension_index():
+    """Words are linked to the longer words that start or end with them"""
+    index = build_extension_index(["CAT", "CATS", "SCAT", "ACT"])
+    assert sorted(index["CAT"]) == ["CATS", "SCAT"]
+    assert "ACT" not in index
+
+def test_plan_is_valid_and_reuses_blocks():
+    """Every step forms its word when replayed, and later words reuse blocks already in place"""
+    board = make_cats_board()
+    words = ["CAT", "CATS", "SCAT", "ACT", "ACTS"]
+    moves = make_moves(board, words)
+    steps = plan_word_bites_game(board, moves, VALID_WORDS)
+
+    for step in steps:
+        print(step)
+    replay = board.copy()
+    scored = set()
+    for step in steps:
+        formed = apply_drags(replay, step.drags, VALID_WORDS)
+        assert formed is not None and step.word in formed
+        assert not scored & set(step.words_formed)
+        scored.update(step.words_formed)
+    assert scored <= set(words) and len(scored) >= 4
+    assert str(board) == str(make_cats_board())  # planning doesn't touch the board
+
+    # Playing each word from scratch would take at least one drag per letter
+    total_drags = sum(len(step.drags) for step in steps)
+    assert total_drags < sum(len(word) for word in words)
+
+def test_crossing_shares_a_block():
+    """A second word laid across the first reuses the shared block and scores with the same drags"""
+    board = make_cats_board()
+    for letter, position in [("C", (0, 6)), ("T", (2, 7))]:
+        board.add_block(Block(BlockType.SINGLE, [letter], position), combine=False)
+    segmenter = get_word_bites_segmenter(board.blocks)
+    cat = find_best_word_bites_placement("CAT", board, segmenter, (False,), origin=(5, 2))
+
+    crossings = find_word_bites_crossings(cat, ["ACT", "SCAT"], board, segmenter)
+    print(crossings)
+    crossings = {crossing.second.word: crossing for crossing in crossings}
+    assert sorted(crossings) == ["ACT", "SCAT"]
+    crossing = crossings["ACT"]
+    shared = board.get_block_at(2, 2)  # The A
+    assert crossing.cell == (5, 3) and crossing.second.origin == (5, 3)
+    assert sum(1 for block, _ in crossing.block_moves if block.id == shared.id) == 1
+    assert len(crossing.block_moves) == 5 and crossing.drags == 5
+
+    steps = plan_word_bites_game(board, make_moves(board, ["CAT", "ACT"]), VALID_WORDS)
+    formed = apply_drags(board.copy(), [drag for step in steps for drag in step.drags], VALID_WORDS)
+    assert {"CAT", "ACT"} <= formed
+
+def test_pipelined_plan_matches_direct_plan():
+    """Planning ahead in the pipeline process plays the same steps as planning in between them"""
+    played = {}
+    for pipelined in (False, True):
+        board = make_cats_board()
+        steps = played[pipelined] = []
+
+        def play_step(step, board):
+            steps.append((step.word, step.crossing, step.points))
+            apply_drags(board, step.drags, VALID_WORDS)
+            return True
+
+        execute_word_bites_plan(board, make_moves(board, ["CAT", "CATS", "SCAT", "ACT", "ACTS"]), play_step,
+                                lambda seconds: None, VALID_WORDS, verbose=False, pipelined=pipelined)
+    print(played[True])
+    assert played[True] and played[True] == played[False]
+
+if __name__ == "__main__":
+    test_extension_index()
+    test_plan_is_valid_and_reuses_blocks()
+    test_crossing_shares_a_block()
+    test_pipelined_plan_matches_direct_plan()
+    print("All sequencer tests passed")
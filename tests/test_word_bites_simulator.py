@@ -0,0 +1,101 @@
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game.word_bites_board import WordBitesBoard, Block, BlockType
+from src.game.word_finder import WordBitesMove
+from src.game.word_bites_simulator import WordBitesSimulator, find_formed_words
+from tests.word_bites_fixtures import use_memory_word_cache, make_cats_board
+
+use_memory_word_cache()
+
+VALID_WORDS = {"CAT", "CATS", "ACT", "TAC"}
+
+def test_find_formed_words():
+    """Only maximal runs are read, across and down"""
+    board = WordBitesBoard()
+    board.add_block(Block(BlockType.HORIZONTAL, ["C", "A"], (0, 0)), combine=False)
+    board.add_block(Block(BlockType.SINGLE, ["T"], (0, 2)), combine=False)
+    board.add_block(Block(BlockType.VERTICAL, ["C", "T"], (1, 1)), combine=False)
+    print(board)
+
+    assert find_formed_words(board, VALID_WORDS) == {"CAT", "ACT"}
+    board.add_block(Block(BlockType.SINGLE, ["S"], (0, 3)), combine=False)
+    assert find_formed_words(board, VALID_WORDS, rows=[0], cols=[]) == {"CATS"}
+
+def test_replay_scores_each_word_once():
+    """Replaying the moves scores every new word once and records the drags it took"""
+    board = make_cats_board()
+    blocks = {block.letters[0]: block for block in board.blocks}
+    cat = WordBitesMove("CAT", [(blocks["C"], (8, 0)), (blocks["A"], (8, 1)), (blocks["T"], (8, 2))],
+                        origin=(8, 0))
+    cats = WordBitesMove("CATS", [(blocks["C"], (8, 0)), (blocks["A"], (8, 1)), (blocks["T"], (8, 2)),
+                                  (blocks["S"], (8, 3))], origin=(8, 0))
+
+    simulator = WordBitesSimulator(board, VALID_WORDS)
+    simulator.replay_moves([cat, cats])
+
+    # CATS is played first (highest score) and forms CAT on the way, so CAT needs no drags
+    for record in simulator.records:
+        print(record)
+    assert simulator.found == {"CAT", "CATS"}
+    assert simulator.score == WordBitesMove("CAT", []).score + WordBitesMove("CATS", []).score
+    assert [(record.word, record.drags) for record in simulator.records] == [("CATS", 4)]
+    assert simulator.records[0].words_formed == ["CAT", "CATS"]
+    assert simulator.drags == 4 and simulator.wasted_drags == 0
+    assert simulator.seconds > 0
+
+class ScriptedRandom:
+    """Returns the given values from random(), in order"""
+    def __init__(self, values):
+        self.values = list(values)
+
+    def random(self):
+        return self.values.pop(0)
+
+def test_lost_drags_and_restores():
+    """Lost drags still cost time, and restoring after a failed word costs extra drags"""
+    for restore_failed in (False, True):
+        board = make_cats_board()
+        blocks = {block.letters[0]: block for block in board.blocks}
+        cat = WordBitesMove("CAT", [(blocks["C"], (8, 0)), (blocks["A"], (8, 1)), (blocks["T"], (8, 2))])
+
+        simulator = WordBitesSimulator(board, VALID_WORDS, restore_failed=restore_failed, drag_failure_rate=0.5)
+        simulator.rng = ScriptedRandom([0.9, 0.0, 0.9])  # C lands, A is lost, then C's restore lands
+        assert not simulator.play_move(cat, board)
+
+        print(simulator.summary())
+        assert simulator.records[0].drags == simulator.drags
+        assert simulator.wasted_drags == simulator.drags
+        if restore_failed:
+            assert simulator.drags == 3 and simulator.restore_drags == 1
+            assert board.get_block(blocks["C"].id).position == (0, 0)
+        else:
+            assert simulator.drags == 2 and simulator.restore_drags == 0
+            assert board.get_block(blocks["C"].id).position == (8, 0)
+
+def test_resync_catches_a_silently_dropped_drag():
+    """A drag the game ignores leaves the model out of step with the screen until a resync"""
+    for resync in (False, True):
+        board = make_cats_board()
+        blocks = {block.letters[0]: block for block in board.blocks}
+        cat = WordBitesMove("CAT", [(blocks["C"], (8, 0)), (blocks["A"], (8, 1)), (blocks["T"], (8, 2))],
+                            origin=(8, 0))
+
+        simulator = WordBitesSimulator(board, VALID_WORDS, silent_failure_rate=0.5)
+        simulator.rng = ScriptedRandom([0.0] + [0.9] * 20)  # Only the first drag is dropped
+        simulator.replay_plan([cat], crossings=False, resync=resync)
+        print(simulator.summary())
+        assert simulator.resyncs == resync
+        in_step = {block.id: block.position for block in simulator.board.blocks} == \
+            {block.id: block.position for block in simulator.screen.blocks}
+        assert in_step == resync
+
+if __name__ == "__main__":
+    test_find_formed_words()
+    test_replay_scores_each_word_once()
+    test_lost_drags_and_restores()
+    test_resync_catches_a_silently_dropped_drag()
+    print("All simulator tests passed")
@@ -10,46 +10,20 @@ from src.game.word_finder import WordBitesMove
 from src.game.word_drawer import execute_word_bites_moves
 from src.game.word_bites_board import WordBitesBoard, Block, BlockType
 
-# Create a mock board for testing
+# Create a mock board for testing: a real board, so it keeps the board's indexes, plus a move log
 class MockBoard(WordBitesBoard):
     def __init__(self):
-        self.ROWS = 9
-        self.COLS = 8
-        self.blocks = []
+        super().__init__()
         self.moves_log = []
-        self.letter_to_blocks = {}  # Add this attribute for compatibility
         
         # Add some blocks to the board
-        self.add_block(Block(BlockType.SINGLE, ['I'], (0, 0)))
-        self.add_block(Block(BlockType.SINGLE, ['C'], (0, 1)))
-        self.add_block(Block(BlockType.SINGLE, ['E'], (0, 2)))
-        self.add_block(Block(BlockType.SINGLE, ['W'], (0, 3)))
-        self.add_block(Block(BlockType.HORIZONTAL, ['O', 'R'], (0, 4)))
-        self.add_block(Block(BlockType.SINGLE, ['M'], (0, 6)))
-        self.add_block(Block(BlockType.SINGLE, ['S'], (0, 7)))
-        
-    def add_block(self, block):
-        self.blocks.append(block)
-        # Update letter_to_blocks index
-        for letter in block.letters:
-            if letter not in self.letter_to_blocks:
-                self.letter_to_blocks[letter] = []
-            self.letter_to_blocks[letter].append(block)
-    
-    def get_block_at(self, row, col):
-        for block in self.blocks:
-            if block.position == (row, col):
-                return block
-            # Check second position for horizontal/vertical blocks
-            if block.type == BlockType.HORIZONTAL and block.position == (row, col-1):
-                return block
-            if block.type == BlockType.VERTICAL and block.position == (row-1, col):
-                return block
-        return None
-    
-    def get_blocks_by_letter(self, letter):
-        """Get all blocks containing the specified letter."""
-        return self.letter_to_blocks.get(letter, [])
+        self.add_block(Block(BlockType.SINGLE, ['I'], (0, 0)), combine=False)
+        self.add_block(Block(BlockType.SINGLE, ['C'], (0, 1)), combine=False)
+        self.add_block(Block(BlockType.SINGLE, ['E'], (0, 2)), combine=False)
+        self.add_block(Block(BlockType.SINGLE, ['W'], (0, 3)), combine=False)
+        self.add_block(Block(BlockType.HORIZONTAL, ['O', 'R'], (0, 4)), combine=False)
+        self.add_block(Block(BlockType.SINGLE, ['M'], (0, 6)), combine=False)
+        self.add_block(Block(BlockType.SINGLE, ['S'], (0, 7)), combine=False)
     
     def __str__(self):
         return f"Mock Board with {len(self.blocks)} blocks"
@@ -58,13 +32,10 @@ class MockBoard(WordBitesBoard):
 def mock_move_word_bites_block(block, row, col, board):
     print(f"MOCK: Moving block {block.letters} from {block.position} to ({row}, {col})")
     
-    # Update the block's position
-    old_position = block.position
-    block_index = board.blocks.index(block)
-    
-    # Create a new block with the updated position (since blocks are immutable)
-    new_block = Block(block.type, list(block.letters), (row, col))
-    board.blocks[block_index] = new_block
+    # Move the block on the board, as the real function does after posting the drag
+    old_position = board.get_block(block.id).position
+    if not board.move_block(old_position[0], old_position[1], row, col):
+        return False
     
     # Log the move
     if isinstance(board, MockBoard):
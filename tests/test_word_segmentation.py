@@ -0,0 +1,62 @@
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game.word_finder import WordBitesSegmenter, get_word_bites_segmenter
+from src.game.word_bites_board import Block, BlockType
+
+def spell(tokens):
+    """Turn a token sequence back into the letters it contributes"""
+    letters = []
+    for (block_type, block_letters), letter_index in tokens:
+        if letter_index is None:
+            letters.extend(block_letters)
+        else:
+            letters.append(block_letters[letter_index])
+    return "".join(letters)
+
+def test_every_split_is_found():
+    """Both "ST|EP" and "S|TE|P" should be found, not just the first greedy match"""
+    blocks = [
+        Block(BlockType.HORIZONTAL, ["S", "T"], (0, 0)),
+        Block(BlockType.HORIZONTAL, ["E", "P"], (1, 0)),
+        Block(BlockType.HORIZONTAL, ["T", "E"], (2, 0)),
+        Block(BlockType.SINGLE, ["S"], (3, 0)),
+        Block(BlockType.SINGLE, ["P"], (4, 0)),
+    ]
+    segmenter = WordBitesSegmenter(blocks)
+    splits = segmenter.segmentations("STEP", vertical=False)
+    for tokens in splits:
+        print(tokens)
+
+    assert all(spell(tokens) == "STEP" for tokens in splits)
+    along_pairs = [[kind[1] for kind, letter_index in tokens if letter_index is None] for tokens in splits]
+    assert [("S", "T"), ("E", "P")] in along_pairs
+    assert [("T", "E")] in along_pairs
+
+def test_block_counts_are_respected():
+    """A block can only be used once per word"""
+    blocks = [
+        Block(BlockType.SINGLE, ["E"], (0, 0)),
+        Block(BlockType.SINGLE, ["S"], (0, 2)),
+        Block(BlockType.SINGLE, ["T"], (0, 4)),
+    ]
+    segmenter = WordBitesSegmenter(blocks)
+
+    assert segmenter.segmentations("SET", vertical=True)
+    assert not segmenter.segmentations("TEST", vertical=True)
+
+def test_segmenter_is_shared_per_inventory():
+    """The same block inventory in a different layout reuses the cached segmenter"""
+    blocks = [Block(BlockType.SINGLE, ["A"], (0, 0)), Block(BlockType.VERTICAL, ["B", "C"], (2, 2))]
+    moved = [Block(BlockType.VERTICAL, ["B", "C"], (5, 5)), Block(BlockType.SINGLE, ["A"], (8, 7))]
+
+    assert get_word_bites_segmenter(blocks) is get_word_bites_segmenter(moved)
+
+if __name__ == "__main__":
+    test_every_split_is_found()
+    test_block_counts_are_respected()
+    test_segmenter_is_shared_per_inventory()
+    print("All segmentation tests passed")
@@ -0,0 +1,22 @@
+from src.game.word_finder import set_word_bites_word_cache
+from src.game.word_bites_board import WordBitesBoard, Block, BlockType
+from src.game.word_bites_cache import WordBitesWordCache
+
+def use_memory_word_cache():
+    """Keep the tests off the Word Bites cache file, so every run searches the same way from scratch"""
+    set_word_bites_word_cache(WordBitesWordCache(None))
+
+def make_cats_board():
+    """C, A, T and S scattered so no word is formed yet"""
+    board = WordBitesBoard()
+    for letter, position in [("C", (0, 0)), ("A", (2, 2)), ("T", (4, 4)), ("S", (6, 6))]:
+        board.add_block(Block(BlockType.SINGLE, [letter], position), combine=False)
+    return board
+
+def make_search_board():
+    """S, TA, R, E and D scattered, enough letters for words of several lengths"""
+    board = WordBitesBoard()
+    for letters, position in [(["S"], (0, 0)), (["T", "A"], (2, 2)), (["R"], (4, 4)), (["E"], (6, 6)), (["D"], (8, 0))]:
+        block_type = BlockType.HORIZONTAL if len(letters) == 2 else BlockType.SINGLE
+        board.add_block(Block(block_type, letters, position), combine=False)
+    return board